@@ -1,58 +1,132 @@
-import os
-import random
-import json
-
 import streamlit as st
-import streamlit.components.v1 as components
 from streamlit_extras.mention import mention
 
-import spacy
-
 import numpy as np
 import pandas as pd
 
-import altair as alt
-import plotly.express as px
 import plotly.graph_objects as go
-import matplotlib.pyplot as plt
-
-from wordcloud import WordCloud, ImageColorGenerator, STOPWORDS
-from PIL import Image
-
-import pydeck as pdk
 
+from kjv.books import BOOK_GENRES, TESTAMENTS
+from kjv.cloud import WORDCLOUD_CACHE_DIR, WORDCLOUD_MASKS, WordCloudCache
+from kjv.cr_figures import CHORD_MIN_LINKS, HEATMAP_LEVELS, HEATMAP_NORMALIZATIONS, chord_figure, heatmap_figure, neighborhood_figure, network_figure, sankey_figure, select_books
+from kjv.cr_graph import edge_table, expand, expansion_paths, neighbors, read_cr_graph, rollup, verse_labels
+from kjv.cr_matrix import read_cr_matrices
+from kjv.lexical import lexical_richness, metric_caption, read_token_index
+from kjv.ranges import book_ranges, chapter_range, sort_canonical
+from kjv.search import read_search_index, search
+from kjv.shared import enable_copy_on_write, share
+from kjv.sites import DEFAULT_ZOOM, MAP_CONTROLLER, build_site_index, initial_view, map_view, site_choices, site_mentions, viewport_layer_data
+from kjv.stats import read_stats_book, read_stats_chapter
+from kjv.store import read_kjv_clean
+from kjv.warmup import warm_up
+from kjv.wordfreq import read_word_frequencies
+
+# Frames handed out by the loaders are shared by every session in the process.
+# With Copy-on-Write, anything derived from them (filters, slices, groupbys)
+# is a lazy copy, so pages never need a defensive .copy() of their own.
+enable_copy_on_write()
 
 
 # ----------------------
 # Loading Function
 # ----------------------
 
-@st.cache_data
+@st.cache_resource
 def load_kjv_clean():
-    df = pd.read_csv("data/kjv_clean.csv")
-    df = df.astype({col: 'string' for col in df.select_dtypes(include='object').columns})
-    return df
+    df = read_kjv_clean()
+    return share(df)
 
 
-@st.cache_data
+@st.cache_resource
+def load_kjv_ranges():
+    ranges = book_ranges(load_kjv_clean())
+    return ranges
+
+
+@st.cache_resource
+def load_cr_graph():
+    cr_graph = read_cr_graph()
+    return cr_graph
+
+
+@st.cache_resource
+def load_cr_matrices():
+    cr_matrices = read_cr_matrices()
+    return cr_matrices
+
+
+@st.cache_resource
 def load_kjv_locs_all():
     df = pd.read_csv("data/kjv_locs_all.csv")
-    return df
+    df['country'] = df['country'].replace('-', 'State of Palestine')
+    df = sort_canonical(df)
+    return share(df)
 
 
-@st.cache_data
+@st.cache_resource
+def load_site_index():
+    site_index = build_site_index(load_kjv_locs_all())
+    return site_index
+
+
+@st.cache_resource
+def load_site_choices():
+    choices = site_choices(load_site_index())
+    return choices
+
+
+@st.cache_resource
 def load_sentiment_by_book():
     df = pd.read_csv("data/sentiment_by_book.csv")
-    return df
+    return share(df)
+
+
+@st.cache_resource
+def load_kjv_stats_book():
+    df = read_stats_book()
+    return share(df)
+
+
+@st.cache_resource
+def load_kjv_stats_chapter():
+    df = read_stats_chapter()
+    return share(df)
+
+
+@st.cache_resource
+def load_token_index():
+    token_index = read_token_index()
+    return token_index
 
 
 @st.cache_data
-def load_spacy():
-    model_path = os.path.join("data", "en_core_web_sm", "en_core_web_sm-3.8.0")
-    if os.path.isdir(model_path):
-        return spacy.load(model_path)
-    else:
-        raise FileNotFoundError(f"SpaCy model not found at {model_path}. Please ensure it is correctly placed.")
+def load_lexical_richness(level, metric, window):
+    df = lexical_richness(load_token_index(), level=level, metric=metric, window=window)
+    return df
+
+
+@st.cache_resource
+def load_word_frequencies():
+    word_frequencies = read_word_frequencies()
+    return word_frequencies
+
+
+@st.cache_resource
+def load_word_cloud_cache():
+    wordcloud_cache = WordCloudCache(load_word_frequencies(), cache_dir=WORDCLOUD_CACHE_DIR)
+    return wordcloud_cache
+
+
+@st.cache_resource
+def load_search_index():
+    search_index = read_search_index()
+    return search_index
+
+
+@st.cache_resource
+def load_warmup():
+    # Started once per process, not on every rerun
+    return warm_up()
 
 
 @st.cache_data
@@ -169,6 +243,15 @@ def load_kjv_countries():
     return kjv_countries
 
 
+@st.cache_data
+def load_lex_rich_metric_map():
+    metric_map = {
+        "Unique-to-Total Word Ratio (TTR)": "TTR",
+        "Moving-Average Type-Token Ratio (MATTR)": "MATTR"
+    }
+    return metric_map
+
+
 @st.cache_data
 def load_pos_map():
     pos_map = {
@@ -192,38 +275,6 @@ def load_pos_map():
     }
     return pos_map
 
-# @st.cache_data
-# def load_fig_cr_cd():
-#     with open("models/figure_cr_cd.json", 'r') as f:
-#         figure_cr_cd_json = f.read()
-    
-#     fig = go.Figure(json.loads(figure_cr_cd_json))
-#     return fig
-
-# @st.cache_data
-# def load_fig_cr_sd():
-#     with open("models/figure_cr_sd.json", 'r') as f:
-#         figure_cr_sd_json = f.read()
-    
-#     fig = go.Figure(json.loads(figure_cr_sd_json))
-#     return fig
-
-# @st.cache_data
-# def load_fig_cr_hm():
-#     with open("models/figure_cr_hm.json", 'r') as f:
-#         figure_cr_hm_json = f.read()
-    
-#     fig = go.Figure(json.loads(figure_cr_hm_json))
-#     return fig
-
-# @st.cache_data
-# def load_fig_cr_ng():
-#     with open("models/figure_cr_ng.json", 'r') as f:
-#         figure_cr_ng_json = f.read()
-    
-#     fig = go.Figure(json.loads(figure_cr_ng_json))
-#     return fig
-
 # @st.cache_data
 # def load_fig_timeline_bc():
 #     with open("models/figure_timeline_ad.json", 'r') as f:
@@ -240,10 +291,6 @@ def load_pos_map():
 #     fig = go.Figure(json.loads(figure_timeline_ad_json))
 #     return fig
 
-@st.cache_data
-def load_fig_cr_pv():
-    html = open("models/network_cr_pv.html", "r", encoding="utf-8").read()
-    return html
 
 
 # ----------------------
@@ -487,11 +534,10 @@ def bible_overview():
 def verses_book():
     st.header("# of Verses per Book")
     
-    df = load_kjv_clean().copy()
+    stats_book = load_kjv_stats_book()
     kjv_books = load_kjv_books()
     
-    verse_count_per_book = df.groupby("book_name").size().reset_index(name="verse_count")
-    verse_count_per_book.rename(columns={"book_name": "Book", "verse_count": "# of Verses"}, inplace=True)
+    verse_count_per_book = stats_book[["book_name", "verse_count"]].rename(columns={"book_name": "Book", "verse_count": "# of Verses"})
     
     # chart_verse_count = (
     #     alt.Chart(verse_count_per_book)
@@ -556,11 +602,10 @@ def verses_book():
 def chapters_book():
     st.header("# of Chapters per Book")
     
-    df = load_kjv_clean().copy()
+    stats_book = load_kjv_stats_book()
     kjv_books = load_kjv_books()
     
-    chapter_count_per_book = df.groupby("book_name")["chapter_number"].max().reset_index()
-    chapter_count_per_book.rename(columns={"book_name": "Book", "chapter_number": "# of Chapters"}, inplace=True)
+    chapter_count_per_book = stats_book[["book_name", "chapter_count"]].rename(columns={"book_name": "Book", "chapter_count": "# of Chapters"})
     
     # chart_chapter_count = (
     #     alt.Chart(chapter_count_per_book)
@@ -625,11 +670,10 @@ def chapters_book():
 def verses_chapter():
     st.header("# of Verses per Chapter")
     
-    df = load_kjv_clean().copy()
+    stats_chapter = load_kjv_stats_chapter()
     kjv_books = load_kjv_books()
     
-    chapter_verse_counts = df.groupby(["book_name", "chapter_number"]).size().reset_index(name="verse_count")
-    chapter_verse_counts.rename(columns={"book_name": "Book", "chapter_number": "Chapter", "verse_count": "# of Verses"}, inplace=True)
+    chapter_verse_counts = stats_chapter[["book_name", "chapter_number", "verse_count"]].rename(columns={"book_name": "Book", "chapter_number": "Chapter", "verse_count": "# of Verses"})
     
     # chart_verse_heatmap = (
     #     alt.Chart(chapter_verse_counts)
@@ -690,28 +734,21 @@ def verses_chapter():
 
 
 def lex_rich_book():
-    st.header("Lexical Richness (Unique-to-Total Word Ratio) per Book")
+    st.header("Lexical Richness per Book / Chapter")
     
-    df = load_kjv_clean().copy()
     kjv_books = load_kjv_books()
-
-    
-    def calculate_lexical_richness(df):
-        lexical_data = []
-        
-        for book, verses in df.groupby("book_name"):
-            all_text = " ".join(verses["verse_text"])
-            words = all_text.split()
-            total_words = len(words)
-            unique_words = len(set(words))
-            lexical_richness = unique_words / total_words if total_words > 0 else 0
-            lexical_data.append({"book_name": book, "lexical_richness": lexical_richness})
-            
-        return pd.DataFrame(lexical_data)
+    metric_map = load_lex_rich_metric_map()
     
+    with st.container(border=True):
+        level = st.selectbox("Level", ["Book", "Chapter"])
+        metric = st.selectbox("Metric", list(metric_map.keys()))
+        window = 500
+        if metric_map[metric] == "MATTR":
+            window = st.number_input("Window (# of Words)", min_value=10, max_value=5000, value=500, step=50)
+    st.caption(metric_caption(metric_map[metric], level, window))
     
-    lexical_richness_df = calculate_lexical_richness(df)
-    lexical_richness_df.rename(columns={"book_name": "Book", "lexical_richness": "Lexical Richness"}, inplace=True)
+    lexical_richness_df = load_lexical_richness(level, metric_map[metric], window)
+    lexical_richness_df.rename(columns={"book_name": "Book", "chapter_number": "Chapter", "lexical_richness": "Lexical Richness"}, inplace=True)
     
     # chart_lexical_richness = (
     #     alt.Chart(lexical_richness_df)
@@ -728,30 +765,53 @@ def lex_rich_book():
     #     .interactive()
     # )
     
-    chart_lexical_richness = go.Figure(
-        data=[
-            go.Bar(
-                x=lexical_richness_df["Lexical Richness"],
-                y=lexical_richness_df["Book"],
-                orientation='h',
-                text=lexical_richness_df["Lexical Richness"],
-                hovertemplate="Book: %{y}<br>Lexical Richness: %{x}<extra></extra>",
-                marker=dict(
-                    color=lexical_richness_df["Lexical Richness"],
+    if level == "Book":
+        chart_lexical_richness = go.Figure(
+            data=[
+                go.Bar(
+                    x=lexical_richness_df["Lexical Richness"],
+                    y=lexical_richness_df["Book"],
+                    orientation='h',
+                    text=lexical_richness_df["Lexical Richness"],
+                    hovertemplate="Book: %{y}<br>Lexical Richness: %{x}<extra></extra>",
+                    marker=dict(
+                        color=lexical_richness_df["Lexical Richness"],
+                        colorscale="Reds",
+                        cmin=0,
+                        cmax=0.6
+                    )
+                )
+            ]
+        )
+        
+        chart_lexical_richness.update_layout(
+            xaxis_title=metric,
+            yaxis_title="Book",
+            yaxis=dict(categoryorder="array", categoryarray=list(reversed(kjv_books))),
+            height=1500
+        )
+    else:
+        chart_lexical_richness = go.Figure(
+            data=[
+                go.Heatmap(
+                    x=lexical_richness_df["Chapter"],
+                    y=lexical_richness_df["Book"],
+                    z=lexical_richness_df["Lexical Richness"],
                     colorscale="Reds",
-                    cmin=0,
-                    cmax=0.6
+                    colorbar=dict(title="Lexical Richness"),
+                    zmin=0,
+                    zmax=1,
+                    hovertemplate="Book: %{y}<br>Chapter: %{x}<br>Lexical Richness: %{z}<extra></extra>"
                 )
-            )
-        ]
-    )
-    
-    chart_lexical_richness.update_layout(
-        xaxis_title="Lexical Richness (Unique-to-Total Word Ratio)",
-        yaxis_title="Book",
-        yaxis=dict(categoryorder="array", categoryarray=list(reversed(kjv_books))),
-        height=1500
-    )
+            ]
+        )
+        
+        chart_lexical_richness.update_layout(
+            xaxis_title="Chapter",
+            yaxis_title="Book",
+            yaxis=dict(categoryorder="array", categoryarray=list(reversed(kjv_books))),
+            height=1500
+        )
     
     # st.write("")
     # st.write("")
@@ -764,7 +824,7 @@ def lex_rich_book():
 def snt_book():
     st.header("Sentiment Analysis per Book")
     
-    sentiment_by_book = load_sentiment_by_book().copy()
+    sentiment_by_book = load_sentiment_by_book()
     kjv_books = load_kjv_books()
     
     chart_sentiment_by_book = go.Figure(
@@ -803,70 +863,11 @@ def snt_book():
 def word_cloud():
     st.header("Word Cloud")
     
-    nlp = load_spacy()
-    df = load_kjv_clean().copy()
+    wordcloud_cache = load_word_cloud_cache()
     kjv_books = load_kjv_books()
     pos_map = load_pos_map()
     
     
-    def generate_word_cloud(book_name, df, pos_tag=None, bg="White"):
-        book_verses = df[df["book_name"] == book_name]["verse_text"]
-        
-        if book_verses.empty:
-            print(f"No Verses in Book: {book_name}")
-            return
-        
-        text = " ".join(book_verses)
-        
-        if pos_tag is None:
-            texts = text
-        else:
-            doc = nlp(text)
-            tokens = [token.text for token in doc if token.pos_ == pos_tag]
-            texts = " ".join(tokens)
-        
-            
-        number = random.randint(1, 7)    
-        coloring = np.array(Image.open(f"assets/wordcloud/{number}.png"))
-        
-        stopwords = set(STOPWORDS)
-        
-        
-        wordcloud = WordCloud(
-                            background_color="white",
-                            mask = coloring,
-                            stopwords=stopwords,
-                            repeat = False
-                            )
-        wordcloud.generate(texts)
-        
-        image_colors = ImageColorGenerator(coloring)
-        wordcloud.recolor(color_func=image_colors)
-        
-        wordcloud_image = wordcloud.to_image()
-        
-        
-        def remove_bg(wordcloud_image):
-            img = wordcloud_image.convert("RGBA")
-            datas = img.getdata()
-            new_data = []
-            for item in datas:
-                if item[0] == 255 and item[1] == 255 and item[2] == 255:
-                    new_data.append((255, 255, 255, 0))
-                else:
-                    new_data.append(item)
-                    
-            img.putdata(new_data)
-            return img
-        
-        if bg == "White":
-            img = wordcloud_image
-        elif bg == "Transparent":
-            img = remove_bg(wordcloud_image)
-            
-        return img
-    
-    
     with st.form(key='word_sims_form'):
         book_name = st.selectbox(
             "Book",
@@ -876,6 +877,10 @@ def word_cloud():
             "Part of Speech",
             list(pos_map.keys()),
         )
+        mask = st.selectbox(
+            "Mask",
+            ["Auto"] + WORDCLOUD_MASKS,
+        )
         bg = st.selectbox(
             "Background",
             ["White", "Transparent"],
@@ -883,8 +888,11 @@ def word_cloud():
         submit_button = st.form_submit_button(label='Generate')
         if submit_button:
             if book_name and pos_tag:
-                wordcloud_image = generate_word_cloud(book_name, df, pos_tag=pos_map[pos_tag], bg=bg)
-                st.image(wordcloud_image, use_container_width=True)
+                wordcloud_image = wordcloud_cache.get(book_name, pos_map[pos_tag], mask=None if mask == "Auto" else mask, bg=bg)
+                if wordcloud_image is None:
+                    st.warning(f"No words to plot for {book_name} ({pos_tag}).")
+                else:
+                    st.image(wordcloud_image, use_container_width=True)
                 
                 
     st.feedback("thumbs")
@@ -901,11 +909,81 @@ def word_cloud():
 
 
 
+def verse_search():
+    st.header("Search")
+    
+    df = load_kjv_clean()
+    search_index = load_search_index()
+    kjv_books = load_kjv_books()
+    
+    
+    with st.form(key='verse_search_form'):
+        query = st.text_input(
+            "Query",
+            placeholder='e.g. "in the beginning" light',
+        )
+        testament = st.selectbox(
+            "Testament",
+            ["All"] + list(TESTAMENTS.keys()),
+        )
+        books = st.multiselect(
+            "Books",
+            kjv_books,
+        )
+        limit = st.number_input(
+            "Results",
+            min_value=10,
+            max_value=500,
+            value=50,
+            step=10,
+        )
+        submit_button = st.form_submit_button(label='Search')
+        if submit_button and query:
+            hits, total = search(search_index, query, books=books, testament=testament, limit=limit)
+            st.caption(f"{total} matching verses")
+            results = hits.assign(verse_text=df["verse_text"].iloc[hits["row"]].to_numpy())
+            st.dataframe(
+                results[["book_name", "chapter_number", "verse_number", "verse_text", "score"]].rename(
+                    columns={"book_name": "Book", "chapter_number": "Chapter", "verse_number": "Verse", "verse_text": "Text", "score": "Score"}
+                ),
+                hide_index=True,
+                use_container_width=True,
+            )
+                
+                
+    st.feedback("thumbs")
+    mention(
+            label="GitHub Repo: verneylmavt/st-kjv-vis",
+            icon="github",
+            url="https://github.com/verneylmavt/st-kjv-vis"
+        )
+    mention(
+            label="Other ML Tasks",
+            icon="streamlit",
+            url="https://verneylogyt.streamlit.app/"
+        )
+
+
+
+def bib_sites_zoom_in():
+    # Clicking a grouped point zooms in on it, the map itself can't zoom (see MAP_CONTROLLER)
+    selected = st.session_state["bible_sites_map"].selection["objects"].get("bible-sites", [])
+    if selected and selected[0]["site_id"] < 0:
+        st.session_state["bs_focus"] = (selected[0]["latitude"], selected[0]["longitude"])
+        st.session_state["bs_zoom"] = min(st.session_state["bs_zoom"] + 2, 12)
+
+
+def bib_sites_reset_focus():
+    st.session_state.pop("bs_focus", None)
+
+
 def bib_sites():
+    # pydeck is only needed by this page
+    import pydeck as pdk
+
     st.header("Bible Sites")
     
-    df = load_kjv_locs_all().copy()
-    df['country'] = df['country'].replace('-', 'State of Palestine')
+    df = load_kjv_locs_all()
     # st.dataframe(df.head())
     kjv_books = load_kjv_books()
     kjv_books_abv = load_kjv_books_abv()
@@ -916,52 +994,58 @@ def bib_sites():
 
         selected_countries = st.multiselect("Countries", kjv_countries, default=kjv_countries)
 
-        filtered_df = df[(df['book_name'].isin(selected_books)) & (df['country'].isin(selected_countries))].copy()
-        
-        filtered_df["count"] = filtered_df.groupby(["latitude", "longitude"])["latitude"].transform("count")
-        min_count, max_count = filtered_df["count"].min(), filtered_df["count"].max()
-        filtered_df["color_intensity"] = np.interp(filtered_df["count"], [min_count, max_count], [50, 255])
-        # st.dataframe(filtered_df)
+        site_choices = load_site_choices()
+        center = st.selectbox("Center", ["Selection"] + list(site_choices.keys()), on_change=bib_sites_reset_focus)
 
-        if filtered_df.empty:
+        st.session_state.setdefault("bs_zoom", DEFAULT_ZOOM)
+        zoom = st.slider("Zoom", min_value=3, max_value=12, key="bs_zoom")
+
+        # A Streamlit map can't report where it was panned, so the points follow Center and Zoom instead,
+        # with a margin of one map on every side (overscan=3) for panning around the center
+        st.caption(
+            "Drag the map to look around the center; zoom with the slider or by clicking a grouped point. "
+            "Points are loaded up to one map-width around the center: pick another Center to go further."
+        )
+        view = initial_view(load_site_index(), selected_books, selected_countries, center=site_choices.get(center), zoom=zoom)
+        if view is not None and "bs_focus" in st.session_state:
+            view = map_view(*st.session_state["bs_focus"], zoom)
+        # st.dataframe(sites)
+
+        if view is None:
             pass
         else:
+            sites = viewport_layer_data(load_site_index(), selected_books, selected_countries, view, overscan=3)
+
             layer = pdk.Layer(
                 "ScatterplotLayer",
-                data=filtered_df,
+                id="bible-sites",
+                data=sites,
                 get_position=["longitude", "latitude"],
                 get_fill_color="[255, 0, 0, color_intensity]",
-                get_radius=500,
+                get_radius="radius",
+                radius_min_pixels=2,
                 pickable=True,
             )
 
-            mid_lat = filtered_df["latitude"].mean()
-            mid_long = filtered_df["longitude"].mean()
-
             view_state = pdk.ViewState(
-                longitude=mid_long,
-                latitude=mid_lat,
-                zoom=5,
+                longitude=view["longitude"],
+                latitude=view["latitude"],
+                zoom=zoom,
                 pitch=0,
             )
 
             tooltip = {
                 "html": (
-                    "<b>Verse:</b> {book_name} {chapter_number}:{verse_number}<br/>"
-                    "<b>Scripture:</b> \"{verse_text}\"<br/>"
-                    "<b>Version:</b> KJV (King James Version)<br/>"
                     "<b>Ancient Place:</b> {name_id_ancient}<br/>"
                     "<b>Modern Place:</b> {name_id_modern}<br/>"
+                    "<b>Mentions:</b> {count}<br/>"
                     "<b>----------</b><br/>"
-                    # "<b>Address:</b> {formatted_address}<br/>"
-                    # "<b>Latitude:</b> {latitude}<br/>"
-                    # "<b>Longitude:</b> {longitude}<br/>"
                     "<b>District / County:</b> {administrative_area_level_2}<br/>"
                     "<b>State / Province:</b> {administrative_area_level_1}<br/>"
                     "<b>Country:</b> {country}<br/>"
                     "<b>----------</b><br/>"
                     "<b>Google Maps:</b> <a href='https://www.google.com/maps/place/{latitude},{longitude}' target='_blank'>{name_id_modern}</a> <br/>"
-                    "<b>Bible.com:</b> <a href='https://www.bible.com/bible/1/{kjv_books_abv[book_name]}.{chapter_number}.{verse_number}' target='_blank'>{book_name} {chapter_number}:{verse_number}</a>"
+                    "<i>Click the site to read its verses.</i>"
                 ),
                 "style": {
                     "backgroundColor": "steelblue",
@@ -973,11 +1057,35 @@ def bib_sites():
                 layers=[layer],
                 map_provider="carto",
                 initial_view_state=view_state,
+                views=[pdk.View(type="MapView", controller=MAP_CONTROLLER)],
                 height = 1000,
                 tooltip=tooltip,
             )
 
-            st.pydeck_chart(deck)
+            event = st.pydeck_chart(deck, on_select=bib_sites_zoom_in, selection_mode="single-object", key="bible_sites_map")
+
+            selected = event.selection["objects"].get("bible-sites", [])
+            if selected and selected[0]["site_id"] < 0:
+                st.info("Zoomed in on a group of nearby sites. Click a single site to read its verses.")
+            elif selected:
+                site = selected[0]
+                mentions = site_mentions(df, load_site_index(), site["site_id"], selected_books)
+                mentions = mentions.assign(
+                    bible_com=[
+                        f"https://www.bible.com/bible/1/{kjv_books_abv[b]}.{c}.{v}"
+                        for b, c, v in zip(mentions["book_name"], mentions["chapter_number"], mentions["verse_number"])
+                    ]
+                )
+                st.subheader(f"{site['name_id_modern']} ({site['name_id_ancient']})")
+                st.dataframe(
+                    mentions.rename(columns={
+                        "book_name": "Book", "chapter_number": "Chapter", "verse_number": "Verse",
+                        "verse_text": "Scripture", "name_id_ancient": "Ancient Place", "bible_com": "Bible.com"
+                    }),
+                    column_config={"Bible.com": st.column_config.LinkColumn(display_text="Open")},
+                    hide_index=True,
+                    use_container_width=True,
+                )
             
     st.feedback("thumbs")
     mention(
@@ -1027,61 +1135,209 @@ def bib_events():
     """)
     
 
+def cr_references():
+    df = load_kjv_clean()
+    ranges = load_kjv_ranges()
+    cr_graph = load_cr_graph()
+    kjv_books = load_kjv_books()
+    
+    directions = {"Referenced By": "in", "References": "out", "Both": "both"}
+    
+    with st.container(border=True):
+        book_name = st.selectbox("Book", kjv_books, index=kjv_books.index("Isaiah"))
+        
+        book_chapters = ranges.chapter_number[ranges.chapter_book == kjv_books.index(book_name)]
+        chapter_number = st.selectbox(
+            "Chapter",
+            book_chapters,
+            index=min(52, len(book_chapters) - 1),
+        )
+        
+        start, end = chapter_range(ranges, book_name, chapter_number)
+        chapter_verses = df["verse_number"].iloc[start:end].to_numpy()
+        verse_number = st.selectbox("Verse", ["All"] + list(chapter_verses))
+        
+        direction = st.radio("Direction", list(directions.keys()), horizontal=True)
+        min_votes = st.number_input("Min. Votes", value=None, step=1, placeholder="No filter (links can have negative votes)")
+        hops = st.slider("Hops", min_value=1, max_value=3, value=1)
+        top_k = st.slider("Top-K per Hop", min_value=5, max_value=50, value=10, disabled=hops == 1)
+    
+    if verse_number == "All":
+        verse_ids = range(start, end)
+    else:
+        verse_ids = [start + int(np.flatnonzero(chapter_verses == verse_number)[0])]
+    edges = neighbors(cr_graph, verse_ids, direction=directions[direction], min_votes=min_votes)
+    
+    st.caption(f"{len(edges)} cross-references" + (f" with at least {min_votes:g} votes" if min_votes is not None else ""))
+    if len(edges):
+        book_counts = rollup(edges, ranges, level="book")
+        chart_cr_count = go.Figure(
+            data=[
+                go.Bar(
+                    x=book_counts["book_name"],
+                    y=book_counts["references"],
+                    customdata=book_counts["votes"],
+                    hovertemplate="Book: %{x}<br># of References: %{y}<br>Votes: %{customdata}<extra></extra>",
+                    marker=dict(
+                        color=book_counts["references"],
+                        colorscale="Reds",
+                    )
+                )
+            ]
+        )
+        chart_cr_count.update_layout(
+            xaxis_title="Book",
+            yaxis_title="# of References",
+            xaxis=dict(categoryorder="array", categoryarray=kjv_books),
+        )
+        st.plotly_chart(chart_cr_count, use_container_width=True)
+        
+        st.dataframe(
+            edge_table(edges, df, limit=500).rename(
+                columns={"reference": "Reference", "verse_text": "Text", "votes": "Votes", "direction": "Direction"}
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+    
+    if hops > 1:
+        related = expand(cr_graph, verse_ids, hops=hops, top_k=top_k, direction=directions[direction], min_votes=min_votes)
+        reference, verse_text = verse_labels(df, related["verse_id"].to_numpy())
+        st.subheader("Related Passages")
+        if len(related):
+            st.plotly_chart(neighborhood_figure(related, df), use_container_width=True)
+        st.dataframe(
+            pd.DataFrame({
+                "Hop": related["hop"],
+                "Reference": reference,
+                "Text": verse_text,
+                "Score": related["score"],
+                "Path": expansion_paths(related, df),
+                "Path Votes": related["path_votes"],
+            }),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+def cr_heatmap():
+    cr_matrices = load_cr_matrices()
+    testaments = ["All"] + list(TESTAMENTS.keys())
+    
+    with st.container(border=True):
+        col_source, col_target = st.columns(2)
+        with col_source:
+            source_testament = st.selectbox("Testament (Source)", testaments)
+            source_genres = st.multiselect("Genre (Source)", list(BOOK_GENRES.keys()))
+        with col_target:
+            target_testament = st.selectbox("Testament (Target)", testaments)
+            target_genres = st.multiselect("Genre (Target)", list(BOOK_GENRES.keys()))
+        
+        level = st.radio("Level", list(HEATMAP_LEVELS.keys()), horizontal=True)
+        normalize = st.radio("Values", list(HEATMAP_NORMALIZATIONS.keys()), horizontal=True)
+        log_scale = st.toggle("Log Scale")
+    
+    fig = heatmap_figure(
+        cr_matrices,
+        sources=select_books(source_testament, source_genres),
+        targets=select_books(target_testament, target_genres),
+        level=HEATMAP_LEVELS[level],
+        normalize=HEATMAP_NORMALIZATIONS[normalize],
+        log_scale=log_scale,
+    )
+    fig.update_layout(
+        width=1200,
+        height=1200,
+        font=dict(size=12)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def cr_chord():
+    cr_matrices = load_cr_matrices()
+    
+    with st.container(border=True):
+        min_links = st.slider("Min. References", min_value=1, max_value=500, value=CHORD_MIN_LINKS)
+        top_k = st.selectbox("Top Chords", ["All", 100, 250, 500, 1000])
+        gl = st.toggle("WebGL")
+    
+    fig = chord_figure(
+        cr_matrices,
+        top_k=None if top_k == "All" else top_k,
+        min_links=min_links,
+        gl=gl,
+    )
+    fig.update_layout(
+        width=1200,
+        height=1200,
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def cr_sankey():
+    cr_matrices = load_cr_matrices()
+    
+    with st.container(border=True):
+        source = st.radio("Source", list(TESTAMENTS.keys()), horizontal=True)
+        target = [t for t in TESTAMENTS if t != source][0]
+        source_books = st.multiselect("Books (Source)", TESTAMENTS[source])
+        target_books = st.multiselect("Books (Target)", TESTAMENTS[target])
+        min_links = st.slider("Min. References", min_value=1, max_value=500, value=1)
+    
+    fig = sankey_figure(
+        cr_matrices,
+        source=source,
+        min_links=min_links,
+        source_books=source_books,
+        target_books=target_books,
+    )
+    fig.update_layout(
+        width=1200,
+        height=1500,
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def cr_network():
+    cr_matrices = load_cr_matrices()
+    
+    with st.container(border=True):
+        min_links = st.slider("Min. References", min_value=1, max_value=1000, value=1)
+        gl = st.toggle("WebGL", value=True)
+    
+    fig = network_figure(cr_matrices, min_links=min_links, gl=gl)
+    fig.update_layout(
+        width=1200,
+        height=1200,
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
 def bib_cr():
     st.header("Bible Cross-References")
     
     chart = st.selectbox(
             "Chart",
-            ["Heatmap", "Chord Diagram", "Sankey Diagram",  "Network Graph (Plotly)", "Network Graph (Pyvis)"]
+            ["Live References", "Heatmap", "Chord Diagram", "Sankey Diagram", "Network Graph"]
         )
     
     if chart:
-        if chart == "Heatmap":
-            # fig = load_fig_cr_hm()
-            # fig.update_layout(
-            #     width=1200,
-            #     height=1200,
-            #     font=dict(size=12)
-            # )
-            # st.plotly_chart(fig, use_container_width=True)
-            st.image("assets/models/figure_cr_hm.png", use_container_width=True)
+        if chart == "Live References":
+            cr_references()
+            
+        elif chart == "Heatmap":
+            cr_heatmap()
             
         elif chart == "Chord Diagram":
-            # fig = load_fig_cr_cd()
-            # fig.update_layout(
-            #     width=1200,
-            #     height=1200,
-            # )
-            # st.plotly_chart(fig, use_container_width=True)
-            st.image("assets/models/figure_cr_cd.png", use_container_width=True)
+            cr_chord()
         
         elif chart == "Sankey Diagram":
-            # fig = load_fig_cr_sd()
-            # fig.update_layout(
-            #     width=1200,
-            #     height=1500,
-            # )
-            # st.plotly_chart(fig, use_container_width=True)
-            st.image("assets/models/figure_cr_sd.png", use_container_width=True)
-            
-        elif chart == "Network Graph (Plotly)":
-            # fig = load_fig_cr_ng()
-            # fig.update_layout(
-            #     width=1200,
-            #     height=1200,
-            # )
-            # st.plotly_chart(fig, use_container_width=True)
-            st.image("assets/models/figure_cr_ng.png", use_container_width=True)
+            cr_sankey()
             
-        elif chart == "Network Graph (Pyvis)":
-            html = load_fig_cr_pv()
-            components.html(html, height=1100, scrolling=True)
+        elif chart == "Network Graph":
+            cr_network()
         
         st.divider()
-        st.warning("""__Disclaimer__: This chart has been downloaded for faster loading.  
-                To view the interactive version, run `app_local.py` from https://github.com/verneylmavt/st-kjv-vis.
-                """, icon="⚠")
-        
         container = st.container(border=True)
         container.markdown("""
         __Source__: OpenBible.info - Bible Cross References  
@@ -1098,6 +1354,7 @@ def bib_cr():
 def main():
     st.set_page_config(page_title="Bible Analysis and Visualization",
                     layout="wide")
+    load_warmup()
     
     st.title("KJV Bible Analysis and Visualization")
     st.divider()
@@ -1107,7 +1364,7 @@ def main():
         category = st.radio("Charts", ["Bible Overview", 
                                     "Verses / Book", "Chapters / Book", "Verses / Chapter", 
                                     "Lexical Richness / Book", "Sentiment / Book",
-                                    "Word Cloud", 
+                                    "Word Cloud", "Search", 
                                     "Bible Sites", "Bible Events", "Bible Cross-References"])
     
     if category == "Bible Overview":
@@ -1124,6 +1381,8 @@ def main():
         snt_book()
     elif category == "Word Cloud":
         word_cloud()
+    elif category == "Search":
+        verse_search()
     elif category == "Bible Sites":
         bib_sites()
     elif category == "Bible Events":
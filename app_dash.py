@@ -1,26 +1,39 @@
-import os
-import random
 import json
 import functools
 import base64
-import io
+from urllib.parse import urlencode
 
 import dash
-from dash import dcc, html, Input, Output, State, no_update
+from dash import dcc, html, dash_table, Input, Output, State, Patch, no_update
 import dash_bootstrap_components as dbc
+import dash_deck
+from flask import Response, abort, request
 
-import spacy
 import numpy as np
 import pandas as pd
 
-import plotly.express as px
 import plotly.graph_objects as go
-import matplotlib.pyplot as plt
 
-from wordcloud import WordCloud, ImageColorGenerator, STOPWORDS
-from PIL import Image
+from kjv.books import BOOK_GENRES, TESTAMENTS
+from kjv.cloud import WORDCLOUD_CACHE_DIR, WORDCLOUD_MASKS, WordCloudCache
+from kjv.cr_figures import CHORD_MIN_LINKS, HEATMAP_LEVELS, HEATMAP_NORMALIZATIONS, chord_figure, heatmap_figure, neighborhood_figure, network_figure, sankey_figure, select_books
+from kjv.cr_graph import edge_table, expand, expansion_paths, neighbors, read_cr_graph, rollup, verse_labels
+from kjv.cr_matrix import KJV_CR_MATRIX_DIR, read_cr_matrices
+from kjv.figures import MODEL_FIGURES, data_version, figure_body, read_figure_body, version_etag
+from kjv.lexical import lexical_richness, metric_caption, read_token_index
+from kjv.ranges import book_ranges, chapter_range, sort_canonical
+from kjv.search import read_search_index, search
+from kjv.shared import enable_copy_on_write, share
+from kjv.sites import DEFAULT_ZOOM, MAP_CONTROLLER, build_site_index, initial_view, site_choices, site_mentions, view_at_point, viewport_layer_data
+from kjv.stats import KJV_STATS_BOOK_CSV, KJV_STATS_CHAPTER_CSV, read_stats_book, read_stats_chapter
+from kjv.store import read_kjv_clean
+from kjv.warmup import warm_up
+from kjv.wordfreq import read_word_frequencies
 
-import pydeck as pdk
+# Frames handed out by the loaders are shared by every session in the process.
+# With Copy-on-Write, anything derived from them (filters, slices, groupbys)
+# is a lazy copy, so pages never need a defensive .copy() of their own.
+enable_copy_on_write()
 
 # ----------------------
 # Loading Functions
@@ -28,27 +41,67 @@ import pydeck as pdk
 
 @functools.lru_cache(maxsize=None)
 def load_kjv_clean():
-    df = pd.read_csv("data/kjv_clean.csv")
-    df = df.astype({col: 'string' for col in df.select_dtypes(include='object').columns})
-    return df
+    df = read_kjv_clean()
+    return share(df)
+
+@functools.lru_cache(maxsize=None)
+def load_kjv_ranges():
+    return book_ranges(load_kjv_clean())
+
+@functools.lru_cache(maxsize=None)
+def load_cr_graph():
+    return read_cr_graph()
+
+@functools.lru_cache(maxsize=None)
+def load_cr_matrices():
+    return read_cr_matrices()
 
 @functools.lru_cache(maxsize=None)
 def load_kjv_locs_all():
     df = pd.read_csv("data/kjv_locs_all.csv")
-    return df
+    df['country'] = df['country'].replace('-', 'State of Palestine')
+    df = sort_canonical(df)
+    return share(df)
+
+@functools.lru_cache(maxsize=None)
+def load_site_index():
+    site_index = build_site_index(load_kjv_locs_all())
+    return site_index
+
+@functools.lru_cache(maxsize=None)
+def load_site_choices():
+    choices = site_choices(load_site_index())
+    return choices
 
 @functools.lru_cache(maxsize=None)
 def load_sentiment_by_book():
     df = pd.read_csv("data/sentiment_by_book.csv")
-    return df
+    return share(df)
 
 @functools.lru_cache(maxsize=None)
-def load_spacy():
-    model_path = os.path.join("data", "en_core_web_sm", "en_core_web_sm-3.8.0")
-    if os.path.isdir(model_path):
-        return spacy.load(model_path)
-    else:
-        raise FileNotFoundError(f"SpaCy model not found at {model_path}. Please ensure it is correctly placed.")
+def load_token_index():
+    token_index = read_token_index()
+    return token_index
+
+@functools.lru_cache(maxsize=32)
+def load_lexical_richness(level, metric, window):
+    df = lexical_richness(load_token_index(), level=level, metric=metric, window=window)
+    return share(df)
+
+@functools.lru_cache(maxsize=None)
+def load_word_frequencies():
+    word_frequencies = read_word_frequencies()
+    return word_frequencies
+
+@functools.lru_cache(maxsize=None)
+def load_word_cloud_cache():
+    wordcloud_cache = WordCloudCache(load_word_frequencies(), cache_dir=WORDCLOUD_CACHE_DIR)
+    return wordcloud_cache
+
+@functools.lru_cache(maxsize=None)
+def load_search_index():
+    search_index = read_search_index()
+    return search_index
 
 @functools.lru_cache(maxsize=None)
 def load_kjv_books():
@@ -154,6 +207,14 @@ def load_kjv_countries():
     ]
     return kjv_countries
 
+@functools.lru_cache(maxsize=None)
+def load_lex_rich_metric_map():
+    metric_map = {
+        "Unique-to-Total Word Ratio (TTR)": "TTR",
+        "Moving-Average Type-Token Ratio (MATTR)": "MATTR"
+    }
+    return metric_map
+
 @functools.lru_cache(maxsize=None)
 def load_pos_map():
     pos_map = {
@@ -178,51 +239,14 @@ def load_pos_map():
     return pos_map
 
 @functools.lru_cache(maxsize=None)
-def load_fig_cr_cd():
-    with open("models/figure_cr_cd.json", 'r') as f:
-        figure_cr_cd_json = f.read()
-    fig = go.Figure(json.loads(figure_cr_cd_json))
-    return fig
-
-@functools.lru_cache(maxsize=None)
-def load_fig_cr_sd():
-    with open("models/figure_cr_sd.json", 'r') as f:
-        figure_cr_sd_json = f.read()
-    fig = go.Figure(json.loads(figure_cr_sd_json))
-    return fig
+def load_figure_body(name):
+    return read_figure_body(name)
 
-@functools.lru_cache(maxsize=None)
-def load_fig_cr_hm():
-    with open("models/figure_cr_hm.json", 'r') as f:
-        figure_cr_hm_json = f.read()
-    fig = go.Figure(json.loads(figure_cr_hm_json))
-    return fig
+@functools.lru_cache(maxsize=32)
+def load_live_figure_body(name, params, etag):
+    _, figure, _ = LIVE_FIGURES[name]
+    return figure_body(figure(**dict(params)), etag=etag)
 
-@functools.lru_cache(maxsize=None)
-def load_fig_cr_ng():
-    with open("models/figure_cr_ng.json", 'r') as f:
-        figure_cr_ng_json = f.read()
-    fig = go.Figure(json.loads(figure_cr_ng_json))
-    return fig
-
-@functools.lru_cache(maxsize=None)
-def load_fig_timeline_bc():
-    with open("models/figure_timeline_ad.json", 'r') as f:
-        figure_timeline_bc_json = f.read()
-    fig = go.Figure(json.loads(figure_timeline_bc_json))
-    return fig
-
-@functools.lru_cache(maxsize=None)
-def load_fig_timeline_ad():
-    with open("models/figure_timeline_ce.json", 'r') as f:
-        figure_timeline_ad_json = f.read()
-    fig = go.Figure(json.loads(figure_timeline_ad_json))
-    return fig
-
-@functools.lru_cache(maxsize=None)
-def load_fig_cr_pv():
-    html_str = open("models/network_cr_pv.html", "r", encoding="utf-8").read()
-    return html_str
 
 # ----------------------
 # Page Functions (Charts)
@@ -327,14 +351,11 @@ def bible_overview_page():
     graph = dcc.Graph(figure=fig, config={'responsive': True})
     return html.Div([header, graph])
 
-def verses_book_page():
-    header = html.H1("# of Verses per Book")
-    
-    df = load_kjv_clean().copy()
+def verses_book_figure():
+    stats_book = read_stats_book()
     kjv_books = load_kjv_books()
     
-    verse_count_per_book = df.groupby("book_name").size().reset_index(name="verse_count")
-    verse_count_per_book.rename(columns={"book_name": "Book", "verse_count": "# of Verses"}, inplace=True)
+    verse_count_per_book = stats_book[["book_name", "verse_count"]].rename(columns={"book_name": "Book", "verse_count": "# of Verses"})
     
     chart_verse_count = go.Figure(
         data=[go.Bar(
@@ -358,17 +379,21 @@ def verses_book_page():
         yaxis=dict(categoryorder="array", categoryarray=list(reversed(kjv_books))),
         height=1500
     )
-    graph = dcc.Graph(figure=chart_verse_count, config={'responsive': True})
+    return chart_verse_count
+
+def verses_book_page():
+    header = html.H1("# of Verses per Book")
+    graph = html.Div([
+        dcc.Store(id="verses-book-src", data="/figures/verses_book.json"),
+        dcc.Graph(id="verses-book", config={'responsive': True})
+    ])
     return html.Div([header, graph])
 
-def chapters_book_page():
-    header = html.H1("# of Chapters per Book")
-    
-    df = load_kjv_clean().copy()
+def chapters_book_figure():
+    stats_book = read_stats_book()
     kjv_books = load_kjv_books()
     
-    chapter_count_per_book = df.groupby("book_name")["chapter_number"].max().reset_index()
-    chapter_count_per_book.rename(columns={"book_name": "Book", "chapter_number": "# of Chapters"}, inplace=True)
+    chapter_count_per_book = stats_book[["book_name", "chapter_count"]].rename(columns={"book_name": "Book", "chapter_count": "# of Chapters"})
     
     chart_chapter_count = go.Figure(
         data=[go.Bar(
@@ -392,17 +417,21 @@ def chapters_book_page():
         yaxis=dict(categoryorder="array", categoryarray=list(reversed(kjv_books))),
         height=1500
     )
-    graph = dcc.Graph(figure=chart_chapter_count, config={'responsive': True})
+    return chart_chapter_count
+
+def chapters_book_page():
+    header = html.H1("# of Chapters per Book")
+    graph = html.Div([
+        dcc.Store(id="chapters-book-src", data="/figures/chapters_book.json"),
+        dcc.Graph(id="chapters-book", config={'responsive': True})
+    ])
     return html.Div([header, graph])
 
-def verses_chapter_page():
-    header = html.H1("# of Verses per Chapter")
-    
-    df = load_kjv_clean().copy()
+def verses_chapter_figure():
+    stats_chapter = read_stats_chapter()
     kjv_books = load_kjv_books()
     
-    chapter_verse_counts = df.groupby(["book_name", "chapter_number"]).size().reset_index(name="verse_count")
-    chapter_verse_counts.rename(columns={"book_name": "Book", "chapter_number": "Chapter", "verse_count": "# of Verses"}, inplace=True)
+    chapter_verse_counts = stats_chapter[["book_name", "chapter_number", "verse_count"]].rename(columns={"book_name": "Book", "chapter_number": "Chapter", "verse_count": "# of Verses"})
     
     chart_verse_heatmap = go.Figure(
         data=[go.Heatmap(
@@ -423,58 +452,90 @@ def verses_chapter_page():
         yaxis=dict(categoryorder="array", categoryarray=list(reversed(kjv_books))),
         height=1500
     )
-    graph = dcc.Graph(figure=chart_verse_heatmap, config={'responsive': True})
+    return chart_verse_heatmap
+
+def verses_chapter_page():
+    header = html.H1("# of Verses per Chapter")
+    graph = html.Div([
+        dcc.Store(id="verses-chapter-src", data="/figures/verses_chapter.json"),
+        dcc.Graph(id="verses-chapter", config={'responsive': True})
+    ])
     return html.Div([header, graph])
 
 def lex_rich_book_page():
-    header = html.H1("Lexical Richness (Unique-to-Total Word Ratio) per Book")
-    
-    df = load_kjv_clean().copy()
+    header = html.H1("Lexical Richness per Book / Chapter")
+    metric_map = load_lex_rich_metric_map()
+    form = html.Div([
+        html.Label("Level"),
+        dcc.Dropdown(
+            id="lr-level",
+            options=[{"label": "Book", "value": "Book"}, {"label": "Chapter", "value": "Chapter"}],
+            value="Book"
+        ),
+        html.Label("Metric"),
+        dcc.Dropdown(
+            id="lr-metric",
+            options=[{"label": key, "value": key} for key in list(metric_map.keys())],
+            value=list(metric_map.keys())[0]
+        ),
+        html.Label("Window (# of Words, MATTR only)"),
+        dcc.Input(id="lr-window", type="number", min=10, max=5000, step=50, value=500),
+        html.Div(id="lr-output")
+    ])
+    return html.Div([header, form])
+
+def lex_rich_figure(level, metric, window):
     kjv_books = load_kjv_books()
+    metric_map = load_lex_rich_metric_map()
     
-    def calculate_lexical_richness(df):
-        lexical_data = []
-        for book, verses in df.groupby("book_name"):
-            all_text = " ".join(verses["verse_text"])
-            words = all_text.split()
-            total_words = len(words)
-            unique_words = len(set(words))
-            lexical_richness = unique_words / total_words if total_words > 0 else 0
-            lexical_data.append({"book_name": book, "lexical_richness": lexical_richness})
-        return pd.DataFrame(lexical_data)
-    
-    lexical_richness_df = calculate_lexical_richness(df)
-    lexical_richness_df.rename(columns={"book_name": "Book", "lexical_richness": "Lexical Richness"}, inplace=True)
+    lexical_richness_df = load_lexical_richness(level, metric_map[metric], window).rename(
+        columns={"book_name": "Book", "chapter_number": "Chapter", "lexical_richness": "Lexical Richness"}
+    )
     
-    chart_lexical_richness = go.Figure(
-        data=[go.Bar(
-            x=lexical_richness_df["Lexical Richness"],
-            y=lexical_richness_df["Book"],
-            orientation='h',
-            text=lexical_richness_df["Lexical Richness"],
-            hovertemplate="Book: %{y}<br>Lexical Richness: %{x}<extra></extra>",
-            marker=dict(
-                color=lexical_richness_df["Lexical Richness"],
+    if level == "Book":
+        chart_lexical_richness = go.Figure(
+            data=[go.Bar(
+                x=lexical_richness_df["Lexical Richness"],
+                y=lexical_richness_df["Book"],
+                orientation='h',
+                text=lexical_richness_df["Lexical Richness"],
+                hovertemplate="Book: %{y}<br>Lexical Richness: %{x}<extra></extra>",
+                marker=dict(
+                    color=lexical_richness_df["Lexical Richness"],
+                    colorscale="Reds",
+                    cmin=0,
+                    cmax=0.6
+                )
+            )]
+        )
+        chart_lexical_richness.update_layout(xaxis_title=metric)
+    else:
+        chart_lexical_richness = go.Figure(
+            data=[go.Heatmap(
+                x=lexical_richness_df["Chapter"],
+                y=lexical_richness_df["Book"],
+                z=lexical_richness_df["Lexical Richness"],
                 colorscale="Reds",
-                cmin=0,
-                cmax=0.6
-            )
-        )]
-    )
+                colorbar=dict(title="Lexical Richness"),
+                zmin=0,
+                zmax=1,
+                hovertemplate="Book: %{y}<br>Chapter: %{x}<br>Lexical Richness: %{z}<extra></extra>"
+            )]
+        )
+        chart_lexical_richness.update_layout(xaxis_title="Chapter")
     
     chart_lexical_richness.update_layout(
-        xaxis_title="Lexical Richness (Unique-to-Total Word Ratio)",
         yaxis_title="Book",
         yaxis=dict(categoryorder="array", categoryarray=list(reversed(kjv_books))),
         height=1500
     )
-    graph = dcc.Graph(figure=chart_lexical_richness, config={'responsive': True})
-    return html.Div([header, graph])
+    return chart_lexical_richness
 
 def snt_book_page():
+
     header = html.H1("Sentiment Analysis per Book")
     
-    sentiment_by_book = load_sentiment_by_book().copy()
+    sentiment_by_book = load_sentiment_by_book()
     kjv_books = load_kjv_books()
     
     chart_sentiment_by_book = go.Figure(
@@ -503,64 +564,9 @@ def snt_book_page():
     return html.Div([header, graph])
 
 # ----------------------
-# Word Cloud Page and Helper Function
+# Word Cloud Page
 # ----------------------
 
-def generate_word_cloud(book_name, df, pos_tag=None, bg="White"):
-    book_verses = df[df["book_name"] == book_name]["verse_text"]
-    
-    if book_verses.empty:
-        print(f"No Verses in Book: {book_name}")
-        return None
-    
-    text = " ".join(book_verses)
-    
-    if pos_tag is None:
-        texts = text
-    else:
-        nlp = load_spacy()
-        doc = nlp(text)
-        tokens = [token.text for token in doc if token.pos_ == pos_tag]
-        texts = " ".join(tokens)
-        
-    number = random.randint(1, 7)    
-    coloring = np.array(Image.open(f"assets/wordcloud/{number}.png"))
-    
-    stopwords = set(STOPWORDS)
-    
-    wordcloud = WordCloud(
-        background_color="white",
-        mask=coloring,
-        stopwords=stopwords,
-        repeat=False
-    )
-    wordcloud.generate(texts)
-    
-    image_colors = ImageColorGenerator(coloring)
-    wordcloud.recolor(color_func=image_colors)
-    
-    wordcloud_image = wordcloud.to_image()
-    
-    def remove_bg(wordcloud_image):
-        img = wordcloud_image.convert("RGBA")
-        datas = img.getdata()
-        
-        new_data = []
-        for item in datas:
-            if item[0] == 255 and item[1] == 255 and item[2] == 255:
-                new_data.append((255, 255, 255, 0))
-            else:
-                new_data.append(item)
-        img.putdata(new_data)
-        return img
-    
-    if bg == "White":
-        img = wordcloud_image
-    elif bg == "Transparent":
-        img = remove_bg(wordcloud_image)
-        
-    return img
-
 def word_cloud_page():
     header = html.H1("Word Cloud")
     kjv_books = load_kjv_books()
@@ -578,6 +584,12 @@ def word_cloud_page():
             options=[{"label": key, "value": key} for key in list(pos_map.keys())],
             value="All"
         ),
+        html.Label("Mask"),
+        dcc.Dropdown(
+            id="wc-mask",
+            options=[{"label": "Auto", "value": "Auto"}] + [{"label": str(m), "value": m} for m in WORDCLOUD_MASKS],
+            value="Auto"
+        ),
         html.Label("Background"),
         dcc.Dropdown(
             id="wc-bg",
@@ -587,9 +599,41 @@ def word_cloud_page():
         html.Button("Generate", id="wc-generate", n_clicks=0),
         html.Div(id="wc-output")
     ])
-    footer = html.Div([
-        html.P("GitHub Repo: verneylmavt/st-kjv-vis - https://github.com/verneylmavt/st-kjv-vis"),
-        html.P("Other ML Tasks - https://verneylogyt.streamlit.app/")
+    return html.Div([header, form])
+
+# ----------------------
+# Search Page
+# ----------------------
+
+def verse_search_page():
+    header = html.H1("Search")
+    kjv_books = load_kjv_books()
+    form = html.Div([
+        html.Label("Query"),
+        dcc.Input(
+            id="vs-query",
+            type="text",
+            placeholder='e.g. "in the beginning" light',
+            debounce=True,
+            style={'width': '100%'}
+        ),
+        html.Label("Testament"),
+        dcc.Dropdown(
+            id="vs-testament",
+            options=[{"label": t, "value": t} for t in ["All"] + list(TESTAMENTS.keys())],
+            value="All"
+        ),
+        html.Label("Books"),
+        dcc.Dropdown(
+            id="vs-books",
+            options=[{"label": b, "value": b} for b in kjv_books],
+            value=[],
+            multi=True
+        ),
+        html.Label("Results"),
+        dcc.Input(id="vs-limit", type="number", min=10, max=500, step=10, value=50),
+        html.Button("Search", id="vs-search", n_clicks=0),
+        html.Div(id="vs-output")
     ])
     return html.Div([header, form])
 
@@ -597,15 +641,69 @@ def word_cloud_page():
 # Bible Sites Page
 # ----------------------
 
+BIBLE_SITES_TOOLTIP = {
+    "html": (
+        "<b>Ancient Place:</b> {name_id_ancient}<br/>"
+        "<b>Modern Place:</b> {name_id_modern}<br/>"
+        "<b>Mentions:</b> {count}<br/>"
+        "<b>----------</b><br/>"
+        "<b>District / County:</b> {administrative_area_level_2}<br/>"
+        "<b>State / Province:</b> {administrative_area_level_1}<br/>"
+        "<b>Country:</b> {country}<br/>"
+        "<b>----------</b><br/>"
+        "<b>Google Maps:</b> <a href='https://www.google.com/maps/place/{latitude},{longitude}' target='_blank'>{name_id_modern}</a> <br/>"
+        "<i>Click the site to read its verses.</i>"
+    ),
+    "style": {
+        "backgroundColor": "steelblue",
+        "color": "white"
+    }
+}
+
+def bible_sites_view_state(view):
+    return {"latitude": view["latitude"], "longitude": view["longitude"], "zoom": view["zoom"], "pitch": 0}
+
+def bible_sites_spec(sites, view):
+    # pydeck is only needed by this page (dash_deck stays at the top: Dash must see its scripts at startup)
+    import pydeck as pdk
+
+    layer = pdk.Layer(
+        "ScatterplotLayer",
+        id="bible-sites",
+        data=sites,
+        get_position=["longitude", "latitude"],
+        get_fill_color="[255, 0, 0, color_intensity]",
+        get_radius="radius",
+        radius_min_pixels=2,
+        pickable=True,
+    )
+    deck = pdk.Deck(
+        layers=[layer],
+        map_provider="carto",
+        initial_view_state=pdk.ViewState(**bible_sites_view_state(view)),
+        views=[pdk.View(type="MapView", controller=MAP_CONTROLLER)],
+    )
+    return json.loads(deck.to_json())
+
 def bib_sites_page():
     header = html.H1("Bible Sites")
     
-    df = load_kjv_locs_all().copy()
-    df['country'] = df['country'].replace('-', 'State of Palestine')
     kjv_books = load_kjv_books()
-    kjv_books_abv = load_kjv_books_abv()
     kjv_countries = load_kjv_countries()
     
+    # The deck is created once per page; panning and filter changes patch its layer data (see update_bible_sites).
+    # dash_deck draws the base map (the spec's carto mapStyle) only when mapboxKey is set,
+    # and carto styles need no Mapbox token, so an empty key is enough
+    view = initial_view(load_site_index(), kjv_books, kjv_countries, zoom=DEFAULT_ZOOM)
+    sites = viewport_layer_data(load_site_index(), kjv_books, kjv_countries, view)
+    deck = dash_deck.DeckGL(
+        data=bible_sites_spec(sites, view),
+        id="bs-deck",
+        mapboxKey="",
+        tooltip=BIBLE_SITES_TOOLTIP,
+        enableEvents=["click", "dragEnd"],
+    )
+    
     form = html.Div([
         html.Label("Books"),
         dcc.Dropdown(
@@ -621,16 +719,20 @@ def bib_sites_page():
             value=kjv_countries,
             multi=True
         ),
-        html.Div(id="bs-map")
-    ])
-    footer = html.Div([
-        html.P("GitHub Repo: verneylmavt/st-kjv-vis - https://github.com/verneylmavt/st-kjv-vis"),
-        html.P("Other ML Tasks - https://verneylogyt.streamlit.app/"),
-        html.Hr(),
-        html.Div([
-            html.P("__Source__: OpenBible.info - Bible Geocoding"),
-            html.P("__URL__: https://www.openbible.info/geo/")
-        ])
+        html.Label("Center"),
+        dcc.Dropdown(
+            id="bs-center",
+            options=[{"label": "Selection", "value": -1}] + [{"label": label, "value": site_id} for label, site_id in load_site_choices().items()],
+            value=-1
+        ),
+        html.Label("Zoom"),
+        dcc.Slider(id="bs-zoom", min=3, max=12, step=1, value=DEFAULT_ZOOM),
+        html.P("Drag the map to look around; the points follow it. Zoom with the slider."),
+        html.Div(id="bs-status"),
+        dcc.Store(id="bs-view", data=view),
+        dcc.Store(id="bs-drag"),
+        html.Div(deck, style={"position": "relative", "width": "100%", "height": "1000px"}),
+        html.Div(id="bs-verses")
     ])
     return html.Div([header, form])
 
@@ -641,20 +743,17 @@ def bib_sites_page():
 def bib_events_page():
     header = html.H1("Bible Events")
     subheader_bc = html.H2("BC (Before Christ)")
-    fig_bc = load_fig_timeline_bc()
-    graph_bc = dcc.Graph(figure=fig_bc, config={'responsive': True})
+    graph_bc = html.Div([
+        dcc.Store(id="timeline-bc-src", data="/figures/timeline_bc.json"),
+        dcc.Graph(id="timeline-bc", config={'responsive': True})
+    ])
     
     subheader_ad = html.H2("AD (Anno Domini) 'In the Year of Our Lord'")
-    fig_ad = load_fig_timeline_ad()
-    graph_ad = dcc.Graph(figure=fig_ad, config={'responsive': True})
-    
-    footer = html.Div([
-        html.Hr(),
-        html.Div([
-            html.P("__Source__: Viz.Bible - Events by Robert Rouse"),
-            html.P("__URL__: https://viz.bible/")
-        ])
+    graph_ad = html.Div([
+        dcc.Store(id="timeline-ad-src", data="/figures/timeline_ad.json"),
+        dcc.Graph(id="timeline-ad", config={'responsive': True})
     ])
+    
     return html.Div([header, subheader_bc, graph_bc, subheader_ad, graph_ad])
 
 # ----------------------
@@ -666,24 +765,230 @@ def bib_cr_page():
     dropdown = dcc.Dropdown(
         id="cr-chart",
         options=[
+            {"label": "Live References", "value": "Live References"},
             {"label": "Heatmap", "value": "Heatmap"},
             {"label": "Chord Diagram", "value": "Chord Diagram"},
             {"label": "Sankey Diagram", "value": "Sankey Diagram"},
-            {"label": "Network Graph (Plotly)", "value": "Network Graph (Plotly)"},
-            {"label": "Network Graph (Pyvis)", "value": "Network Graph (Pyvis)"}
+            {"label": "Network Graph", "value": "Network Graph"}
         ],
-        value="Heatmap"
+        value="Live References"
     )
     graph_container = html.Div(id="cr-output")
-    footer = html.Div([
-        html.Hr(),
-        html.Div([
-            html.P("__Source__: OpenBible.info - Bible Cross References"),
-            html.P("__URL__: https://www.openbible.info/labs/cross-references/")
-        ])
-    ])
     return html.Div([header, dropdown, graph_container])
 
+CR_DIRECTIONS = {"Referenced By": "in", "References": "out", "Both": "both"}
+
+def cr_references_controls():
+    kjv_books = load_kjv_books()
+    return html.Div([
+        html.Label("Book"),
+        dcc.Dropdown(
+            id="cr-book",
+            options=[{"label": b, "value": b} for b in kjv_books],
+            value="Isaiah",
+            clearable=False
+        ),
+        html.Label("Chapter"),
+        dcc.Dropdown(id="cr-chapter", clearable=False),
+        html.Label("Verse"),
+        dcc.Dropdown(id="cr-verse", clearable=False),
+        html.Label("Direction"),
+        dcc.RadioItems(
+            id="cr-direction",
+            options=[{"label": d, "value": d} for d in CR_DIRECTIONS],
+            value="Referenced By",
+            inline=True
+        ),
+        html.Label("Min. Votes"),
+        dcc.Input(id="cr-min-votes", type="number", step=1, value=None, placeholder="No filter (links can have negative votes)", debounce=True),
+        html.Label("Hops"),
+        dcc.Slider(id="cr-hops", min=1, max=3, step=1, value=1),
+        html.Label("Top-K per Hop"),
+        dcc.Slider(id="cr-top-k", min=5, max=50, step=1, value=10, marks=None, tooltip={"placement": "bottom"}),
+        html.Div(id="cr-live-output")
+    ])
+
+def cr_references_view(book_name, chapter_number, verse_number, direction, min_votes, hops, top_k):
+    df = load_kjv_clean()
+    ranges = load_kjv_ranges()
+    cr_graph = load_cr_graph()
+    kjv_books = load_kjv_books()
+
+    start, end = chapter_range(ranges, book_name, chapter_number)
+    if verse_number == "All":
+        verse_ids = range(start, end)
+    else:
+        chapter_verses = df["verse_number"].iloc[start:end].to_numpy()
+        verse_ids = [start + int(np.flatnonzero(chapter_verses == verse_number)[0])]
+    edges = neighbors(cr_graph, verse_ids, direction=CR_DIRECTIONS[direction], min_votes=min_votes)
+
+    children = [html.P(f"{len(edges)} cross-references" + (f" with at least {min_votes:g} votes" if min_votes is not None else ""))]
+    if len(edges):
+        book_counts = rollup(edges, ranges, level="book")
+        fig = go.Figure(
+            data=[
+                go.Bar(
+                    x=book_counts["book_name"],
+                    y=book_counts["references"],
+                    customdata=book_counts["votes"],
+                    hovertemplate="Book: %{x}<br># of References: %{y}<br>Votes: %{customdata}<extra></extra>",
+                    marker=dict(color=book_counts["references"], colorscale="Reds")
+                )
+            ]
+        )
+        fig.update_layout(xaxis_title="Book", yaxis_title="# of References",
+                          xaxis=dict(categoryorder="array", categoryarray=kjv_books))
+        table = edge_table(edges, df, limit=500).rename(
+            columns={"reference": "Reference", "verse_text": "Text", "votes": "Votes", "direction": "Direction"}
+        )
+        children += [
+            dcc.Graph(figure=fig, config={'responsive': True}),
+            dash_table.DataTable(
+                data=table.to_dict("records"),
+                columns=[{"name": c, "id": c} for c in table.columns],
+                style_cell={'textAlign': 'left', 'whiteSpace': 'normal'},
+                page_size=20
+            )
+        ]
+
+    if hops > 1:
+        expansion = expand(cr_graph, verse_ids, hops=hops, top_k=top_k, direction=CR_DIRECTIONS[direction], min_votes=min_votes)
+        reference, verse_text = verse_labels(df, expansion["verse_id"].to_numpy())
+        related = pd.DataFrame({
+            "Hop": expansion["hop"],
+            "Reference": reference,
+            "Text": verse_text,
+            "Score": expansion["score"],
+            "Path": expansion_paths(expansion, df),
+            "Path Votes": expansion["path_votes"]
+        })
+        children.append(html.H4("Related Passages"))
+        if len(expansion):
+            children.append(dcc.Graph(figure=neighborhood_figure(expansion, df), config={'responsive': True}))
+        children += [
+            dash_table.DataTable(
+                data=related.to_dict("records"),
+                columns=[{"name": c, "id": c} for c in related.columns],
+                style_cell={'textAlign': 'left', 'whiteSpace': 'normal'},
+                page_size=20
+            )
+        ]
+    return html.Div(children)
+
+def cr_heatmap_controls():
+    testaments = ["All"] + list(TESTAMENTS.keys())
+    genres = [{"label": g, "value": g} for g in BOOK_GENRES]
+    return html.Div([
+        html.Label("Testament (Source)"),
+        dcc.Dropdown(
+            id="cr-hm-source-testament",
+            options=[{"label": t, "value": t} for t in testaments],
+            value="All",
+            clearable=False
+        ),
+        html.Label("Genre (Source)"),
+        dcc.Dropdown(id="cr-hm-source-genres", options=genres, value=[], multi=True),
+        html.Label("Testament (Target)"),
+        dcc.Dropdown(
+            id="cr-hm-target-testament",
+            options=[{"label": t, "value": t} for t in testaments],
+            value="All",
+            clearable=False
+        ),
+        html.Label("Genre (Target)"),
+        dcc.Dropdown(id="cr-hm-target-genres", options=genres, value=[], multi=True),
+        html.Label("Level"),
+        dcc.RadioItems(
+            id="cr-hm-level",
+            options=[{"label": l, "value": l} for l in HEATMAP_LEVELS],
+            value="Book",
+            inline=True
+        ),
+        html.Label("Values"),
+        dcc.RadioItems(
+            id="cr-hm-values",
+            options=[{"label": v, "value": v} for v in HEATMAP_NORMALIZATIONS],
+            value="# of References",
+            inline=True
+        ),
+        dcc.Checklist(id="cr-hm-log", options=[{"label": "Log Scale", "value": "log"}], value=[]),
+        dcc.Store(id="cr-hm-graph-src"),
+        dcc.Graph(id="cr-hm-graph", config={'responsive': True})
+    ])
+
+def cr_heatmap_figure(source_testament="All", source_genres=(), target_testament="All", target_genres=(),
+                      level="Book", values="# of References", log_scale=False):
+    fig = heatmap_figure(
+        load_cr_matrices(),
+        sources=select_books(source_testament, list(source_genres)),
+        targets=select_books(target_testament, list(target_genres)),
+        level=HEATMAP_LEVELS[level],
+        normalize=HEATMAP_NORMALIZATIONS[values],
+        log_scale=log_scale
+    )
+    fig.update_layout(width=1200, height=1200, font=dict(size=12))
+    return fig
+
+def cr_heatmap_params(args):
+    params = (
+        ("source_testament", args.get("source_testament", "All")),
+        ("source_genres", tuple(args.getlist("source_genres"))),
+        ("target_testament", args.get("target_testament", "All")),
+        ("target_genres", tuple(args.getlist("target_genres"))),
+        ("level", args.get("level", "Book")),
+        ("values", args.get("values", "# of References")),
+        ("log_scale", args.get("log_scale") == "1"),
+    )
+    settings = dict(params)
+    valid = (
+        all(settings[t] in ["All"] + list(TESTAMENTS) for t in ("source_testament", "target_testament"))
+        and all(g in BOOK_GENRES for g in settings["source_genres"] + settings["target_genres"])
+        and settings["level"] in HEATMAP_LEVELS
+        and settings["values"] in HEATMAP_NORMALIZATIONS
+    )
+    return params if valid else None
+
+def cr_chord_controls():
+    return html.Div([
+        html.Label("Min. References"),
+        dcc.Slider(id="cr-cd-min-links", min=1, max=500, step=1, value=CHORD_MIN_LINKS, marks=None, tooltip={"placement": "bottom"}),
+        html.Label("Top Chords"),
+        dcc.Dropdown(
+            id="cr-cd-top-k",
+            options=[{"label": str(k), "value": k} for k in ["All", 100, 250, 500, 1000]],
+            value="All",
+            clearable=False
+        ),
+        dcc.Checklist(id="cr-cd-gl", options=[{"label": "WebGL", "value": "gl"}], value=[]),
+        dcc.Graph(id="cr-cd-graph", config={'responsive': True})
+    ])
+
+def cr_sankey_controls():
+    return html.Div([
+        html.Label("Source"),
+        dcc.RadioItems(
+            id="cr-sd-source",
+            options=[{"label": t, "value": t} for t in TESTAMENTS],
+            value="Old Testament",
+            inline=True
+        ),
+        html.Label("Books (Source)"),
+        dcc.Dropdown(id="cr-sd-source-books", value=[], multi=True),
+        html.Label("Books (Target)"),
+        dcc.Dropdown(id="cr-sd-target-books", value=[], multi=True),
+        html.Label("Min. References"),
+        dcc.Slider(id="cr-sd-min-links", min=1, max=500, step=1, value=1, marks=None, tooltip={"placement": "bottom"}),
+        dcc.Graph(id="cr-sd-graph", config={'responsive': True})
+    ])
+
+def cr_network_controls():
+    return html.Div([
+        html.Label("Min. References"),
+        dcc.Slider(id="cr-ng-min-links", min=1, max=1000, step=1, value=1, marks=None, tooltip={"placement": "bottom"}),
+        dcc.Checklist(id="cr-ng-gl", options=[{"label": "WebGL", "value": "gl"}], value=["gl"]),
+        dcc.Graph(id="cr-ng-graph", config={'responsive': True})
+    ])
+
 # ----------------------
 # Main App Layout
 # ----------------------
@@ -691,6 +996,51 @@ def bib_cr_page():
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 server = app.server
 
+# Optional background import of the page-scoped libraries (KJV_WARMUP=1)
+warm_up()
+
+# Figures built on the fly: (data they are built from, figure function, query parameters parser)
+LIVE_FIGURES = {
+    "verses_book": ([KJV_STATS_BOOK_CSV], verses_book_figure, lambda args: ()),
+    "chapters_book": ([KJV_STATS_BOOK_CSV], chapters_book_figure, lambda args: ()),
+    "verses_chapter": ([KJV_STATS_CHAPTER_CSV], verses_chapter_figure, lambda args: ()),
+    "cr_heatmap": ([KJV_CR_MATRIX_DIR], cr_heatmap_figure, cr_heatmap_params),
+}
+
+# Stored and live figures as pre-compressed wire bytes, revalidated by ETag.
+# A live figure's ETag comes from its parameters and the version of its data,
+# so a revalidation is answered without building the figure.
+@server.route("/figures/<name>.json")
+def serve_figure(name):
+    if name in MODEL_FIGURES:
+        body = load_figure_body(name)
+        etag = body.etag
+    elif name in LIVE_FIGURES:
+        paths, _, parse_params = LIVE_FIGURES[name]
+        params = parse_params(request.args)
+        if params is None:
+            abort(400)
+        body = None
+        etag = version_etag(f"{name}?{params!r}", data_version(*paths))
+    else:
+        abort(404)
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        if body is None:
+            body = load_live_figure_body(name, params, etag)
+        if body.br is not None and "br" in request.accept_encodings:
+            response = Response(body.br, mimetype="application/json", headers={"Content-Encoding": "br"})
+        elif "gzip" in request.accept_encodings:
+            response = Response(body.gzip, mimetype="application/json", headers={"Content-Encoding": "gzip"})
+        else:
+            response = Response(body.identity, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "public, no-cache"
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
 app.layout = html.Div([
     dcc.Location(id="url"),
     html.Div([
@@ -705,6 +1055,7 @@ app.layout = html.Div([
                 {"label": "Lexical Richness / Book", "value": "Lexical Richness / Book"},
                 {"label": "Sentiment / Book", "value": "Sentiment / Book"},
                 {"label": "Word Cloud", "value": "Word Cloud"},
+                {"label": "Search", "value": "Search"},
                 {"label": "Bible Sites", "value": "Bible Sites"},
                 {"label": "Bible Events", "value": "Bible Events"},
                 {"label": "Bible Cross-References", "value": "Bible Cross-References"}
@@ -737,6 +1088,8 @@ def display_page(page):
         return snt_book_page()
     elif page == "Word Cloud":
         return word_cloud_page()
+    elif page == "Search":
+        return verse_search_page()
     elif page == "Bible Sites":
         return bib_sites_page()
     elif page == "Bible Events":
@@ -752,82 +1105,159 @@ def display_page(page):
     Input("wc-generate", "n_clicks"),
     State("wc-book", "value"),
     State("wc-pos", "value"),
+    State("wc-mask", "value"),
     State("wc-bg", "value")
 )
-def update_word_cloud(n_clicks, book_name, pos_label, bg):
+def update_word_cloud(n_clicks, book_name, pos_label, mask, bg):
     if n_clicks > 0:
-        df = load_kjv_clean().copy()
         pos_map = load_pos_map()
         pos_tag = pos_map.get(pos_label, None)
-        img = generate_word_cloud(book_name, df, pos_tag=pos_tag, bg=bg)
-        if img is None:
+        png = load_word_cloud_cache().get(book_name, pos_tag, mask=None if mask == "Auto" else mask, bg=bg)
+        if png is None:
             return html.Div("No image generated.")
-        buffer = io.BytesIO()
-        img.save(buffer, format="PNG")
-        img_str = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        img_str = base64.b64encode(png).decode("utf-8")
         src = "data:image/png;base64," + img_str
         return html.Img(src=src, style={'width': '100%'})
     return no_update
 
-# Callback for Bible Sites map generation
+# Callback for Verse Search
 @app.callback(
-    Output("bs-map", "children"),
-    Input("bs-books", "value"),
-    Input("bs-countries", "value")
+    Output("vs-output", "children"),
+    Input("vs-search", "n_clicks"),
+    Input("vs-query", "value"),
+    State("vs-testament", "value"),
+    State("vs-books", "value"),
+    State("vs-limit", "value")
 )
-def update_bible_sites(selected_books, selected_countries):
-    df = load_kjv_locs_all().copy()
-    df['country'] = df['country'].replace('-', 'State of Palestine')
-    filtered_df = df[(df['book_name'].isin(selected_books)) & (df['country'].isin(selected_countries))].copy()
-    if filtered_df.empty:
-        return html.Div("No data available.")
-    filtered_df["count"] = filtered_df.groupby(["latitude", "longitude"])["latitude"].transform("count")
-    min_count, max_count = filtered_df["count"].min(), filtered_df["count"].max()
-    filtered_df["color_intensity"] = np.interp(filtered_df["count"], [min_count, max_count], [50, 255])
-    layer = pdk.Layer(
-        "ScatterplotLayer",
-        data=filtered_df,
-        get_position=["longitude", "latitude"],
-        get_fill_color="[255, 0, 0, color_intensity]",
-        get_radius=500,
-        pickable=True,
+def update_verse_search(n_clicks, query, testament, books, limit):
+    if not query:
+        return no_update
+    df = load_kjv_clean()
+    hits, total = search(load_search_index(), query, books=books, testament=testament, limit=int(limit or 50))
+    results = hits.assign(verse_text=df["verse_text"].iloc[hits["row"]].to_numpy())
+    results = results[["book_name", "chapter_number", "verse_number", "verse_text", "score"]].rename(
+        columns={"book_name": "Book", "chapter_number": "Chapter", "verse_number": "Verse", "verse_text": "Text", "score": "Score"}
+    ).round({"Score": 3})
+    table = dash_table.DataTable(
+        data=results.to_dict("records"),
+        columns=[{"name": c, "id": c} for c in results.columns],
+        style_cell={'textAlign': 'left', 'whiteSpace': 'normal'},
+        page_size=20
     )
-    mid_lat = filtered_df["latitude"].mean()
-    mid_long = filtered_df["longitude"].mean()
-    view_state = pdk.ViewState(
-        longitude=mid_long,
-        latitude=mid_lat,
-        zoom=5,
-        pitch=0,
-    )
-    tooltip = {
-        "html": (
-            "<b>Verse:</b> {book_name} {chapter_number}:{verse_number}<br/>"
-            "<b>Scripture:</b> \"{verse_text}\"<br/>"
-            "<b>Version:</b> KJV (King James Version)<br/>"
-            "<b>Ancient Place:</b> {name_id_ancient}<br/>"
-            "<b>Modern Place:</b> {name_id_modern}<br/>"
-            "<b>----------</b><br/>"
-            "<b>District / County:</b> {administrative_area_level_2}<br/>"
-            "<b>State / Province:</b> {administrative_area_level_1}<br/>"
-            "<b>Country:</b> {country}<br/>"
-            "<b>----------</b><br/>"
-            "<b>Google Maps:</b> <a href='https://www.google.com/maps/place/{latitude},{longitude}' target='_blank'>{name_id_modern}</a> <br/>"
-            "<b>Bible.com:</b> <a href='https://www.bible.com/bible/1/{kjv_books_abv[book_name]}.{chapter_number}.{verse_number}' target='_blank'>{book_name} {chapter_number}:{verse_number}</a>"
-        ),
-        "style": {
-            "backgroundColor": "steelblue",
-            "color": "white"
+    return html.Div([html.P(f"{total} matching verses"), table])
+
+# Callback for Lexical Richness chart
+@app.callback(
+    Output("lr-output", "children"),
+    Input("lr-level", "value"),
+    Input("lr-metric", "value"),
+    Input("lr-window", "value")
+)
+def update_lex_rich(level, metric, window):
+    if not level or not metric or not window:
+        return no_update
+    fig = lex_rich_figure(level, metric, int(window))
+    caption = html.P(metric_caption(load_lex_rich_metric_map()[metric], level, int(window)))
+    return html.Div([caption, dcc.Graph(figure=fig, config={'responsive': True})])
+
+# Clientside callback reading where a drag left the map: the point under the pointer and the map size
+app.clientside_callback(
+    """
+    function(info) {
+        if (!info || !info.coordinate) {
+            return window.dash_clientside.no_update;
         }
+        var canvas = document.getElementById("bs-deck");
+        return {
+            longitude: info.coordinate[0], latitude: info.coordinate[1], x: info.x, y: info.y,
+            width: canvas ? canvas.clientWidth : null, height: canvas ? canvas.clientHeight : null
+        };
     }
-    deck = pdk.Deck(
-        layers=[layer],
-        map_provider="carto",
-        initial_view_state=view_state,
-        tooltip=tooltip,
+    """,
+    Output("bs-drag", "data"),
+    Input("bs-deck", "dragEndInfo")
+)
+
+# Callback for Bible Sites map update
+@app.callback(
+    Output("bs-deck", "data"),
+    Output("bs-status", "children"),
+    Output("bs-view", "data"),
+    Input("bs-books", "value"),
+    Input("bs-countries", "value"),
+    Input("bs-center", "value"),
+    Input("bs-zoom", "value"),
+    Input("bs-drag", "data"),
+    State("bs-view", "data"),
+    prevent_initial_call=True
+)
+def update_bible_sites(selected_books, selected_countries, center, zoom, drag, view):
+    index = load_site_index()
+    spec = Patch()
+    if dash.ctx.triggered_id == "bs-drag":
+        # The deck has already moved; only its data follows
+        view = view_at_point(view, drag["longitude"], drag["latitude"], drag["x"], drag["y"], drag["width"], drag["height"])
+    elif dash.ctx.triggered_id == "bs-center":
+        center_view = initial_view(
+            index, selected_books, selected_countries,
+            center=None if center is None or center < 0 else center, zoom=zoom, width=view["width"], height=view["height"],
+        )
+        view = center_view or view
+        spec["initialViewState"] = bible_sites_view_state(view)
+    elif dash.ctx.triggered_id == "bs-zoom":
+        view = {**view, "zoom": float(zoom)}
+        spec["initialViewState"] = bible_sites_view_state(view)
+
+    sites = viewport_layer_data(index, selected_books, selected_countries, view)
+    spec["layers"][0]["data"] = sites.to_dict("records")
+    return spec, None if len(sites) else "No data available.", view
+
+# Callback for Bible Sites verse list
+@app.callback(
+    Output("bs-verses", "children"),
+    Input("bs-deck", "clickInfo"),
+    State("bs-books", "value"),
+    prevent_initial_call=True
+)
+def show_bible_site_verses(click_info, selected_books):
+    site = (click_info or {}).get("object")
+    if not site:
+        return no_update
+    if site["site_id"] < 0:
+        return html.P("This point groups several nearby sites. Zoom in to pick a single site.")
+    kjv_books_abv = load_kjv_books_abv()
+    mentions = site_mentions(load_kjv_locs_all(), load_site_index(), site["site_id"], selected_books)
+    mentions = mentions.assign(
+        bible_com=[
+            f"[Open](https://www.bible.com/bible/1/{kjv_books_abv[b]}.{c}.{v})"
+            for b, c, v in zip(mentions["book_name"], mentions["chapter_number"], mentions["verse_number"])
+        ]
+    ).rename(columns={
+        "book_name": "Book", "chapter_number": "Chapter", "verse_number": "Verse",
+        "verse_text": "Scripture", "name_id_ancient": "Ancient Place", "bible_com": "Bible.com"
+    })
+    table = dash_table.DataTable(
+        data=mentions.to_dict("records"),
+        columns=[{"name": c, "id": c, "presentation": "markdown"} if c == "Bible.com" else {"name": c, "id": c} for c in mentions.columns],
+        style_cell={'textAlign': 'left', 'whiteSpace': 'normal'},
+        page_size=20
+    )
+    return html.Div([html.H4(f"{site['name_id_modern']} ({site['name_id_ancient']})"), table])
+
+# Clientside callbacks fetching the stored and live figures from /figures
+for graph in ["timeline-bc", "timeline-ad", "verses-book", "chapters-book", "verses-chapter", "cr-hm-graph"]:
+    app.clientside_callback(
+        """
+        function(src) {
+            if (!src) {
+                return window.dash_clientside.no_update;
+            }
+            return fetch(src).then(function(response) { return response.json(); });
+        }
+        """,
+        Output(graph, "figure"),
+        Input(f"{graph}-src", "data")
     )
-    deck_html = deck.to_html(as_string=True)
-    return html.Iframe(srcDoc=deck_html, style={"width": "100%", "height": "1000px", "border": "none"})
 
 # Callback for Bible Cross-References chart selection
 @app.callback(
@@ -835,27 +1265,139 @@ def update_bible_sites(selected_books, selected_countries):
     Input("cr-chart", "value")
 )
 def update_bib_cr(chart):
-    if chart == "Heatmap":
-        fig = load_fig_cr_hm()
-        fig.update_layout(width=1200, height=1200, font=dict(size=12))
-        return dcc.Graph(figure=fig, config={'responsive': True})
+    if chart == "Live References":
+        return cr_references_controls()
+    elif chart == "Heatmap":
+        return cr_heatmap_controls()
     elif chart == "Chord Diagram":
-        fig = load_fig_cr_cd()
-        fig.update_layout(width=1200, height=1200)
-        return dcc.Graph(figure=fig, config={'responsive': True})
+        return cr_chord_controls()
     elif chart == "Sankey Diagram":
-        fig = load_fig_cr_sd()
-        fig.update_layout(width=1200, height=1500)
-        return dcc.Graph(figure=fig, config={'responsive': True})
-    elif chart == "Network Graph (Plotly)":
-        fig = load_fig_cr_ng()
-        fig.update_layout(width=1200, height=1200)
-        return dcc.Graph(figure=fig, config={'responsive': True})
-    elif chart == "Network Graph (Pyvis)":
-        html_str = load_fig_cr_pv()
-        return html.Iframe(srcDoc=html_str, style={"width": "100%", "height": "1100px", "border": "none", "overflow": "auto"})
+        return cr_sankey_controls()
+    elif chart == "Network Graph":
+        return cr_network_controls()
     else:
         return html.Div("Chart type not recognized.")
 
+# Callback for the cross-reference heatmap, served from /figures
+@app.callback(
+    Output("cr-hm-graph-src", "data"),
+    Input("cr-hm-source-testament", "value"),
+    Input("cr-hm-source-genres", "value"),
+    Input("cr-hm-target-testament", "value"),
+    Input("cr-hm-target-genres", "value"),
+    Input("cr-hm-level", "value"),
+    Input("cr-hm-values", "value"),
+    Input("cr-hm-log", "value")
+)
+def update_cr_heatmap(source_testament, source_genres, target_testament, target_genres, level, values, log_scale):
+    query = urlencode({
+        "source_testament": source_testament,
+        "source_genres": source_genres or [],
+        "target_testament": target_testament,
+        "target_genres": target_genres or [],
+        "level": level,
+        "values": values,
+        "log_scale": int("log" in log_scale),
+    }, doseq=True)
+    return f"/figures/cr_heatmap.json?{query}"
+
+# Callback for the cross-reference chord diagram
+@app.callback(
+    Output("cr-cd-graph", "figure"),
+    Input("cr-cd-min-links", "value"),
+    Input("cr-cd-top-k", "value"),
+    Input("cr-cd-gl", "value")
+)
+def update_cr_chord(min_links, top_k, gl):
+    fig = chord_figure(
+        load_cr_matrices(),
+        top_k=None if top_k == "All" else top_k,
+        min_links=min_links,
+        gl="gl" in gl
+    )
+    fig.update_layout(width=1200, height=1200)
+    return fig
+
+# Callbacks for the cross-reference Sankey diagram
+@app.callback(
+    Output("cr-sd-source-books", "options"),
+    Output("cr-sd-source-books", "value"),
+    Output("cr-sd-target-books", "options"),
+    Output("cr-sd-target-books", "value"),
+    Input("cr-sd-source", "value")
+)
+def update_cr_sankey_books(source):
+    target = [t for t in TESTAMENTS if t != source][0]
+    return [{"label": b, "value": b} for b in TESTAMENTS[source]], [], [{"label": b, "value": b} for b in TESTAMENTS[target]], []
+
+@app.callback(
+    Output("cr-sd-graph", "figure"),
+    Input("cr-sd-source", "value"),
+    Input("cr-sd-source-books", "value"),
+    Input("cr-sd-target-books", "value"),
+    Input("cr-sd-min-links", "value")
+)
+def update_cr_sankey(source, source_books, target_books, min_links):
+    fig = sankey_figure(
+        load_cr_matrices(),
+        source=source,
+        min_links=min_links,
+        source_books=source_books,
+        target_books=target_books
+    )
+    fig.update_layout(width=1200, height=1500)
+    return fig
+
+# Callback for the cross-reference network graph
+@app.callback(
+    Output("cr-ng-graph", "figure"),
+    Input("cr-ng-min-links", "value"),
+    Input("cr-ng-gl", "value")
+)
+def update_cr_network(min_links, gl):
+    fig = network_figure(load_cr_matrices(), min_links=min_links, gl="gl" in gl)
+    fig.update_layout(width=1200, height=1200)
+    return fig
+
+# Callbacks for the live cross-reference query
+@app.callback(
+    Output("cr-chapter", "options"),
+    Output("cr-chapter", "value"),
+    Input("cr-book", "value")
+)
+def update_cr_chapters(book_name):
+    ranges = load_kjv_ranges()
+    chapters = ranges.chapter_number[ranges.chapter_book == load_kjv_books().index(book_name)]
+    options = [{"label": str(c), "value": int(c)} for c in chapters]
+    return options, int(chapters[min(52, len(chapters) - 1)]) if len(chapters) else None
+
+@app.callback(
+    Output("cr-verse", "options"),
+    Output("cr-verse", "value"),
+    Input("cr-book", "value"),
+    Input("cr-chapter", "value")
+)
+def update_cr_verses(book_name, chapter_number):
+    if chapter_number is None:
+        return [], None
+    start, end = chapter_range(load_kjv_ranges(), book_name, chapter_number)
+    verses = load_kjv_clean()["verse_number"].iloc[start:end]
+    return [{"label": "All", "value": "All"}] + [{"label": str(v), "value": int(v)} for v in verses], "All"
+
+@app.callback(
+    Output("cr-live-output", "children"),
+    Input("cr-book", "value"),
+    Input("cr-chapter", "value"),
+    Input("cr-verse", "value"),
+    Input("cr-direction", "value"),
+    Input("cr-min-votes", "value"),
+    Input("cr-hops", "value"),
+    Input("cr-top-k", "value")
+)
+def update_cr_references(book_name, chapter_number, verse_number, direction, min_votes, hops, top_k):
+    if chapter_number is None or verse_number is None:
+        return no_update
+    return cr_references_view(book_name, chapter_number, verse_number, direction, min_votes, hops, top_k)
+
 if __name__ == "__main__":
     app.run_server(debug=True)
\ No newline at end of file
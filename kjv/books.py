@@ -0,0 +1,37 @@
+OLD_TESTAMENT = [
+    "Genesis", "Exodus", "Leviticus", "Numbers", "Deuteronomy",
+    "Joshua", "Judges", "Ruth", "1 Samuel", "2 Samuel",
+    "1 Kings", "2 Kings", "1 Chronicles", "2 Chronicles", "Ezra",
+    "Nehemiah", "Esther", "Job", "Psalms", "Proverbs",
+    "Ecclesiastes", "Song of Solomon", "Isaiah", "Jeremiah", "Lamentations",
+    "Ezekiel", "Daniel", "Hosea", "Joel", "Amos",
+    "Obadiah", "Jonah", "Micah", "Nahum", "Habakkuk",
+    "Zephaniah", "Haggai", "Zechariah", "Malachi"
+]
+
+NEW_TESTAMENT = [
+    "Matthew", "Mark", "Luke", "John", "Acts",
+    "Romans", "1 Corinthians", "2 Corinthians", "Galatians", "Ephesians",
+    "Philippians", "Colossians", "1 Thessalonians", "2 Thessalonians", "1 Timothy",
+    "2 Timothy", "Titus", "Philemon", "Hebrews", "James",
+    "1 Peter", "2 Peter", "1 John", "2 John", "3 John",
+    "Jude", "Revelation"
+]
+
+KJV_BOOKS = OLD_TESTAMENT + NEW_TESTAMENT
+
+TESTAMENTS = {"Old Testament": OLD_TESTAMENT, "New Testament": NEW_TESTAMENT}
+
+BOOK_GENRES = {
+    "Torah": KJV_BOOKS[0:5],
+    "Former Prophets": KJV_BOOKS[5:16],
+    "Novel": KJV_BOOKS[16:17],
+    "Poetry": KJV_BOOKS[17:22],
+    "Major Prophets": KJV_BOOKS[22:27],
+    "Minor Prophets": KJV_BOOKS[27:39],
+    "Gospels": KJV_BOOKS[39:43],
+    "Acts": KJV_BOOKS[43:44],
+    "Pauline Letters": KJV_BOOKS[44:57],
+    "General Letters": KJV_BOOKS[57:65],
+    "Prophecy": KJV_BOOKS[65:66],
+}
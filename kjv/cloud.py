@@ -0,0 +1,178 @@
+import functools
+import hashlib
+import io
+import os
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+# ----------------------
+# Paths
+# ----------------------
+
+WORDCLOUD_MASK_DIR = os.path.join("assets", "wordcloud")
+WORDCLOUD_CACHE_DIR = os.path.join("data", "kjv_wordclouds")
+
+WORDCLOUD_MASKS = [1, 2, 3, 4, 5, 6, 7]
+
+
+# ----------------------
+# Masks
+# ----------------------
+
+@functools.lru_cache(maxsize=None)
+def load_mask(number, mask_dir=WORDCLOUD_MASK_DIR):
+    """
+    Decoded mask array and its ImageColorGenerator, read once per process.
+    """
+    # PIL and wordcloud (which pulls in matplotlib) are imported on the first render, not on import:
+    # images already in the disk cache are served without them
+    from PIL import Image
+    from wordcloud import ImageColorGenerator
+
+    coloring = np.array(Image.open(os.path.join(mask_dir, f"{number}.png")))
+    coloring.setflags(write=False)
+    return coloring, ImageColorGenerator(coloring)
+
+
+@functools.lru_cache(maxsize=None)
+def mask_digest(number, mask_dir=WORDCLOUD_MASK_DIR):
+    """
+    Content hash of a mask image, read once per process.
+    """
+    with open(os.path.join(mask_dir, f"{number}.png"), "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+
+def frequencies_digest(frequencies):
+    """
+    Content hash of one {word: count} table, independent of its order.
+    """
+    return hashlib.sha1(repr(sorted(frequencies.items())).encode("utf-8")).hexdigest()[:16]
+
+
+def pick_mask(book_name, pos_tag=None):
+    """
+    The "Auto" mask: a stable choice per (book, POS), so the same request always gets the same picture.
+    """
+    seed = zlib.crc32(f"{book_name}|{pos_tag}".encode("utf-8"))
+    return WORDCLOUD_MASKS[seed % len(WORDCLOUD_MASKS)]
+
+
+# ----------------------
+# Rendering
+# ----------------------
+
+def remove_bg(wordcloud_image):
+    """
+    Make the white background transparent: one array comparison builds the alpha channel,
+    other pixels keep their own alpha.
+    """
+    from PIL import Image
+
+    img = wordcloud_image.convert("RGBA")
+    pixels = np.asarray(img)
+    white = (pixels[:, :, :3] == 255).all(axis=-1)
+    img.putalpha(Image.fromarray(np.where(white, 0, pixels[:, :, 3]).astype(np.uint8)))
+    return img
+
+
+def render_word_cloud(frequencies, mask, bg="White"):
+    from wordcloud import WordCloud
+
+    coloring, image_colors = load_mask(mask)
+
+    wordcloud = WordCloud(
+        background_color="white",
+        mask=coloring,
+        repeat=False,
+        random_state=mask,
+    )
+    wordcloud.generate_from_frequencies(frequencies)
+    wordcloud.recolor(color_func=image_colors, random_state=mask)
+
+    img = wordcloud.to_image()
+    if bg == "Transparent":
+        img = remove_bg(img)
+
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+# ----------------------
+# Image Cache
+# ----------------------
+
+class WordCloudCache:
+    """
+    Finished word cloud PNGs keyed by (book, POS, mask, background).
+    Kept in memory up to max_bytes (least recently used first out) and, if cache_dir is set, on disk.
+    On disk the key also holds content hashes of the (book, POS) word counts and of the mask image,
+    so a rebuilt frequency table or a changed mask renders afresh instead of serving old files.
+    """
+
+    def __init__(self, frequencies, max_bytes=64 * 1024 * 1024, cache_dir=None):
+        self.frequencies = frequencies
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self._images = OrderedDict()
+        self._size = 0
+        self._digests = {}
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        book_name, pos_tag, mask, _ = key
+        if (book_name, pos_tag) not in self._digests:
+            self._digests[(book_name, pos_tag)] = frequencies_digest(self.frequencies.get((book_name, pos_tag)) or {})
+        version = (self._digests[(book_name, pos_tag)], mask_digest(mask))
+        name = hashlib.sha1(repr(key + version).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.png")
+
+    def _remember(self, key, png):
+        with self._lock:
+            if key in self._images:
+                return
+            self._images[key] = png
+            self._size += len(png)
+            while self._size > self.max_bytes and len(self._images) > 1:
+                _, evicted = self._images.popitem(last=False)
+                self._size -= len(evicted)
+
+    def get(self, book_name, pos_tag=None, mask=None, bg="White"):
+        """
+        PNG bytes of the word cloud, or None if the book has no words for pos_tag.
+        mask=None picks the "Auto" mask for (book, POS).
+        """
+        if mask is None:
+            mask = pick_mask(book_name, pos_tag)
+        key = (book_name, pos_tag, mask, bg)
+
+        with self._lock:
+            png = self._images.get(key)
+            if png is not None:
+                self._images.move_to_end(key)
+                return png
+
+        disk_path = self._disk_path(key) if self.cache_dir else None
+        if disk_path and os.path.exists(disk_path):
+            with open(disk_path, "rb") as f:
+                png = f.read()
+        else:
+            frequencies = self.frequencies.get((book_name, pos_tag))
+            if not frequencies:
+                return None
+            png = render_word_cloud(frequencies, mask, bg=bg)
+            if disk_path:
+                tmp_path = disk_path + f".{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(png)
+                os.replace(tmp_path, disk_path)
+
+        self._remember(key, png)
+        return png
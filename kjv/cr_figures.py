@@ -0,0 +1,484 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from kjv.books import BOOK_GENRES, KJV_BOOKS, OLD_TESTAMENT, TESTAMENTS
+from kjv.cr_graph import verse_labels
+
+
+HEATMAP_LEVELS = {"Book": "book", "Chapter": "chapter"}
+HEATMAP_NORMALIZATIONS = {"# of References": None, "% of Source": "source", "% of Target": "target"}
+
+
+# ----------------------
+# Book Selection
+# ----------------------
+
+def select_books(testament="All", genres=None):
+    """
+    Codes (indices into KJV_BOOKS) of the books in testament and in any of genres, in canonical order.
+    "All" and an empty genre list do not filter.
+    """
+    keep = np.ones(len(KJV_BOOKS), dtype=bool)
+    if testament in TESTAMENTS:
+        keep &= np.isin(KJV_BOOKS, TESTAMENTS[testament])
+    if genres:
+        keep &= np.isin(KJV_BOOKS, [book for genre in genres for book in BOOK_GENRES[genre]])
+    return np.flatnonzero(keep)
+
+
+# ----------------------
+# Heatmap
+# ----------------------
+
+def _chapter_positions(chapter_book, books):
+    chapters = np.flatnonzero(np.isin(chapter_book, books))
+    positions = np.full(len(chapter_book), -1, dtype=np.int64)
+    positions[chapters] = np.arange(len(chapters))
+    return chapters, positions
+
+
+def heatmap_counts(matrices, sources, targets, level="book"):
+    """
+    (counts, source labels, target labels) where counts[i, j] = links from source i to target j,
+    sliced from the kjv.cr_matrix artifacts. At the chapter level only the chapters of the
+    selected books that take part in a link are kept, scattered from the COO counts.
+    """
+    if level == "book":
+        counts = np.asarray(matrices.book_matrix)[np.ix_(sources, targets)]
+        return counts, [KJV_BOOKS[b] for b in sources], [KJV_BOOKS[b] for b in targets]
+
+    chapter_book = np.asarray(matrices.chapter_book)
+    chapter_number = np.asarray(matrices.chapter_number)
+    source_chapters, source_positions = _chapter_positions(chapter_book, sources)
+    target_chapters, target_positions = _chapter_positions(chapter_book, targets)
+
+    rows = source_positions[np.asarray(matrices.chapter_sources)]
+    cols = target_positions[np.asarray(matrices.chapter_targets)]
+    known = (rows >= 0) & (cols >= 0)
+    n_rows, n_cols = len(source_chapters), len(target_chapters)
+    counts = np.bincount(
+        rows[known] * n_cols + cols[known],
+        weights=np.asarray(matrices.chapter_counts)[known],
+        minlength=n_rows * n_cols,
+    ).astype(np.int64).reshape(n_rows, n_cols)
+
+    def labels(chapters):
+        return [f"{KJV_BOOKS[b]} {c}" for b, c in zip(chapter_book[chapters], chapter_number[chapters])]
+    return counts, labels(source_chapters), labels(target_chapters)
+
+
+def normalize_heatmap_counts(counts, normalize=None):
+    """
+    counts as is, or as a percentage of each source's ("source") or each target's ("target") links in view.
+    """
+    if normalize is None:
+        return counts
+    axis = 1 if normalize == "source" else 0
+    totals = counts.sum(axis=axis, keepdims=True)
+    return np.divide(counts * 100.0, totals, out=np.zeros(counts.shape), where=totals > 0)
+
+
+def heatmap_figure(matrices, sources=None, targets=None, level="book", normalize=None, log_scale=False):
+    """
+    Source x target heatmap of the cross-references, sources on the x axis as in training/kjv_cr.ipynb.
+    sources / targets are book codes (e.g. from select_books), all books by default.
+    log_scale colors by log10 of the values and leaves empty cells blank.
+    """
+    sources = np.arange(len(KJV_BOOKS)) if sources is None else np.asarray(sources)
+    targets = np.arange(len(KJV_BOOKS)) if targets is None else np.asarray(targets)
+    counts, source_labels, target_labels = heatmap_counts(matrices, sources, targets, level=level)
+    values = normalize_heatmap_counts(counts, normalize).T
+
+    if normalize is None:
+        value_label, value_format = "# of References", "%{customdata}"
+    else:
+        value_label, value_format = f"% of {normalize.title()} References", "%{customdata:.2f}%"
+    unit = "Book" if level == "book" else "Chapter"
+
+    colorbar = dict(title=value_label)
+    if log_scale:
+        z = np.log10(np.where(values > 0, values, np.nan))
+        if np.isfinite(z).any():
+            decades = np.arange(np.floor(np.nanmin(z)), np.ceil(np.nanmax(z)) + 1)
+            colorbar.update(tickvals=decades, ticktext=[f"{10 ** d:g}" for d in decades])
+        zmin = zmax = None
+    else:
+        z = values
+        zmin = 0
+        zmax = min(500, values.max()) if normalize is None and values.size else None
+
+    heatmap = go.Heatmap(
+        z=z,
+        x=source_labels,
+        y=target_labels,
+        customdata=values,
+        colorscale="Reds",
+        colorbar=colorbar,
+        hoverongaps=False,
+        zmin=zmin,
+        zmax=zmax,
+        hovertemplate=f"{unit} (Source): %{{x}}<br>{unit} (Target): %{{y}}<br>{value_label}: {value_format}<extra></extra>"
+    )
+    layout = go.Layout(
+        xaxis=dict(title=f"{unit} (Source)", tickangle=45),
+        yaxis=dict(title=f"{unit} (Target)"),
+        width=1250,
+        height=1250,
+    )
+    return go.Figure(data=[heatmap], layout=layout)
+
+
+# ----------------------
+# Chord Diagram
+# ----------------------
+
+# seaborn's "pastel" palette, cycled over the books as in training/kjv_cr.ipynb
+PASTEL = ["#a1c9f4", "#ffb482", "#8de5a1", "#ff9f9b", "#d0bbff", "#debb9b", "#fab0e4", "#cfcfcf", "#fffea3", "#b9f2f0"]
+
+CHORD_WIDTHS = (0.5, 1, 2, 4, 8)
+
+# Chords under 50 links all draw at the narrowest width (links / 100 < 0.5), as thin hairlines;
+# leaving them out by default cuts the figure about 18x on the OpenBible.info matrix
+CHORD_MIN_LINKS = 50
+
+
+def chord_links(books, top_k=None, min_links=1):
+    """
+    (sources, targets, links) of the non-zero cells of a book matrix with at least min_links links,
+    optionally only the top_k heaviest, heaviest first.
+    """
+    books = np.asarray(books)
+    sources, targets = np.nonzero(books >= max(min_links, 1))
+    links = books[sources, targets]
+    order = np.argsort(-links, kind="stable")[:top_k]
+    return sources[order], targets[order], links[order]
+
+
+def chord_paths(start, end, points=12):
+    """
+    Quadratic Bézier curves from start to end through the origin, one row per chord,
+    with a NaN column appended so the rows can be flattened into one gapped line (float32, which is
+    plenty for screen coordinates and halves the payload).
+    """
+    t = np.linspace(0, 1, points)
+    curves = (1 - t)[None, :] ** 2 * start[:, None] + t[None, :] ** 2 * end[:, None]
+    return np.hstack([curves, np.full((len(curves), 1), np.nan)]).astype(np.float32).ravel()
+
+
+def chord_figure(matrices, top_k=None, min_links=CHORD_MIN_LINKS, points=12, gl=False):
+    """
+    Chord diagram of the book x book links. All chords of one (color, width) bucket share a
+    single trace, so the figure carries at most len(PASTEL) * len(CHORD_WIDTHS) line traces
+    instead of one trace per chord. Chords are colored by source book and their width,
+    links / 100 as in training/kjv_cr.ipynb, is rounded down to one of CHORD_WIDTHS.
+    Only chords with at least min_links links are drawn (pass 1 for all of them).
+    gl draws the chords with WebGL (Scattergl).
+    """
+    books = np.asarray(matrices.book_matrix)
+    n_books = len(KJV_BOOKS)
+    angles = np.linspace(0, 2 * np.pi, n_books, endpoint=False)
+    node_x, node_y = np.cos(angles), np.sin(angles)
+
+    sources, targets, links = chord_links(books, top_k=top_k, min_links=min_links)
+    colors = sources % len(PASTEL)
+    widths = np.searchsorted(CHORD_WIDTHS, np.maximum(links / 100, CHORD_WIDTHS[0]), side="right") - 1
+
+    scatter = go.Scattergl if gl else go.Scatter
+    traces = []
+    for bucket in np.unique(colors * len(CHORD_WIDTHS) + widths):
+        chords = (colors * len(CHORD_WIDTHS) + widths) == bucket
+        traces.append(scatter(
+            x=chord_paths(node_x[sources[chords]], node_x[targets[chords]], points),
+            y=chord_paths(node_y[sources[chords]], node_y[targets[chords]], points),
+            mode="lines",
+            line=dict(color=PASTEL[bucket // len(CHORD_WIDTHS)], width=CHORD_WIDTHS[bucket % len(CHORD_WIDTHS)]),
+            hoverinfo="none"
+        ))
+
+    outgoing, incoming = books.sum(axis=1), books.sum(axis=0)
+    nodes = go.Scatter(
+        x=node_x,
+        y=node_y,
+        mode="markers+text",
+        text=KJV_BOOKS,
+        textfont=dict(size=10, color="white"),
+        textposition="top center",
+        hovertext=[
+            f"{book}<br>Incoming References: {incoming[b]} | Outgoing References: {outgoing[b]}"
+            for b, book in enumerate(KJV_BOOKS)
+        ],
+        marker=dict(size=10, color="white"),
+        hoverinfo="text"
+    )
+
+    layout = go.Layout(
+        showlegend=False,
+        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        width=1250,
+        height=1250,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return go.Figure(data=traces + [nodes], layout=layout)
+
+
+# ----------------------
+# Sankey Diagram
+# ----------------------
+
+def sankey_links(books, source="Old Testament", min_links=1, source_books=None, target_books=None):
+    """
+    (sources, targets, links) of the links from one testament into the other with at least
+    min_links links, optionally only from source_books / into target_books (book names).
+    """
+    codes = np.arange(len(KJV_BOOKS))
+    old = codes < len(OLD_TESTAMENT)
+    source_codes, target_codes = (codes[old], codes[~old]) if source == "Old Testament" else (codes[~old], codes[old])
+    if source_books:
+        source_codes = source_codes[np.isin(np.asarray(KJV_BOOKS)[source_codes], source_books)]
+    if target_books:
+        target_codes = target_codes[np.isin(np.asarray(KJV_BOOKS)[target_codes], target_books)]
+
+    block = np.asarray(books)[np.ix_(source_codes, target_codes)]
+    sources, targets = np.nonzero(block >= max(min_links, 1))
+    return source_codes[sources], target_codes[targets], block[sources, targets]
+
+
+def _stack_positions(totals, fill=0.8):
+    """
+    Node centers stacked from the top in [0, 1], heights proportional to totals, the rest spread as gaps.
+    """
+    heights = totals / max(totals.sum(), 1) * fill
+    slots = heights + (1 - fill) / len(totals)
+    return np.clip(np.cumsum(slots) - slots / 2, 0.001, 0.999)
+
+
+def sankey_figure(matrices, source="Old Testament", min_links=1, source_books=None, target_books=None):
+    """
+    Sankey diagram of the links from one testament into the other (the notebook's
+    dict_cr_unidirectional_*_ord), with only the links that pass min_links and the book filters,
+    and only the books they touch. Books keep their canonical order down each side.
+    """
+    sources, targets, links = sankey_links(
+        matrices.book_matrix, source=source, min_links=min_links, source_books=source_books, target_books=target_books
+    )
+    source_nodes, target_nodes = np.unique(sources), np.unique(targets)
+    nodes = np.concatenate([source_nodes, target_nodes])
+    link_sources = np.searchsorted(source_nodes, sources)
+    link_targets = len(source_nodes) + np.searchsorted(target_nodes, targets)
+
+    node_links = np.bincount(link_sources, weights=links, minlength=len(nodes)) + np.bincount(link_targets, weights=links, minlength=len(nodes))
+    node_edges = np.bincount(link_sources, minlength=len(nodes)) + np.bincount(link_targets, minlength=len(nodes))
+    target_testament = "New Testament" if source == "Old Testament" else "Old Testament"
+    node_customdata = (
+        [f"Outgoing References: {int(node_links[i])}<br>Outgoing Edges (# of {target_testament} Books): {node_edges[i]}"
+         for i in range(len(source_nodes))]
+        + [f"Incoming References: {int(node_links[i])}<br>Incoming Edges (# of {source} Books): {node_edges[i]}"
+           for i in range(len(source_nodes), len(nodes))]
+    )
+    link_customdata = [
+        f"Book (Source): {KJV_BOOKS[s]}<br>Book (Target):{KJV_BOOKS[t]}<br># of References: {n}"
+        for s, t, n in zip(sources, targets, links)
+    ]
+
+    x_positions = [0.001] * len(source_nodes) + [0.999] * len(target_nodes)
+    y_positions = np.concatenate([
+        _stack_positions(node_links[:len(source_nodes)]) if len(source_nodes) else [],
+        _stack_positions(node_links[len(source_nodes):]) if len(target_nodes) else [],
+    ])
+    colors = [PASTEL[b % len(PASTEL)] for b in nodes]
+
+    return go.Figure(
+        data=[go.Sankey(
+            node=dict(
+                pad=15,
+                thickness=20,
+                line=dict(color="black", width=0.5),
+                label=[KJV_BOOKS[b] for b in nodes],
+                x=x_positions,
+                y=list(y_positions),
+                color=colors,
+                customdata=node_customdata,
+                hovertemplate='%{label}<br>%{customdata}<extra></extra>',
+            ),
+            link=dict(
+                source=link_sources,
+                target=link_targets,
+                value=links,
+                color=[colors[i] for i in link_sources],
+                customdata=link_customdata,
+                hovertemplate='%{customdata}<extra></extra>',
+            )
+        )],
+        layout=dict(
+            font_size=12,
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            margin=dict(l=100, r=100, t=50, b=50),
+            height=2000,
+            width=1250,
+        )
+    )
+
+
+# ----------------------
+# Network Graph
+# ----------------------
+
+NETWORK_EDGE_COLORS = {"Old Testament": "#fc896a", "New Testament": "#93c3df", "Cross": "#dbb8ff"}
+NETWORK_WIDTHS = (0.5, 1, 1.5, 2, 2.5)
+
+
+def network_edges(books, min_links=1):
+    """
+    (books a, books b, links) of the undirected book pairs a < b, links summed over both directions,
+    with at least min_links links.
+    """
+    books = np.asarray(books)
+    pairs = np.triu(books + books.T, k=1)
+    a, b = np.nonzero(pairs >= max(min_links, 1))
+    return a, b, pairs[a, b]
+
+
+def network_figure(matrices, min_links=1, gl=True):
+    """
+    Book network on the force-directed layout precomputed in the kjv.cr_matrix artifacts, so the
+    browser only draws it. Edges are colored by testament pair as in training/kjv_cr.ipynb and
+    their width, min(links / 50, 2.5) as in its Pyvis graph, is rounded down to one of NETWORK_WIDTHS;
+    each (color, width) bucket is one trace. gl draws everything with WebGL (Scattergl).
+    """
+    books = np.asarray(matrices.book_matrix)
+    layout_x, layout_y = np.asarray(matrices.book_layout, dtype=float).T
+    old = np.arange(len(KJV_BOOKS)) < len(OLD_TESTAMENT)
+
+    a, b, links = network_edges(books, min_links=min_links)
+    colors = np.where(old[a] & old[b], 0, np.where(~old[a] & ~old[b], 1, 2))
+    widths = np.searchsorted(NETWORK_WIDTHS, np.clip(links / 50, NETWORK_WIDTHS[0], NETWORK_WIDTHS[-1]), side="right") - 1
+    buckets = colors * len(NETWORK_WIDTHS) + widths
+
+    scatter = go.Scattergl if gl else go.Scatter
+    traces = []
+    for bucket in np.unique(buckets):
+        edges = buckets == bucket
+        gaps = np.full(edges.sum(), np.nan)
+        traces.append(scatter(
+            x=np.column_stack([layout_x[a[edges]], layout_x[b[edges]], gaps]).ravel(),
+            y=np.column_stack([layout_y[a[edges]], layout_y[b[edges]], gaps]).ravel(),
+            mode="lines",
+            line=dict(
+                color=list(NETWORK_EDGE_COLORS.values())[bucket // len(NETWORK_WIDTHS)],
+                width=NETWORK_WIDTHS[bucket % len(NETWORK_WIDTHS)]
+            ),
+            hoverinfo="none"
+        ))
+
+    outgoing, incoming = books.sum(axis=1), books.sum(axis=0)
+    connections = outgoing + incoming
+    for testament, colorscale, nodes in [("Old Testament", "Reds", old), ("New Testament", "Blues", ~old)]:
+        codes = np.flatnonzero(nodes)
+        traces.append(scatter(
+            x=layout_x[codes],
+            y=layout_y[codes],
+            mode="markers+text",
+            text=[KJV_BOOKS[c] for c in codes],
+            textposition="top center",
+            hoverinfo="text",
+            hovertext=[
+                f"{KJV_BOOKS[c]} (Incoming References: {incoming[c]} | Outgoing References: {outgoing[c]})"
+                for c in codes
+            ],
+            marker=dict(
+                size=15,
+                color=connections[codes],
+                colorscale=colorscale,
+                showscale=False,
+                cmin=0,
+                cmax=20000,
+                line=dict(width=1, color="black")
+            ),
+            textfont=dict(color="white", size=12),
+            name=testament
+        ))
+
+    layout = go.Layout(
+        showlegend=False,
+        hovermode='closest',
+        margin=dict(b=0, l=0, r=0, t=0),
+        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        width=1000,
+        height=1000,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return go.Figure(data=traces, layout=layout)
+
+
+# ----------------------
+# Verse Neighborhood
+# ----------------------
+
+def _ring(n, radius, order):
+    angles = 2 * np.pi * (np.argsort(np.argsort(order, kind="stable")) + 0.5) / max(n, 1)
+    return radius * np.cos(angles), radius * np.sin(angles), angles
+
+
+def neighborhood_figure(expansion, verses):
+    """
+    k-hop neighborhood (from kjv.cr_graph.expand) as rings around the starting verses, one ring per hop,
+    each verse linked to its parent. Verses on a ring are ordered by the angle of their parent to
+    keep the links short.
+    """
+    roots = np.unique(expansion.loc[expansion["hop"] == 1, "parent_id"].to_numpy())
+    ids = np.concatenate([roots, expansion["verse_id"].to_numpy()])
+    hops = np.concatenate([np.zeros(len(roots), dtype=np.int64), expansion["hop"].to_numpy()])
+    parents = np.concatenate([roots, expansion["parent_id"].to_numpy()])
+
+    x, y, angle = np.zeros(len(ids)), np.zeros(len(ids)), np.zeros(len(ids))
+    position = {}
+    for hop in range(hops.max() + 1 if len(ids) else 0):
+        ring = np.flatnonzero(hops == hop)
+        order = ids[ring] if hop == 0 else np.array([angle[position[p]] for p in parents[ring]])
+        radius = (0.4 if len(ring) > 1 else 0) if hop == 0 else hop
+        x[ring], y[ring], angle[ring] = _ring(len(ring), radius, order)
+        position.update(zip(ids[ring], ring))
+
+    links = np.array([position[p] for p in parents[len(roots):]], dtype=np.int64)
+    children = np.arange(len(roots), len(ids))
+    gaps = np.full(len(links), np.nan)
+    edge_trace = go.Scatter(
+        x=np.column_stack([x[links], x[children], gaps]).ravel(),
+        y=np.column_stack([y[links], y[children], gaps]).ravel(),
+        mode="lines",
+        line=dict(color="#dbb8ff", width=1),
+        hoverinfo="none"
+    )
+
+    reference, verse_text = verse_labels(verses, ids)
+    path_votes = np.concatenate([np.zeros(len(roots), dtype=np.int64), expansion["path_votes"].to_numpy()])
+    node_trace = go.Scatter(
+        x=x,
+        y=y,
+        mode="markers+text",
+        text=reference,
+        textposition="top center",
+        hovertext=[
+            f"{r}<br>Hop: {h}<br>Path Votes: {v}<br>{t[:120]}"
+            for r, h, v, t in zip(reference, hops, path_votes, verse_text)
+        ],
+        hoverinfo="text",
+        marker=dict(size=12, color=hops, colorscale="Reds_r", line=dict(width=1, color="black"))
+    )
+
+    layout = go.Layout(
+        showlegend=False,
+        hovermode='closest',
+        margin=dict(b=0, l=0, r=0, t=0),
+        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False, scaleanchor="x"),
+        height=800,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return go.Figure(data=[edge_trace, node_trace], layout=layout)
@@ -0,0 +1,284 @@
+import os
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from kjv.books import KJV_BOOKS
+from kjv.ranges import chapter_of
+from kjv.refs import parse_refs, verse_keys
+from kjv.store import read_kjv_clean
+
+
+# ----------------------
+# Paths
+# ----------------------
+
+CROSS_REFERENCES_TXT = os.path.join("data", "cross_references.txt")
+KJV_CR_GRAPH_DIR = os.path.join("data", "kjv_cr_graph")
+
+DIRECTIONS = ("out", "in", "both")
+
+
+class CrGraph(NamedTuple):
+    out_offsets: np.ndarray
+    out_targets: np.ndarray
+    out_votes: np.ndarray
+    in_offsets: np.ndarray
+    in_sources: np.ndarray
+    in_votes: np.ndarray
+
+
+# ----------------------
+# Build Function
+# ----------------------
+
+def read_cross_references(path=CROSS_REFERENCES_TXT):
+    """
+    The OpenBible.info cross-reference list: a header line, then one link per line, "From Verse", "To Verse", "Votes".
+    """
+    return pd.read_csv(
+        path, sep="\t", header=0, usecols=[0, 1, 2], names=["from_verse", "to_verse", "votes"],
+        dtype={"from_verse": "string", "to_verse": "string"},
+    ).dropna(subset=["from_verse", "to_verse"])
+
+
+def _expand_links(src_start, src_end, dst_start, dst_end, votes):
+    """
+    One edge per (source verse, target verse) of every link, so "Gen.1.1 -> Prov.8.22-Prov.8.30" becomes nine edges.
+    """
+    n_src, n_dst = src_end - src_start + 1, dst_end - dst_start + 1
+    pairs = n_src * n_dst
+    link = np.repeat(np.arange(len(pairs)), pairs)
+    offset = np.arange(pairs.sum()) - np.repeat(np.cumsum(pairs) - pairs, pairs)
+    return src_start[link] + offset // n_dst[link], dst_start[link] + offset % n_dst[link], votes[link]
+
+
+def _csr(keys, values, votes, n_verses):
+    order = np.lexsort((values, keys))
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(keys, minlength=n_verses))])
+    return offsets.astype(np.int64), values[order].astype(np.int32), votes[order].astype(np.int32)
+
+
+def build_cr_graph(verses=None, path=CROSS_REFERENCES_TXT, out_dir=KJV_CR_GRAPH_DIR):
+    """
+    Parse the cross-reference list into a CSR adjacency over verse IDs (rows of the verse store):
+      - out_targets / out_votes[out_offsets[v]:out_offsets[v + 1]]: verses referenced by verse v
+      - in_sources / in_votes[in_offsets[v]:in_offsets[v + 1]]: verses referencing verse v
+    Verse ranges are expanded to one edge per verse, and a (source, target) pair reached by
+    several links keeps its highest vote. References to verses missing from the store are dropped.
+    """
+    if verses is None:
+        verses = read_kjv_clean()
+    keys = verse_keys(verses)
+    n_verses = len(keys)
+
+    links = read_cross_references(path)
+    src_start, src_end = parse_refs(links["from_verse"], keys)
+    dst_start, dst_end = parse_refs(links["to_verse"], keys)
+    votes = pd.to_numeric(links["votes"], errors="coerce").fillna(0).to_numpy(np.int64)
+
+    valid = (src_start >= 0) & (dst_start >= 0)
+    sources, targets, votes = _expand_links(src_start[valid], src_end[valid], dst_start[valid], dst_end[valid], votes[valid])
+
+    # Deduplicate (source, target), keeping the highest vote
+    order = np.lexsort((-votes, targets, sources))
+    sources, targets, votes = sources[order], targets[order], votes[order]
+    first = np.ones(len(sources), dtype=bool)
+    first[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+    sources, targets, votes = sources[first], targets[first], votes[first]
+
+    out_offsets, out_targets, out_votes = _csr(sources, targets, votes, n_verses)
+    in_offsets, in_sources, in_votes = _csr(targets, sources, votes, n_verses)
+    arrays = {
+        "out_offsets": out_offsets, "out_targets": out_targets, "out_votes": out_votes,
+        "in_offsets": in_offsets, "in_sources": in_sources, "in_votes": in_votes,
+    }
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(out_dir, f"{name}.npy"), array)
+    return out_dir
+
+
+# ----------------------
+# Loading Function
+# ----------------------
+
+def read_cr_graph(path=KJV_CR_GRAPH_DIR):
+    if not all(os.path.exists(os.path.join(path, f"{name}.npy")) for name in CrGraph._fields):
+        build_cr_graph(out_dir=path)
+
+    return CrGraph(**{
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        for name in CrGraph._fields
+    })
+
+
+# ----------------------
+# Neighbors
+# ----------------------
+
+def _gather(offsets, neighbors, votes, verse_ids):
+    """
+    Concatenated adjacency lists of verse_ids, as (verse_id, neighbor_id, votes) arrays.
+    """
+    verse_ids = np.asarray(verse_ids, dtype=np.int64)
+    starts, ends = offsets[verse_ids], offsets[verse_ids + 1]
+    lengths = ends - starts
+    if len(verse_ids) and (np.diff(verse_ids) == 1).all():
+        # A contiguous range of verses (a chapter, a book) owns one contiguous slice of the adjacency
+        rows = np.arange(starts[0], ends[-1])
+    else:
+        rows = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+    return np.repeat(verse_ids, lengths), np.asarray(neighbors[rows], dtype=np.int64), np.asarray(votes[rows], dtype=np.int64)
+
+
+def neighbors(graph, verse_ids, direction="out", min_votes=None):
+    """
+    Cross-references of verse_ids as a DataFrame with verse_id, neighbor_id, votes and direction
+    ("out": verse_id references neighbor_id, "in": neighbor_id references verse_id).
+    Pass a range (e.g. range(start, end) of a chapter from kjv.ranges) to query a whole passage.
+    """
+    if direction not in DIRECTIONS:
+        raise ValueError(f"direction must be one of {DIRECTIONS}")
+
+    frames = []
+    if direction in ("out", "both"):
+        verse, neighbor, votes = _gather(graph.out_offsets, graph.out_targets, graph.out_votes, verse_ids)
+        frames.append(pd.DataFrame({"verse_id": verse, "neighbor_id": neighbor, "votes": votes, "direction": "out"}))
+    if direction in ("in", "both"):
+        verse, neighbor, votes = _gather(graph.in_offsets, graph.in_sources, graph.in_votes, verse_ids)
+        frames.append(pd.DataFrame({"verse_id": verse, "neighbor_id": neighbor, "votes": votes, "direction": "in"}))
+
+    edges = pd.concat(frames, ignore_index=True)
+    if min_votes is not None:
+        edges = edges[edges["votes"] >= min_votes].reset_index(drop=True)
+    return edges
+
+
+def verse_labels(verses, verse_ids):
+    """
+    ("Book C:V" references, verse texts) of verse_ids.
+    """
+    rows = verses.iloc[np.asarray(verse_ids)]
+    reference = rows["book_name"].astype(str) + " " + rows["chapter_number"].astype(str) + ":" + rows["verse_number"].astype(str)
+    return reference.to_numpy(), rows["verse_text"].to_numpy()
+
+
+def edge_table(edges, verses, limit=None):
+    """
+    edges (from neighbors) joined with the reference and text of each neighbor verse, highest votes first.
+    """
+    edges = edges.sort_values(["votes", "neighbor_id"], ascending=[False, True], kind="stable")
+    if limit is not None:
+        edges = edges.head(limit)
+    reference, verse_text = verse_labels(verses, edges["neighbor_id"].to_numpy())
+    return pd.DataFrame({
+        "reference": reference,
+        "verse_text": verse_text,
+        "votes": edges["votes"].to_numpy(),
+        "direction": edges["direction"].to_numpy(),
+    })
+
+
+def expand(graph, verse_ids, hops=2, top_k=10, direction="both", min_votes=None):
+    """
+    k-hop expansion from verse_ids: at each hop the not yet visited neighbors of the frontier
+    are scored by the sum of their edge votes, and the top_k best become the next frontier,
+    so the expansion never holds more than top_k verses per hop (even from Psalms 110:1).
+    Every reached verse keeps the frontier verse of its highest-voted edge as parent_id, and
+    path_votes sums the votes along that chain back to verse_ids.
+    Returns a DataFrame with verse_id, hop, score, parent_id and path_votes, best first within each hop.
+    """
+    n_verses = len(graph.out_offsets) - 1
+    visited = np.zeros(n_verses, dtype=bool)
+    path_votes = np.zeros(n_verses, dtype=np.int64)
+    frontier = np.unique(np.asarray(verse_ids, dtype=np.int64))
+    visited[frontier] = True
+
+    frames = []
+    for hop in range(1, hops + 1):
+        edges = neighbors(graph, frontier, direction=direction, min_votes=min_votes)
+        reached = edges["neighbor_id"].to_numpy()
+        fresh = ~visited[reached]
+        if not fresh.any():
+            break
+
+        parents, reached, votes = edges["verse_id"].to_numpy()[fresh], reached[fresh], edges["votes"].to_numpy()[fresh]
+        candidates, inverse = np.unique(reached, return_inverse=True)
+        scores = np.bincount(inverse, weights=votes)
+        top = np.lexsort((candidates, -scores))[:top_k]
+
+        # Highest-voted edge into each candidate, ties to the earlier parent
+        best = np.lexsort((parents, -votes, inverse))
+        best = best[np.concatenate([[True], inverse[best][1:] != inverse[best][:-1]])]
+
+        frontier = candidates[top]
+        visited[frontier] = True
+        path_votes[frontier] = path_votes[parents[best][top]] + votes[best][top]
+        frames.append(pd.DataFrame({
+            "verse_id": frontier, "hop": hop, "score": scores[top],
+            "parent_id": parents[best][top], "path_votes": path_votes[frontier],
+        }))
+
+    if not frames:
+        empty = np.empty(0, np.int64)
+        return pd.DataFrame({"verse_id": empty, "hop": empty, "score": np.empty(0), "parent_id": empty, "path_votes": empty})
+    return pd.concat(frames, ignore_index=True)
+
+
+def expansion_paths(expansion, verses, sep=" → "):
+    """
+    "Book C:V → ... → Book C:V" chain from the starting verse to each verse of expansion (from expand).
+    """
+    parents = dict(zip(expansion["verse_id"], expansion["parent_id"]))
+    chains = []
+    for verse_id in expansion["verse_id"]:
+        chain = [verse_id]
+        while chain[-1] in parents:
+            chain.append(parents[chain[-1]])
+        chains.append(chain[::-1])
+
+    if not chains:
+        return []
+    ids = np.unique(np.concatenate(chains))
+    labels = dict(zip(ids, verse_labels(verses, ids)[0]))
+    return [sep.join(labels[v] for v in chain) for chain in chains]
+
+
+# ----------------------
+# Roll-ups
+# ----------------------
+
+def rollup(edges, ranges, level="book"):
+    """
+    Roll the neighbors in edges up to books or chapters: the number of references and the
+    sum of their votes per neighbor book (or book + chapter), most referenced first.
+    ranges is the kjv.ranges offset table of the verse store.
+    """
+    chapters = chapter_of(ranges, edges["neighbor_id"].to_numpy())
+    votes = edges["votes"].to_numpy()
+    if level == "book":
+        groups, n_groups = ranges.chapter_book[chapters], len(KJV_BOOKS)
+    else:
+        groups, n_groups = chapters, len(ranges.chapter_number)
+
+    references = np.bincount(groups, minlength=n_groups)
+    total_votes = np.bincount(groups, weights=votes, minlength=n_groups).astype(np.int64)
+    found = np.flatnonzero(references)
+
+    if level == "book":
+        table = pd.DataFrame({"book_name": [KJV_BOOKS[b] for b in found]})
+    else:
+        table = pd.DataFrame({
+            "book_name": [KJV_BOOKS[b] for b in ranges.chapter_book[found]],
+            "chapter_number": ranges.chapter_number[found],
+        })
+    table["references"] = references[found]
+    table["votes"] = total_votes[found]
+    return table.sort_values(["references", "votes"], ascending=False, kind="stable").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    print(build_cr_graph())
@@ -0,0 +1,210 @@
+import os
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from kjv.books import KJV_BOOKS, NEW_TESTAMENT, OLD_TESTAMENT
+
+
+# ----------------------
+# Paths
+# ----------------------
+
+KJV_CR_CSV = os.path.join("data", "kjv_cr.csv")
+KJV_CR_MATRIX_DIR = os.path.join("data", "kjv_cr_matrix")
+
+TESTAMENT_NAMES = ["Old Testament", "New Testament"]
+LINK_COLUMNS = [
+    "book_name_source", "chapter_number_source", "verse_number_source",
+    "book_name_target", "chapter_number_target", "verse_number_target",
+]
+
+
+class CrMatrices(NamedTuple):
+    book_matrix: np.ndarray
+    testament_matrix: np.ndarray
+    chapter_book: np.ndarray
+    chapter_number: np.ndarray
+    chapter_sources: np.ndarray
+    chapter_targets: np.ndarray
+    chapter_counts: np.ndarray
+    book_layout: np.ndarray
+
+
+# ----------------------
+# Links
+# ----------------------
+
+def read_cr_links(path=KJV_CR_CSV):
+    """
+    Single-verse cross-references from kjv_cr.csv, one row per link with LINK_COLUMNS.
+    Links whose source or target is a verse range are dropped, as in training/kjv_cr.ipynb.
+    """
+    df = pd.read_csv(path, dtype=str)
+    single = df[["book_name_source_max", "book_name_target_max"]].isna().all(axis=1)
+    links = df.loc[single, [f"{col}_min" for col in LINK_COLUMNS]].dropna()
+    links.columns = LINK_COLUMNS
+
+    for col in LINK_COLUMNS:
+        if col.startswith("book_name"):
+            links[col] = pd.Categorical(links[col], categories=KJV_BOOKS)
+        else:
+            links[col] = links[col].astype(int)
+    return links.reset_index(drop=True)
+
+
+def _testament_codes(book_codes):
+    return (np.asarray(book_codes) >= len(OLD_TESTAMENT)).astype(np.int64)
+
+
+# ----------------------
+# Build Function
+# ----------------------
+
+def book_matrix(links):
+    """
+    book_matrix[s, t] = links from KJV_BOOKS[s] to KJV_BOOKS[t].
+    """
+    sources = pd.Categorical(links["book_name_source"], categories=KJV_BOOKS).codes.astype(np.int64)
+    targets = pd.Categorical(links["book_name_target"], categories=KJV_BOOKS).codes.astype(np.int64)
+    known = (sources >= 0) & (targets >= 0)
+    n_books = len(KJV_BOOKS)
+    return np.bincount(sources[known] * n_books + targets[known], minlength=n_books * n_books).reshape(n_books, n_books)
+
+
+def testament_matrix(books):
+    """
+    2 x 2 [Old, New] x [Old, New] link counts, summed from a book matrix.
+    """
+    testaments = _testament_codes(np.arange(len(KJV_BOOKS)))
+    matrix = np.zeros((2, 2), dtype=np.int64)
+    np.add.at(matrix, (testaments[:, None], testaments[None, :]), books)
+    return matrix
+
+
+def chapter_links(links):
+    """
+    Chapter x chapter link counts in COO form: (chapter_book, chapter_number) label every chapter that
+    takes part in a link, in canonical order, and chapter_counts[i] links go from chapter
+    chapter_sources[i] to chapter chapter_targets[i].
+    """
+    sources = pd.Categorical(links["book_name_source"], categories=KJV_BOOKS).codes.astype(np.int64)
+    targets = pd.Categorical(links["book_name_target"], categories=KJV_BOOKS).codes.astype(np.int64)
+    known = (sources >= 0) & (targets >= 0)
+    source_keys = sources[known] * 1000 + links["chapter_number_source"].to_numpy()[known]
+    target_keys = targets[known] * 1000 + links["chapter_number_target"].to_numpy()[known]
+
+    chapters, inverse = np.unique(np.concatenate([source_keys, target_keys]), return_inverse=True)
+    source_ids, target_ids = np.split(inverse, 2)
+
+    pairs, counts = np.unique(source_ids * len(chapters) + target_ids, return_counts=True)
+    return chapters // 1000, chapters % 1000, pairs // len(chapters), pairs % len(chapters), counts
+
+
+def force_layout(weights, iterations=500, seed=1):
+    """
+    Fruchterman-Reingold layout of a weighted undirected graph given as a symmetric matrix,
+    as (n, 2) positions scaled into [-1, 1]. Weights are log-scaled so a few heavy pairs
+    (e.g. Psalms <-> Psalms) do not collapse the rest of the graph.
+    """
+    n = len(weights)
+    attraction = np.log1p(np.asarray(weights, dtype=float))
+    attraction /= max(attraction.max(), 1)
+    np.fill_diagonal(attraction, 0)
+
+    positions = np.random.default_rng(seed).uniform(-1, 1, (n, 2))
+    k = 1 / np.sqrt(n)
+    temperature = 0.1
+    for _ in range(iterations):
+        delta = positions[:, None, :] - positions[None, :, :]
+        distance = np.maximum(np.linalg.norm(delta, axis=-1), 0.01)
+        displacement = np.einsum("ijk,ij->ik", delta, k * k / distance ** 2 - attraction * distance / k)
+        length = np.maximum(np.linalg.norm(displacement, axis=-1), 0.01)
+        positions += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= 0.1 / (iterations + 1)
+
+    positions -= positions.mean(axis=0)
+    return positions / np.abs(positions).max()
+
+
+def build_cr_matrices(path=KJV_CR_CSV, out_dir=KJV_CR_MATRIX_DIR):
+    """
+    Aggregate the cross-references into book x book, testament x testament and chapter x chapter
+    (COO) count arrays with one bincount each, saved as .npy files in out_dir together with
+    a force-directed layout of the book network (book_layout[b] = x, y of KJV_BOOKS[b]).
+    """
+    links = read_cr_links(path)
+    books = book_matrix(links)
+    chapter_book, chapter_number, chapter_sources, chapter_targets, chapter_counts = chapter_links(links)
+
+    arrays = {
+        "book_matrix": books.astype(np.int32),
+        "testament_matrix": testament_matrix(books).astype(np.int64),
+        "chapter_book": chapter_book.astype(np.int8),
+        "chapter_number": chapter_number.astype(np.int16),
+        "chapter_sources": chapter_sources.astype(np.int32),
+        "chapter_targets": chapter_targets.astype(np.int32),
+        "chapter_counts": chapter_counts.astype(np.int32),
+        "book_layout": force_layout(books + books.T).astype(np.float32),
+    }
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(out_dir, f"{name}.npy"), array)
+    return out_dir
+
+
+# ----------------------
+# Loading Function
+# ----------------------
+
+def read_cr_matrices(path=KJV_CR_MATRIX_DIR):
+    if not all(os.path.exists(os.path.join(path, f"{name}.npy")) for name in CrMatrices._fields):
+        build_cr_matrices(out_dir=path)
+
+    return CrMatrices(**{
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        for name in CrMatrices._fields
+    })
+
+
+# ----------------------
+# Views
+# ----------------------
+
+def book_dict(books):
+    """
+    {source book: {target book: links}} without zero entries (the notebook's dict_cr).
+    """
+    sources, targets = np.nonzero(books)
+    result = {}
+    for s, t in zip(sources, targets):
+        result.setdefault(KJV_BOOKS[s], {})[KJV_BOOKS[t]] = int(books[s, t])
+    return result
+
+
+def cross_testament_pairs(books, source="Old Testament"):
+    """
+    {(source book, target book): links} for the links from one testament into the other
+    (the notebook's dict_cr_unidirectional_ot_ord / dict_cr_unidirectional_nt_ord).
+    """
+    n_old = len(OLD_TESTAMENT)
+    if source == "Old Testament":
+        block, source_books, target_books = books[:n_old, n_old:], OLD_TESTAMENT, NEW_TESTAMENT
+    else:
+        block, source_books, target_books = books[n_old:, :n_old], NEW_TESTAMENT, OLD_TESTAMENT
+    sources, targets = np.nonzero(block)
+    return {(source_books[s], target_books[t]): int(block[s, t]) for s, t in zip(sources, targets)}
+
+
+def book_totals(books):
+    """
+    (outgoing, incoming) links per book, in KJV_BOOKS order.
+    """
+    books = np.asarray(books)
+    return books.sum(axis=1), books.sum(axis=0)
+
+
+if __name__ == "__main__":
+    print(build_cr_matrices())
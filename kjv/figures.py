@@ -0,0 +1,184 @@
+import gzip
+import hashlib
+import json
+import os
+from typing import NamedTuple, Optional
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# ----------------------
+# Paths
+# ----------------------
+
+KJV_FIGURES_DIR = os.path.join("data", "kjv_figures")
+
+MODEL_FIGURES = {
+    "timeline_bc": os.path.join("models", "figure_timeline_ad.json"),
+    "timeline_ad": os.path.join("models", "figure_timeline_ce.json"),
+}
+
+
+class FigureBody(NamedTuple):
+    etag: str
+    identity: bytes
+    gzip: bytes
+    br: Optional[bytes]
+
+
+# ----------------------
+# JSON Codec
+# ----------------------
+
+def loads(data):
+    """
+    Parse JSON bytes with orjson when it is installed, the standard library otherwise.
+    """
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+# ----------------------
+# Wire Bytes
+# ----------------------
+
+def encode_figure(data, etag=None):
+    """
+    FigureBody of a figure's JSON bytes: the bytes themselves, gzip (mtime 0, so the same figure
+    always compresses to the same bytes) and brotli when it is installed, tagged with etag
+    (a content hash by default).
+    """
+    return FigureBody(
+        etag=etag or hashlib.sha256(data).hexdigest()[:32],
+        identity=data,
+        gzip=gzip.compress(data, compresslevel=9, mtime=0),
+        br=brotli.compress(data, quality=11) if brotli is not None else None,
+    )
+
+
+def _write_bytes(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+# ----------------------
+# Build Function
+# ----------------------
+
+def build_figures(out_dir=KJV_FIGURES_DIR):
+    """
+    Validate every figure in MODEL_FIGURES once through go.Figure and save it as compact JSON
+    in out_dir, so loading it later needs only a JSON parse. Properties the installed Plotly no
+    longer knows (e.g. "heatmapgl" in the embedded templates) are dropped.
+    The gzip (.json.gz) and brotli (.json.br) encodings are saved next to it, ready to be served.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    for name, path in MODEL_FIGURES.items():
+        figure = go.Figure(loads(_read_bytes(path)), skip_invalid=True)
+        body = encode_figure(pio.to_json(figure, validate=False).encode("utf-8"))
+
+        _write_bytes(os.path.join(out_dir, f"{name}.json"), body.identity)
+        _write_bytes(os.path.join(out_dir, f"{name}.json.gz"), body.gzip)
+        if body.br is not None:
+            _write_bytes(os.path.join(out_dir, f"{name}.json.br"), body.br)
+    return out_dir
+
+
+# ----------------------
+# Loading Function
+# ----------------------
+
+def read_figure(name, path=KJV_FIGURES_DIR):
+    """
+    Pre-validated figure dict of MODEL_FIGURES[name]. Treat it as read-only, so a cached
+    figure can be shared between sessions and callbacks.
+    """
+    figure_path = os.path.join(path, f"{name}.json")
+    if not os.path.exists(figure_path):
+        build_figures(out_dir=path)
+    return loads(_read_bytes(figure_path))
+
+
+def read_figure_body(name, path=KJV_FIGURES_DIR):
+    """
+    FigureBody of MODEL_FIGURES[name] from the files saved by build_figures, for serving as is.
+    """
+    figure_path = os.path.join(path, f"{name}.json")
+    if not all(os.path.exists(figure_path + ext) for ext in ("", ".gz")):
+        build_figures(out_dir=path)
+
+    identity = _read_bytes(figure_path)
+    br = _read_bytes(figure_path + ".br") if os.path.exists(figure_path + ".br") else None
+    return FigureBody(
+        etag=hashlib.sha256(identity).hexdigest()[:32],
+        identity=identity,
+        gzip=_read_bytes(figure_path + ".gz"),
+        br=br,
+    )
+
+
+# ----------------------
+# Live Figures
+# ----------------------
+
+def data_version(*paths):
+    """
+    Version of the data files (or artifact directories) a live figure is built from: a hash of
+    the size and modification time of every file, so rebuilding any of them changes the version.
+    Missing files count as missing, and are expected to be built by their read_* function.
+    """
+    entries = []
+    for path in paths:
+        files = sorted(os.path.join(path, f) for f in os.listdir(path)) if os.path.isdir(path) else [path]
+        for file in files:
+            if os.path.exists(file):
+                stat = os.stat(file)
+                entries.append(f"{file}:{stat.st_size}:{stat.st_mtime_ns}")
+            else:
+                entries.append(f"{file}:missing")
+    return hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()[:32]
+
+
+def version_etag(key, version):
+    """
+    ETag of the live figure key (its name and parameters) built from data at version, known before the figure is built.
+    """
+    return hashlib.sha256(f"{key}\n{version}".encode("utf-8")).hexdigest()[:32]
+
+
+def figure_body(figure, etag=None):
+    """
+    FigureBody of a go.Figure built on the fly, ready to be served like the stored figures.
+    """
+    return encode_figure(pio.to_json(figure, validate=False).encode("utf-8"), etag=etag)
+
+
+# ----------------------
+# Plotly Figures
+# ----------------------
+
+def as_figure(figure):
+    """
+    go.Figure over a figure dict without running Plotly's validators, for APIs that want a Figure
+    (e.g. st.plotly_chart, which would otherwise validate a dict on every call).
+    """
+    return go.Figure(figure, _validate=False)
+
+
+if __name__ == "__main__":
+    print(build_figures())
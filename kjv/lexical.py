@@ -0,0 +1,203 @@
+import os
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from kjv.books import KJV_BOOKS
+from kjv.ranges import book_codes, sort_canonical
+from kjv.store import read_kjv_clean
+
+
+# ----------------------
+# Paths
+# ----------------------
+
+KJV_TOKENS_DIR = os.path.join("data", "kjv_tokens")
+
+
+class TokenIndex(NamedTuple):
+    token_ids: np.ndarray
+    chapter_book: np.ndarray
+    chapter_number: np.ndarray
+    chapter_offsets: np.ndarray
+    vocab: list
+
+
+# ----------------------
+# Build Function
+# ----------------------
+
+def build_token_index(df=None, out_dir=KJV_TOKENS_DIR):
+    """
+    Tokenize every verse once (whitespace tokens, as the lexical richness page always did)
+    and store the corpus as a flat int32 array of token IDs, in canonical verse order, with:
+      - chapter_offsets[i]:chapter_offsets[i + 1] = tokens of chapter i
+      - chapter_book[i], chapter_number[i] = the book code (index into KJV_BOOKS) and number of chapter i
+    """
+    if df is None:
+        df = read_kjv_clean()
+    df = sort_canonical(df)
+
+    words = df["verse_text"].str.split()
+    tokens = words.explode().dropna()
+    token_ids, vocab = pd.factorize(tokens.to_numpy())
+
+    chapters = pd.DataFrame({
+        "book": book_codes(df),
+        "chapter": df["chapter_number"].to_numpy(),
+        "n_tokens": words.str.len().fillna(0).to_numpy(),
+    }).groupby(["book", "chapter"], sort=False)["n_tokens"].sum().reset_index()
+
+    chapter_offsets = np.concatenate([[0], np.cumsum(chapters["n_tokens"].to_numpy())])
+
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, "token_ids.npy"), token_ids.astype(np.int32))
+    np.save(os.path.join(out_dir, "chapter_book.npy"), chapters["book"].to_numpy().astype(np.int16))
+    np.save(os.path.join(out_dir, "chapter_number.npy"), chapters["chapter"].to_numpy().astype(np.int16))
+    np.save(os.path.join(out_dir, "chapter_offsets.npy"), chapter_offsets.astype(np.int64))
+    with open(os.path.join(out_dir, "vocab.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(vocab))
+    return out_dir
+
+
+# ----------------------
+# Loading Function
+# ----------------------
+
+def read_token_index(path=KJV_TOKENS_DIR):
+    if not os.path.exists(os.path.join(path, "vocab.txt")):
+        build_token_index(out_dir=path)
+
+    arrays = {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        for name in ["token_ids", "chapter_book", "chapter_number", "chapter_offsets"]
+    }
+    with open(os.path.join(path, "vocab.txt"), "r", encoding="utf-8") as f:
+        vocab = f.read().split("\n")
+    return TokenIndex(vocab=vocab, **arrays)
+
+
+def book_offsets(index):
+    starts = np.flatnonzero(np.diff(index.chapter_book, prepend=-1))
+    return index.chapter_offsets[np.append(starts, len(index.chapter_book))], index.chapter_book[starts]
+
+
+# ----------------------
+# Lexical Richness
+# ----------------------
+
+def _segments(offsets):
+    lengths = np.diff(offsets)
+    return np.repeat(np.arange(len(lengths)), lengths), lengths
+
+
+def type_token_ratio(token_ids, offsets):
+    """
+    Unique-to-total token ratio of every segment offsets[i]:offsets[i + 1].
+    """
+    token_ids = np.asarray(token_ids, dtype=np.int64)
+    segment, lengths = _segments(offsets)
+    n_vocab = int(token_ids.max()) + 1 if len(token_ids) else 1
+
+    types = np.unique(segment * n_vocab + token_ids)
+    unique_counts = np.bincount(types // n_vocab, minlength=len(lengths))
+
+    return np.divide(unique_counts, lengths, out=np.zeros(len(lengths)), where=lengths > 0)
+
+
+def window_type_counts(token_ids, offsets, window):
+    """
+    Number of distinct tokens in the window of `window` tokens starting at every position.
+    Token j is the first of its type in the window starting at s iff prev[j] < s <= j,
+    so each token adds 1 to a contiguous range of window starts (a difference array).
+    Windows never cross segment boundaries; positions whose window would are marked invalid.
+    """
+    token_ids = np.asarray(token_ids)
+    n = len(token_ids)
+    positions = np.arange(n)
+    segment, _ = _segments(offsets)
+    segment_start = offsets[:-1][segment]
+    segment_end = offsets[1:][segment]
+
+    order = np.argsort(token_ids, kind="stable")
+    same = token_ids[order[1:]] == token_ids[order[:-1]]
+    prev = np.full(n, -1, dtype=np.int64)
+    prev[order[1:][same]] = order[:-1][same]
+
+    lo = np.maximum.reduce([prev + 1, positions - window + 1, segment_start])
+    delta = np.bincount(lo, minlength=n + 1) - np.bincount(positions + 1, minlength=n + 1)
+    counts = np.cumsum(delta)[:n]
+
+    valid = positions + window <= segment_end
+    return counts, valid, segment
+
+
+def moving_average_ttr(token_ids, offsets, window=500):
+    """
+    Moving-Average Type-Token Ratio (MATTR) of every segment: the mean TTR over all windows
+    of `window` tokens inside the segment. Segments shorter than the window fall back to plain TTR.
+    """
+    counts, valid, segment = window_type_counts(token_ids, offsets, window)
+    n_segments = len(offsets) - 1
+
+    sums = np.bincount(segment[valid], weights=counts[valid], minlength=n_segments)
+    n_windows = np.bincount(segment[valid], minlength=n_segments)
+    mattr = np.divide(sums, n_windows * window, out=np.zeros(n_segments), where=n_windows > 0)
+
+    short = n_windows == 0
+    if short.any():
+        mattr[short] = type_token_ratio(token_ids, offsets)[short]
+    return mattr
+
+
+def sliding_ttr(token_ids, start, end, window=500, step=1):
+    """
+    TTR of every window of `window` tokens in token_ids[start:end], advancing by `step` tokens.
+    """
+    offsets = np.array([0, end - start])
+    counts, valid, _ = window_type_counts(token_ids[start:end], offsets, window)
+    return counts[valid][::step] / window
+
+
+def lexical_richness(index, level="Book", metric="TTR", window=500):
+    """
+    Lexical richness per book or per chapter as a DataFrame with book_name, chapter_number (chapter level only)
+    and lexical_richness columns.
+    """
+    if level == "Book":
+        offsets, books = book_offsets(index)
+        data = {"book_name": [KJV_BOOKS[b] for b in books]}
+    else:
+        offsets = index.chapter_offsets
+        data = {
+            "book_name": [KJV_BOOKS[b] for b in index.chapter_book],
+            "chapter_number": np.asarray(index.chapter_number),
+        }
+
+    if metric == "MATTR":
+        data["lexical_richness"] = moving_average_ttr(index.token_ids, offsets, window)
+    else:
+        data["lexical_richness"] = type_token_ratio(index.token_ids, offsets)
+    return pd.DataFrame(data)
+
+
+def metric_caption(metric, level="Book", window=500):
+    """
+    One-line description of what the lexical richness page plots for metric ("TTR" or "MATTR").
+    """
+    unit = level.lower()
+    if metric == "MATTR":
+        return (
+            f"Moving-average type-token ratio (MATTR) of every {unit}: the mean unique-to-total word ratio "
+            f"over every window of {window} words, so long and short {unit}s are comparable. "
+            f"A {unit} shorter than the window shows its plain TTR."
+        )
+    return (
+        f"Unique-to-total word ratio (TTR) of every {unit}: distinct words / total words. "
+        f"TTR falls as a text gets longer, so long {unit}s score lower; switch to MATTR to compare them."
+    )
+
+
+if __name__ == "__main__":
+    print(build_token_index())
@@ -0,0 +1,123 @@
+import os
+from typing import NamedTuple
+
+import numpy as np
+
+from kjv.books import KJV_BOOKS
+from kjv.ranges import book_ranges, sort_canonical
+from kjv.store import read_kjv_clean
+
+
+# ----------------------
+# Paths
+# ----------------------
+
+KJV_POS_DIR = os.path.join("data", "kjv_pos")
+SPACY_MODEL_PATH = os.path.join("data", "en_core_web_sm", "en_core_web_sm-3.8.0")
+
+POS_TAGS = [
+    "ADJ", "ADP", "ADV", "AUX", "CCONJ", "DET", "INTJ", "NOUN", "NUM",
+    "PART", "PRON", "PROPN", "PUNCT", "SCONJ", "SYM", "VERB", "X"
+]
+
+
+class PosIndex(NamedTuple):
+    verse_ids: np.ndarray
+    token_ids: np.ndarray
+    pos_ids: np.ndarray
+    book_verse_offsets: np.ndarray
+    vocab: np.ndarray
+
+
+# ----------------------
+# Build Function
+# ----------------------
+
+def load_nlp(model_path=SPACY_MODEL_PATH):
+    # spaCy is only needed to build the POS index, so importing kjv.pos stays cheap
+    import spacy
+
+    if os.path.isdir(model_path):
+        # Only the tagger (and the attribute ruler that maps tags to UPOS) is needed for token.pos_
+        return spacy.load(model_path, exclude=["parser", "ner", "lemmatizer"])
+    else:
+        raise FileNotFoundError(f"SpaCy model not found at {model_path}. Please ensure it is correctly placed.")
+
+
+def build_pos_index(df=None, nlp=None, n_process=1, batch_size=256, out_dir=KJV_POS_DIR):
+    """
+    POS-tag every verse with nlp.pipe and store one row per token as flat arrays:
+      - verse_ids: position of the verse in canonical order
+      - token_ids: index into vocab.txt
+      - pos_ids: index into POS_TAGS
+    plus book_verse_offsets, the [start, end) verse-ID range of every book in KJV_BOOKS.
+    """
+    if df is None:
+        df = read_kjv_clean()
+    if nlp is None:
+        nlp = load_nlp()
+    df = sort_canonical(df)
+
+    pos_lookup = {tag: i for i, tag in enumerate(POS_TAGS)}
+    vocab = {}
+    verse_ids, token_ids, pos_ids = [], [], []
+
+    texts = df["verse_text"].fillna("").astype(str)
+    docs = nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+    for verse_id, doc in enumerate(docs):
+        for token in doc:
+            if token.is_space:
+                continue
+            verse_ids.append(verse_id)
+            token_ids.append(vocab.setdefault(token.text, len(vocab)))
+            pos_ids.append(pos_lookup.get(token.pos_, pos_lookup["X"]))
+
+    book_verse_offsets = book_ranges(df).book_offsets
+
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, "verse_ids.npy"), np.asarray(verse_ids, dtype=np.int32))
+    np.save(os.path.join(out_dir, "token_ids.npy"), np.asarray(token_ids, dtype=np.int32))
+    np.save(os.path.join(out_dir, "pos_ids.npy"), np.asarray(pos_ids, dtype=np.int8))
+    np.save(os.path.join(out_dir, "book_verse_offsets.npy"), book_verse_offsets.astype(np.int32))
+    with open(os.path.join(out_dir, "vocab.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(vocab))
+    return out_dir
+
+
+# ----------------------
+# Loading Function
+# ----------------------
+
+def read_pos_index(path=KJV_POS_DIR):
+    """
+    The POS index saved by build_pos_index. It is not built on first use like the other artifacts:
+    tagging every verse with spaCy takes minutes, far too long for a page render.
+    """
+    if not os.path.exists(os.path.join(path, "vocab.txt")):
+        raise FileNotFoundError(f"POS index not found at {path}. Build it first with `python -m kjv.pos`.")
+
+    arrays = {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        for name in ["verse_ids", "token_ids", "pos_ids", "book_verse_offsets"]
+    }
+    with open(os.path.join(path, "vocab.txt"), "r", encoding="utf-8") as f:
+        vocab = np.array(f.read().split("\n"), dtype=object)
+    return PosIndex(vocab=vocab, **arrays)
+
+
+def book_tokens(index, book_name, pos_tag=None):
+    """
+    Token texts of a book, optionally only those tagged pos_tag, in reading order.
+    """
+    book = KJV_BOOKS.index(book_name)
+    verse_range = index.book_verse_offsets[book:book + 2]
+    start, end = np.searchsorted(index.verse_ids, verse_range)
+
+    token_ids = index.token_ids[start:end]
+    if pos_tag is not None:
+        token_ids = token_ids[index.pos_ids[start:end] == POS_TAGS.index(pos_tag)]
+    return index.vocab[token_ids]
+
+
+if __name__ == "__main__":
+    print(build_pos_index(n_process=os.cpu_count() or 1))
@@ -0,0 +1,135 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from kjv.books import KJV_BOOKS
+
+
+class BookRanges(NamedTuple):
+    book_offsets: np.ndarray
+    chapter_offsets: np.ndarray
+    chapter_book: np.ndarray
+    chapter_number: np.ndarray
+    book_chapter_offsets: np.ndarray
+
+
+# ----------------------
+# Canonical Order
+# ----------------------
+
+def book_codes(df):
+    return pd.Categorical(df["book_name"], categories=KJV_BOOKS).codes
+
+
+def is_canonical(df):
+    keys = pd.DataFrame({
+        "book": book_codes(df),
+        "chapter": df["chapter_number"].to_numpy(),
+        "verse": df["verse_number"].to_numpy(),
+    })
+    return pd.MultiIndex.from_frame(keys).is_monotonic_increasing
+
+
+def sort_canonical(df):
+    """
+    Rows in canonical KJV order (book, chapter, verse), renumbered 0..n-1.
+    """
+    order = np.lexsort((df["verse_number"].to_numpy(), df["chapter_number"].to_numpy(), book_codes(df)))
+    return df.iloc[order].reset_index(drop=True)
+
+
+# ----------------------
+# Offset Table
+# ----------------------
+
+def book_ranges(df):
+    """
+    Offset table of a frame in canonical order:
+      - book_offsets[b]:book_offsets[b + 1] = rows of KJV_BOOKS[b]
+      - chapter_offsets[i]:chapter_offsets[i + 1] = rows of chapter i,
+        which is chapter chapter_number[i] of book chapter_book[i]
+      - book_chapter_offsets[b]:book_chapter_offsets[b + 1] = chapters of KJV_BOOKS[b]
+    """
+    codes = book_codes(df)
+    chapters = df["chapter_number"].to_numpy()
+
+    book_offsets = np.searchsorted(codes, np.arange(len(KJV_BOOKS) + 1))
+    starts = np.flatnonzero((np.diff(codes, prepend=-2) != 0) | (np.diff(chapters, prepend=-1) != 0))
+    starts = starts[codes[starts] >= 0]
+    chapter_book = codes[starts]
+
+    return BookRanges(
+        book_offsets=book_offsets,
+        chapter_offsets=np.append(starts, book_offsets[-1]),
+        chapter_book=chapter_book,
+        chapter_number=chapters[starts],
+        book_chapter_offsets=np.searchsorted(chapter_book, np.arange(len(KJV_BOOKS) + 1)),
+    )
+
+
+def book_range(ranges, book_name):
+    book = KJV_BOOKS.index(book_name)
+    return int(ranges.book_offsets[book]), int(ranges.book_offsets[book + 1])
+
+
+def chapter_range(ranges, book_name, chapter_number):
+    book = KJV_BOOKS.index(book_name)
+    first, last = ranges.book_chapter_offsets[book], ranges.book_chapter_offsets[book + 1]
+    i = first + np.searchsorted(ranges.chapter_number[first:last], chapter_number)
+    if i == last or ranges.chapter_number[i] != chapter_number:
+        return int(ranges.book_offsets[book]), int(ranges.book_offsets[book])
+    return int(ranges.chapter_offsets[i]), int(ranges.chapter_offsets[i + 1])
+
+
+def chapter_of(ranges, rows):
+    """
+    Index into the chapter arrays of each row, e.g. ranges.chapter_book[chapter_of(ranges, rows)] is its book.
+    """
+    return np.searchsorted(ranges.chapter_offsets, rows, side="right") - 1
+
+
+def books_runs(ranges, book_names):
+    """
+    [start, end) row ranges covering book_names, with adjacent books merged into one run.
+    """
+    books = np.unique([KJV_BOOKS.index(book) for book in book_names if book in KJV_BOOKS]).astype(int)
+    starts, ends = ranges.book_offsets[books], ranges.book_offsets[books + 1]
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+    if len(starts) == 0:
+        return starts, ends
+
+    new_run = np.concatenate([[True], starts[1:] != ends[:-1]])
+    last_in_run = np.append(new_run[1:], True)
+    return starts[new_run], ends[last_in_run]
+
+
+# ----------------------
+# Slicing
+# ----------------------
+
+def book_slice(df, ranges, book_name):
+    start, end = book_range(ranges, book_name)
+    return df.iloc[start:end]
+
+
+def chapter_slice(df, ranges, book_name, chapter_number):
+    start, end = chapter_range(ranges, book_name, chapter_number)
+    return df.iloc[start:end]
+
+
+def books_slice(df, ranges, book_names):
+    """
+    Rows of several books: a plain range view when they form one contiguous run
+    (e.g. all books, a testament, consecutive books), otherwise one take over the concatenated ranges.
+    """
+    starts, ends = books_runs(ranges, book_names)
+    if len(starts) == 0:
+        return df.iloc[0:0]
+    if len(starts) == 1:
+        return df.iloc[starts[0]:ends[0]]
+
+    lengths = ends - starts
+    rows = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths) + np.arange(lengths.sum())
+    return df.iloc[rows]
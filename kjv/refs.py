@@ -0,0 +1,237 @@
+import numpy as np
+import pandas as pd
+
+from kjv.books import KJV_BOOKS
+from kjv.ranges import book_codes
+
+
+# ----------------------
+# Abbreviations
+# ----------------------
+
+# OpenBible.info cross references ("Gen.1.1", "Prov.8.22-Prov.8.30")
+OSIS_BOOKS = {
+    "Gen": "Genesis", "Exod": "Exodus", "Lev": "Leviticus", "Num": "Numbers", "Deut": "Deuteronomy",
+    "Josh": "Joshua", "Judg": "Judges", "Ruth": "Ruth", "1Sam": "1 Samuel", "2Sam": "2 Samuel",
+    "1Kgs": "1 Kings", "2Kgs": "2 Kings", "1Chr": "1 Chronicles", "2Chr": "2 Chronicles", "Ezra": "Ezra",
+    "Neh": "Nehemiah", "Esth": "Esther", "Job": "Job", "Ps": "Psalms", "Prov": "Proverbs",
+    "Eccl": "Ecclesiastes", "Song": "Song of Solomon", "Isa": "Isaiah", "Jer": "Jeremiah", "Lam": "Lamentations",
+    "Ezek": "Ezekiel", "Dan": "Daniel", "Hos": "Hosea", "Joel": "Joel", "Amos": "Amos",
+    "Obad": "Obadiah", "Jonah": "Jonah", "Mic": "Micah", "Nah": "Nahum", "Hab": "Habakkuk",
+    "Zeph": "Zephaniah", "Hag": "Haggai", "Zech": "Zechariah", "Mal": "Malachi",
+    "Matt": "Matthew", "Mark": "Mark", "Luke": "Luke", "John": "John", "Acts": "Acts",
+    "Rom": "Romans", "1Cor": "1 Corinthians", "2Cor": "2 Corinthians", "Gal": "Galatians", "Eph": "Ephesians",
+    "Phil": "Philippians", "Col": "Colossians", "1Thess": "1 Thessalonians", "2Thess": "2 Thessalonians", "1Tim": "1 Timothy",
+    "2Tim": "2 Timothy", "Titus": "Titus", "Phlm": "Philemon", "Heb": "Hebrews", "Jas": "James",
+    "1Pet": "1 Peter", "2Pet": "2 Peter", "1John": "1 John", "2John": "2 John", "3John": "3 John",
+    "Jude": "Jude", "Rev": "Revelation",
+}
+
+# OpenBible.info geocoding ("2 Kgs 5:12")
+GEO_BOOKS = {
+    "Gen": "Genesis", "Ex": "Exodus", "Lev": "Leviticus", "Num": "Numbers", "Deut": "Deuteronomy",
+    "Josh": "Joshua", "Judg": "Judges", "Ruth": "Ruth", "1 Sam": "1 Samuel", "2 Sam": "2 Samuel",
+    "1 Kgs": "1 Kings", "2 Kgs": "2 Kings", "1 Chr": "1 Chronicles", "2 Chr": "2 Chronicles", "Ezra": "Ezra",
+    "Neh": "Nehemiah", "Est": "Esther", "Job": "Job", "Ps": "Psalms", "Prov": "Proverbs",
+    "Eccl": "Ecclesiastes", "Sng": "Song of Solomon", "Isa": "Isaiah", "Jer": "Jeremiah", "Lam": "Lamentations",
+    "Ezek": "Ezekiel", "Dan": "Daniel", "Hos": "Hosea", "Joel": "Joel", "Amos": "Amos",
+    "Obad": "Obadiah", "Jonah": "Jonah", "Mic": "Micah", "Nahum": "Nahum", "Hab": "Habakkuk",
+    "Zeph": "Zephaniah", "Hag": "Haggai", "Zech": "Zechariah", "Mal": "Malachi",
+    "Matt": "Matthew", "Mark": "Mark", "Luke": "Luke", "John": "John", "Acts": "Acts",
+    "Rom": "Romans", "1 Cor": "1 Corinthians", "2 Cor": "2 Corinthians", "Gal": "Galatians", "Eph": "Ephesians",
+    "Phil": "Philippians", "Col": "Colossians", "1 Thes": "1 Thessalonians", "2 Thes": "2 Thessalonians", "1 Tim": "1 Timothy",
+    "2 Tim": "2 Timothy", "Titus": "Titus", "Phlm": "Philemon", "Heb": "Hebrews", "Jas": "James",
+    "1 Pet": "1 Peter", "2 Pet": "2 Peter", "1 John": "1 John", "2 John": "2 John", "3 John": "3 John",
+    "Jude": "Jude", "Rev": "Revelation",
+}
+
+# Viz.Bible events ("gen.1.1,gen.1.2"), matched case-insensitively
+TIMELINE_BOOKS = {
+    "GEN": "Genesis", "EXOD": "Exodus", "LEV": "Leviticus", "NUM": "Numbers", "DEUT": "Deuteronomy",
+    "JOSH": "Joshua", "JUDG": "Judges", "RUT": "Ruth", "1SAM": "1 Samuel", "2SAM": "2 Samuel",
+    "1KGS": "1 Kings", "2KGS": "2 Kings", "1CHR": "1 Chronicles", "2CHR": "2 Chronicles", "EZR": "Ezra",
+    "NEH": "Nehemiah", "EST": "Esther", "JOB": "Job", "PSA": "Psalms", "PRO": "Proverbs",
+    "ECC": "Ecclesiastes", "SNG": "Song of Solomon", "ISA": "Isaiah", "JER": "Jeremiah", "LAM": "Lamentations",
+    "EZEK": "Ezekiel", "DAN": "Daniel", "HOS": "Hosea", "JOEL": "Joel", "AMOS": "Amos",
+    "OBAD": "Obadiah", "JONAH": "Jonah", "MIC": "Micah", "NAH": "Nahum", "HAB": "Habakkuk",
+    "ZEPH": "Zephaniah", "HAG": "Haggai", "ZECH": "Zechariah", "MAL": "Malachi",
+    "MATT": "Matthew", "MARK": "Mark", "LUKE": "Luke", "JOHN": "John", "ACTS": "Acts",
+    "ROM": "Romans", "1CO": "1 Corinthians", "2CO": "2 Corinthians", "GAL": "Galatians", "EPH": "Ephesians",
+    "PHP": "Philippians", "COL": "Colossians", "1TH": "1 Thessalonians", "2TH": "2 Thessalonians", "1TI": "1 Timothy",
+    "2TI": "2 Timothy", "TIT": "Titus", "PHM": "Philemon", "HEB": "Hebrews", "JAS": "James",
+    "1PE": "1 Peter", "2PE": "2 Peter", "1JN": "1 John", "2JN": "2 John", "3JN": "3 John",
+    "JUD": "Jude", "REV": "Revelation",
+}
+
+
+def _normalize(names):
+    return names.str.upper().str.replace(r"[\s.]", "", regex=True)
+
+
+def _book_aliases():
+    """
+    Every full name and abbreviation, upper-cased without spaces, mapped to its book code.
+    The tables agree wherever their normalized abbreviations collide ("1 Kgs" / "1KGS", "Sng" / "SNG").
+    """
+    aliases = {}
+    for table in ({book: book for book in KJV_BOOKS}, OSIS_BOOKS, GEO_BOOKS, TIMELINE_BOOKS):
+        names = _normalize(pd.Series(list(table.keys()), dtype="string"))
+        aliases.update(zip(names, (KJV_BOOKS.index(book) for book in table.values())))
+    return aliases
+
+
+BOOK_ALIASES = _book_aliases()
+
+BOOK_PATTERN = r"(?:[1-3]\s?)?[A-Za-z]+(?:\s+[A-Za-z]+)*"
+REF_PATTERN = rf"^(?P<book>{BOOK_PATTERN})[\s.]+(?P<chapter>\d+)[.:](?P<verse>\d+)$"
+REF_END_PATTERN = rf"^(?:(?P<book>{BOOK_PATTERN})[\s.]+)?(?:(?P<chapter>\d+)[.:])?(?P<verse>\d+)$"
+
+
+def book_codes_of(names):
+    """
+    Book codes (indexes into KJV_BOOKS) of full names or any known abbreviation, -1 where unknown.
+    """
+    names = _normalize(pd.Series(names, dtype="string"))
+    return names.map(BOOK_ALIASES).fillna(-1).to_numpy(dtype=np.int64)
+
+
+# ----------------------
+# Verse IDs
+# ----------------------
+
+def _key(books, chapters, verses):
+    return np.asarray(books, dtype=np.int64) * 1_000_000 + np.asarray(chapters, dtype=np.int64) * 1_000 + np.asarray(verses, dtype=np.int64)
+
+
+def verse_keys(verses):
+    """
+    Sortable (book, chapter, verse) key of every row of the canonically sorted verse store.
+    A verse ID is the row position, so verse_keys(verses)[verse_id] is the key of that verse.
+    """
+    return _key(book_codes(verses), verses["chapter_number"].to_numpy(), verses["verse_number"].to_numpy())
+
+
+def lookup_verse_ids(keys, books, chapters, verses):
+    """
+    Verse IDs of (book code, chapter, verse) triples, -1 where the verse does not exist.
+    """
+    books = np.asarray(books, dtype=np.int64)
+    chapters = np.nan_to_num(np.asarray(chapters, dtype=float), nan=0).astype(np.int64)
+    verses = np.nan_to_num(np.asarray(verses, dtype=float), nan=0).astype(np.int64)
+
+    wanted = _key(books, chapters, verses)
+    ids = np.searchsorted(keys, wanted)
+    found = (books >= 0) & (ids < len(keys))
+    found[found] = keys[ids[found]] == wanted[found]
+    return np.where(found, ids, -1)
+
+
+# ----------------------
+# Parsing
+# ----------------------
+
+def _split(refs):
+    """
+    (start, end, is_range) of a column of references: start and end hold book code (-1 if unknown),
+    chapter and verse, NaN where the reference does not parse. The end of a single verse repeats its start,
+    and an abbreviated end ("Ps.23.1-6", "Gen 1:31-2:3") takes the missing book / chapter from it.
+    Each distinct string is parsed once, so repeated references cost a take.
+    """
+    codes, uniques = pd.factorize(pd.Series(refs, dtype="string").str.strip())
+    uniques = pd.Series(uniques, dtype="string")
+    parts = pd.concat([uniques, pd.Series([pd.NA], dtype="string")], ignore_index=True)
+    codes = np.where(codes < 0, len(uniques), codes)
+    parts = parts.str.split("-", n=1, expand=True).reindex(columns=[0, 1]).astype("string")
+
+    start = parts[0].str.strip().str.extract(REF_PATTERN)
+    end = parts[1].str.strip().str.extract(REF_END_PATTERN)
+    for frame in (start, end):
+        frame["book"] = np.where(frame["book"].isna(), np.nan, book_codes_of(frame["book"]))
+        frame["chapter"] = frame["chapter"].astype(float)
+        frame["verse"] = frame["verse"].astype(float)
+
+    end = end.fillna(start)
+    is_range = parts[1].notna().to_numpy()
+    return start.iloc[codes].reset_index(drop=True), end.iloc[codes].reset_index(drop=True), is_range[codes]
+
+
+def split_refs(refs):
+    """
+    Parse a column of references in any of the supported formats ("Eph.6.22-Eph.6.24", "2 Kgs 5:12", "gen.1.1")
+    into book_name_min, chapter_number_min, verse_number_min and book_name_max, chapter_number_max, verse_number_max.
+    The _max columns are missing for single verses; every column is missing where the reference does not parse.
+    """
+    start, end, is_range = _split(refs)
+    books = np.array(KJV_BOOKS + [None], dtype=object)
+    parsed = (start["book"] >= 0).to_numpy() & start[["chapter", "verse"]].notna().all(axis=1).to_numpy()
+
+    result = {}
+    for suffix, frame, keep in (("min", start, parsed), ("max", end, parsed & is_range)):
+        keep = keep & (frame["book"] >= 0).to_numpy()
+        codes = frame["book"].fillna(-1).to_numpy(dtype=np.int64)
+        result[f"book_name_{suffix}"] = np.where(keep, books[codes], None)
+        result[f"chapter_number_{suffix}"] = pd.array(np.where(keep, frame["chapter"], np.nan), dtype="Int64")
+        result[f"verse_number_{suffix}"] = pd.array(np.where(keep, frame["verse"], np.nan), dtype="Int64")
+    return pd.DataFrame(result)
+
+
+def parse_refs(refs, keys):
+    """
+    Map a column of references (any supported format, single verse or range) to inclusive
+    verse ID intervals (start_ids, end_ids) in one pass; references that do not resolve get -1.
+    keys is verse_keys() of the verse store.
+    """
+    start, end, _ = _split(refs)
+    start_ids = lookup_verse_ids(keys, start["book"].fillna(-1), start["chapter"], start["verse"])
+    end_ids = lookup_verse_ids(keys, end["book"].fillna(-1), end["chapter"], end["verse"])
+
+    invalid = (start_ids < 0) | (end_ids < start_ids)
+    return np.where(invalid, -1, start_ids), np.where(invalid, -1, end_ids)
+
+
+def expand_intervals(start_ids, end_ids):
+    """
+    Expand verse ID intervals into (owner, verse_ids): one entry per verse, where owner is the
+    position of its interval. Unresolved intervals (-1) are skipped.
+    """
+    start_ids, end_ids = np.asarray(start_ids), np.asarray(end_ids)
+    valid = np.flatnonzero(start_ids >= 0)
+    lengths = end_ids[valid] - start_ids[valid] + 1
+    owner = np.repeat(valid, lengths)
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return owner, start_ids[owner] + offsets
+
+
+def parse_ref_lists(refs, keys, sep=","):
+    """
+    Resolve a column of reference lists ("gen.1.1,gen.1.2,gen.1.4-6") to a DataFrame with one row per
+    verse: row (position in refs) and verse_id, sorted and without duplicates within each row.
+    """
+    refs = pd.Series(refs, dtype="string").reset_index(drop=True)
+    items = refs.str.split(sep).explode()
+    owner, verse_ids = expand_intervals(*parse_refs(items, keys))
+    rows = items.index.to_numpy()[owner]
+
+    pairs = np.unique(rows.astype(np.int64) * len(keys) + verse_ids)
+    return pd.DataFrame({"row": pairs // len(keys), "verse_id": pairs % len(keys)})
+
+
+def group_runs(rows, verse_ids):
+    """
+    Run number of each entry of a parse_ref_lists result: consecutive verses of the same row share a run.
+    """
+    rows, verse_ids = np.asarray(rows), np.asarray(verse_ids)
+    new_run = np.ones(len(rows), dtype=bool)
+    new_run[1:] = (rows[1:] != rows[:-1]) | (verse_ids[1:] != verse_ids[:-1] + 1)
+    return np.cumsum(new_run) - 1
+
+
+def ref_texts(refs, verses, sep=" "):
+    """
+    The text of every reference in refs (the verses of a range joined with sep), "" where it does not resolve.
+    verses is the canonically sorted verse store.
+    """
+    refs = pd.Series(refs, dtype="string")
+    owner, verse_ids = expand_intervals(*parse_refs(refs, verse_keys(verses)))
+    texts = pd.Series(verses["verse_text"].to_numpy()[verse_ids]).groupby(owner).agg(sep.join)
+    return pd.Series(texts.reindex(range(len(refs)), fill_value="").to_numpy(), index=refs.index)
@@ -0,0 +1,215 @@
+import os
+import re
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from kjv.books import KJV_BOOKS, TESTAMENTS
+from kjv.ranges import sort_canonical
+from kjv.store import read_kjv_clean
+
+
+# ----------------------
+# Paths
+# ----------------------
+
+KJV_SEARCH_DIR = os.path.join("data", "kjv_search")
+
+TOKEN_PATTERN = r"\w+(?:'\w+)*"
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class SearchIndex(NamedTuple):
+    term_offsets: np.ndarray
+    occ_verse: np.ndarray
+    occ_position: np.ndarray
+    doc_freq: np.ndarray
+    verse_rows: np.ndarray
+    verse_book: np.ndarray
+    verse_chapter: np.ndarray
+    verse_number: np.ndarray
+    verse_lengths: np.ndarray
+    vocab: dict
+
+
+def tokenize(text):
+    return re.findall(TOKEN_PATTERN, text.lower())
+
+
+# ----------------------
+# Build Function
+# ----------------------
+
+def build_search_index(df=None, out_dir=KJV_SEARCH_DIR):
+    """
+    Positional inverted index over every verse, in canonical verse order.
+    Occurrences are sorted by (term, verse, position), so the postings of term t are
+    occ_verse / occ_position[term_offsets[t]:term_offsets[t + 1]].
+    verse_rows maps a verse ID back to its row in the verse store.
+    """
+    if df is None:
+        df = read_kjv_clean()
+    df = sort_canonical(df.reset_index(drop=True).rename_axis("row").reset_index())
+
+    tokens = df["verse_text"].fillna("").str.lower().str.findall(TOKEN_PATTERN)
+    lengths = tokens.str.len().to_numpy()
+    words = tokens.explode().dropna().to_numpy()
+
+    n_verses = len(df)
+    occ_verse = np.repeat(np.arange(n_verses), lengths)
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    occ_position = np.arange(len(words)) - np.repeat(starts, lengths)
+
+    term_ids, vocab = pd.factorize(words, sort=True)
+    order = np.lexsort((occ_position, occ_verse, term_ids))
+    term_ids, occ_verse, occ_position = term_ids[order], occ_verse[order], occ_position[order]
+
+    term_offsets = np.concatenate([[0], np.cumsum(np.bincount(term_ids, minlength=len(vocab)))])
+    postings = np.unique(term_ids.astype(np.int64) * n_verses + occ_verse)
+    doc_freq = np.bincount(postings // n_verses, minlength=len(vocab))
+
+    arrays = {
+        "term_offsets": term_offsets.astype(np.int64),
+        "occ_verse": occ_verse.astype(np.int32),
+        "occ_position": occ_position.astype(np.int16),
+        "doc_freq": doc_freq.astype(np.int32),
+        "verse_rows": df["row"].to_numpy().astype(np.int32),
+        "verse_book": pd.Categorical(df["book_name"], categories=KJV_BOOKS).codes.astype(np.int8),
+        "verse_chapter": df["chapter_number"].to_numpy().astype(np.int16),
+        "verse_number": df["verse_number"].to_numpy().astype(np.int16),
+        "verse_lengths": lengths.astype(np.int16),
+    }
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(out_dir, f"{name}.npy"), array)
+    with open(os.path.join(out_dir, "vocab.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(vocab))
+    return out_dir
+
+
+# ----------------------
+# Loading Function
+# ----------------------
+
+def read_search_index(path=KJV_SEARCH_DIR):
+    if not os.path.exists(os.path.join(path, "vocab.txt")):
+        build_search_index(out_dir=path)
+
+    arrays = {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        for name in SearchIndex._fields if name != "vocab"
+    }
+    with open(os.path.join(path, "vocab.txt"), "r", encoding="utf-8") as f:
+        vocab = {term: i for i, term in enumerate(f.read().split("\n"))}
+    return SearchIndex(vocab=vocab, **arrays)
+
+
+# ----------------------
+# Query
+# ----------------------
+
+def parse_query(query):
+    """
+    Split a query into quoted phrases (which must match exactly) and the remaining loose terms.
+    """
+    phrases = [tokenize(phrase) for phrase in re.findall(r'"([^"]*)"', query)]
+    terms = tokenize(re.sub(r'"[^"]*"', " ", query))
+    return [phrase for phrase in phrases if phrase], terms
+
+
+def _postings(index, term):
+    term_id = index.vocab.get(term)
+    if term_id is None:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int16)
+    start, end = index.term_offsets[term_id], index.term_offsets[term_id + 1]
+    return index.occ_verse[start:end], index.occ_position[start:end]
+
+
+def phrase_verses(index, phrase):
+    """
+    Verse IDs containing the phrase: occurrences of the i-th word are shifted back by i positions
+    and intersected, so a surviving (verse, position) is the start of a match.
+    """
+    stride = np.int64(np.iinfo(np.int16).max) + 1
+    matches = None
+    for i, term in enumerate(phrase):
+        verses, positions = _postings(index, term)
+        starts = verses.astype(np.int64) * stride + positions.astype(np.int64) - i
+        matches = starts if matches is None else np.intersect1d(matches, starts, assume_unique=True)
+        if len(matches) == 0:
+            break
+    return np.unique(matches // stride)
+
+
+def bm25_scores(index, terms):
+    """
+    BM25 score of every verse that contains at least one of terms, as (verse IDs, scores).
+    """
+    n_verses = len(index.verse_lengths)
+    avg_length = float(np.mean(index.verse_lengths))
+
+    verse_ids, scores = [], []
+    for term in set(terms):
+        verses, _ = _postings(index, term)
+        if len(verses) == 0:
+            continue
+        verses, tf = np.unique(verses, return_counts=True)
+        doc_freq = index.doc_freq[index.vocab[term]]
+        idf = np.log(1 + (n_verses - doc_freq + 0.5) / (doc_freq + 0.5))
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * index.verse_lengths[verses] / avg_length)
+        verse_ids.append(verses)
+        scores.append(idf * tf * (BM25_K1 + 1) / (tf + norm))
+
+    if not verse_ids:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    verse_ids, inverse = np.unique(np.concatenate(verse_ids), return_inverse=True)
+    return verse_ids, np.bincount(inverse, weights=np.concatenate(scores))
+
+
+def search(index, query, books=None, testament=None, limit=50):
+    """
+    Rank verses for query with BM25. Quoted phrases are required; loose terms only add to the score.
+    Results can be restricted to a list of books and/or a testament.
+    Returns (hits, total): the top `limit` hits as a DataFrame with row (position in the verse store),
+    book_name, chapter_number, verse_number and score, and the number of matching verses.
+    """
+    phrases, terms = parse_query(query)
+    verse_ids, scores = bm25_scores(index, terms + [term for phrase in phrases for term in phrase])
+
+    for phrase in phrases:
+        keep = np.isin(verse_ids, phrase_verses(index, phrase), assume_unique=True)
+        verse_ids, scores = verse_ids[keep], scores[keep]
+
+    allowed = set(KJV_BOOKS)
+    if books:
+        allowed &= set(books)
+    if testament in TESTAMENTS:
+        allowed &= set(TESTAMENTS[testament])
+    if len(allowed) < len(KJV_BOOKS):
+        book_codes = [KJV_BOOKS.index(book) for book in allowed]
+        keep = np.isin(index.verse_book[verse_ids], book_codes)
+        verse_ids, scores = verse_ids[keep], scores[keep]
+
+    total = len(verse_ids)
+    if total > limit:
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        verse_ids, scores = verse_ids[top], scores[top]
+    order = np.lexsort((verse_ids, -scores))
+    verse_ids, scores = verse_ids[order], scores[order]
+
+    hits = pd.DataFrame({
+        "row": np.asarray(index.verse_rows[verse_ids]),
+        "book_name": [KJV_BOOKS[b] for b in index.verse_book[verse_ids]],
+        "chapter_number": np.asarray(index.verse_chapter[verse_ids]),
+        "verse_number": np.asarray(index.verse_number[verse_ids]),
+        "score": scores,
+    })
+    return hits, total
+
+
+if __name__ == "__main__":
+    print(build_search_index())
@@ -0,0 +1,128 @@
+import functools
+import inspect
+
+import pandas as pd
+
+
+# ----------------------
+# Read-Only DataFrame
+# ----------------------
+
+class SharedFrameError(TypeError):
+    pass
+
+
+def _read_only(*args, **kwargs):
+    raise SharedFrameError(
+        "Shared DataFrames are read-only. Derive a new frame (e.g. df[mask], df.assign(...)) instead of mutating it."
+    )
+
+
+class _ReadOnlyIndexer:
+    def __init__(self, indexer):
+        self._indexer = indexer
+
+    def __getitem__(self, key):
+        return self._indexer[key]
+
+    __setitem__ = _read_only
+
+    def __call__(self, *args, **kwargs):
+        return _ReadOnlyIndexer(self._indexer(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._indexer, name)
+
+
+def _no_inplace(method):
+    # Checked before pandas runs: some inplace paths (e.g. rename) change the frame before they reach _update_inplace
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if kwargs.get("inplace"):
+            _read_only()
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _inplace_methods():
+    """
+    Names of the DataFrame methods that take an inplace argument (rename, sort_values, fillna, ...).
+    """
+    for name in dir(pd.DataFrame):
+        attr = getattr(pd.DataFrame, name, None)
+        if name.startswith("_") or not inspect.isfunction(attr):
+            continue
+        try:
+            parameters = inspect.signature(attr).parameters
+        except (TypeError, ValueError):
+            continue
+        if "inplace" in parameters:
+            yield name
+
+
+class SharedFrame(pd.DataFrame):
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    @property
+    def columns(self):
+        # A view, so setting .name on it leaves the shared axis alone
+        return pd.DataFrame.columns.__get__(self).view()
+
+    @columns.setter
+    def columns(self, value):
+        _read_only()
+
+    @property
+    def index(self):
+        # A view, so setting .name on it leaves the shared axis alone
+        return pd.DataFrame.index.__get__(self).view()
+
+    @index.setter
+    def index(self, value):
+        _read_only()
+
+    @property
+    def loc(self):
+        return _ReadOnlyIndexer(super().loc)
+
+    @property
+    def iloc(self):
+        return _ReadOnlyIndexer(super().iloc)
+
+    @property
+    def at(self):
+        return _ReadOnlyIndexer(super().at)
+
+    @property
+    def iat(self):
+        return _ReadOnlyIndexer(super().iat)
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    insert = _read_only
+    pop = _read_only
+    update = _read_only
+    _update_inplace = _read_only
+
+
+for _name in _inplace_methods():
+    setattr(SharedFrame, _name, _no_inplace(getattr(pd.DataFrame, _name)))
+
+
+def share(df):
+    return SharedFrame(df, copy=False)
+
+
+# ----------------------
+# Copy-on-Write
+# ----------------------
+
+def enable_copy_on_write():
+    """
+    Turn on pandas Copy-on-Write (the default from pandas 3). It is a process-wide option,
+    so only the app entry points call this, never a library import.
+    """
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
@@ -0,0 +1,286 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from kjv.books import KJV_BOOKS
+from kjv.ranges import book_codes
+
+
+SITE_COLUMNS = ["name_id_modern", "administrative_area_level_2", "administrative_area_level_1", "country"]
+MENTION_COLUMNS = ["book_name", "chapter_number", "verse_number", "verse_text", "name_id_ancient"]
+
+GRID_CELL_DEGREES = 0.25
+CLUSTER_MAX_ZOOM = 8
+CLUSTER_RADIUS_PIXELS = 24
+SITE_RADIUS_METERS = 500
+
+DEFAULT_ZOOM = 5
+MAP_WIDTH = 1200
+MAP_HEIGHT = 1000
+
+# deck.gl controller of the map: panning only, the zoom is set by the page (so the app always knows it)
+MAP_CONTROLLER = {
+    "scrollZoom": False, "doubleClickZoom": False, "touchZoom": False, "keyboard": False, "dragRotate": False, "inertia": False,
+}
+
+
+class SiteGrid(NamedTuple):
+    cell_degrees: float
+    n_cols: int
+    cell_ids: np.ndarray
+    cell_sites: np.ndarray
+
+
+class SiteIndex(NamedTuple):
+    sites: pd.DataFrame
+    row_site: np.ndarray
+    site_offsets: np.ndarray
+    site_rows: np.ndarray
+    site_book_counts: np.ndarray
+    site_country: np.ndarray
+    countries: list
+    grid: SiteGrid
+
+
+# ----------------------
+# Build Function
+# ----------------------
+
+def build_site_index(locs):
+    """
+    Group the location mentions (one row per verse x place) by distinct coordinate:
+      - sites: one row per (latitude, longitude) with its place names, and a site_id column
+      - row_site[i]: site of mention row i
+      - site_rows[site_offsets[s]:site_offsets[s + 1]]: mention rows of site s, in canonical verse order
+      - site_book_counts[s, b]: mentions of site s in KJV_BOOKS[b]
+      - site_country[s]: index into countries of the country site s lies in
+      - grid: the spatial index of the sites (see build_site_grid)
+    A coordinate lies in exactly one country, so this site x book matrix plus the country of
+    every site is the sparse form of a site x book x country count tensor.
+    """
+    row_site, _ = pd.factorize(pd.MultiIndex.from_arrays([locs["latitude"], locs["longitude"]]))
+
+    sites = locs[["latitude", "longitude"] + SITE_COLUMNS].groupby(row_site, sort=True).first()
+    ancient = (
+        pd.DataFrame({"site": row_site, "name": locs["name_id_ancient"].astype(str).to_numpy()})
+        .drop_duplicates()
+        .groupby("site", sort=True)["name"].agg(", ".join)
+    )
+    sites["name_id_ancient"] = ancient
+    sites = sites.rename_axis("site_id").reset_index()
+
+    site_rows = np.argsort(row_site, kind="stable")
+    site_offsets = np.concatenate([[0], np.cumsum(np.bincount(row_site, minlength=len(sites)))])
+
+    n_sites, n_books = len(sites), len(KJV_BOOKS)
+    codes = book_codes(locs)
+    known = codes >= 0
+    site_book_counts = np.bincount(
+        row_site[known] * n_books + codes[known], minlength=n_sites * n_books
+    ).reshape(n_sites, n_books).astype(np.int32)
+    site_country, countries = pd.factorize(sites["country"])
+
+    return SiteIndex(
+        sites=sites,
+        row_site=row_site,
+        site_offsets=site_offsets,
+        site_rows=site_rows,
+        site_book_counts=site_book_counts,
+        site_country=site_country,
+        countries=list(countries),
+        grid=build_site_grid(sites),
+    )
+
+
+def build_site_grid(sites, cell_degrees=GRID_CELL_DEGREES):
+    """
+    Bucket the sites into a regular latitude/longitude grid, stored CSR-style:
+    cell_sites lists the sites sorted by cell ID (row * n_cols + col) and cell_ids the matching cell IDs,
+    so one row of cells in a viewport is a single searchsorted range.
+    """
+    n_cols = int(np.ceil(360 / cell_degrees))
+    rows = np.floor((sites["latitude"].to_numpy() + 90) / cell_degrees).astype(np.int64)
+    cols = np.floor((sites["longitude"].to_numpy() + 180) / cell_degrees).astype(np.int64)
+    cell_ids = rows * n_cols + np.clip(cols, 0, n_cols - 1)
+
+    order = np.argsort(cell_ids, kind="stable")
+    return SiteGrid(cell_degrees=cell_degrees, n_cols=n_cols, cell_ids=cell_ids[order], cell_sites=order)
+
+
+# ----------------------
+# Map Data
+# ----------------------
+
+def site_counts(index, books, countries):
+    """
+    Mentions of every site in the selected books and countries: a sum over the selected
+    columns of site_book_counts, with sites outside the selected countries zeroed.
+    """
+    books = [KJV_BOOKS.index(book) for book in books if book in KJV_BOOKS]
+    counts = index.site_book_counts[:, books].sum(axis=1)
+    countries = [index.countries.index(country) for country in countries if country in index.countries]
+    counts[~np.isin(index.site_country, countries)] = 0
+    return counts
+
+
+# ----------------------
+# Viewport
+# ----------------------
+
+def _mercator_y(latitude):
+    latitude = np.radians(np.clip(latitude, -85.05113, 85.05113))
+    return (1 - np.log(np.tan(latitude) + 1 / np.cos(latitude)) / np.pi) / 2
+
+
+def _mercator_latitude(y):
+    return np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * y))))
+
+
+def map_view(latitude, longitude, zoom, width=MAP_WIDTH, height=MAP_HEIGHT):
+    """
+    A map view state: the center, zoom and pixel size of the map.
+    """
+    return {"latitude": float(latitude), "longitude": float(longitude), "zoom": float(zoom), "width": int(width), "height": int(height)}
+
+
+def initial_view(index, books, countries, center=None, zoom=DEFAULT_ZOOM, width=MAP_WIDTH, height=MAP_HEIGHT):
+    """
+    View on site center (a site_id), by default on the mention-weighted mean of the selected books and countries.
+    None when the selection has no mentions.
+    """
+    counts = site_counts(index, books, countries)
+    latitude, longitude = index.sites["latitude"].to_numpy(), index.sites["longitude"].to_numpy()
+    if center is not None:
+        return map_view(latitude[center], longitude[center], zoom, width, height)
+    if counts.any():
+        return map_view(np.average(latitude, weights=counts), np.average(longitude, weights=counts), zoom, width, height)
+    return None
+
+
+def view_at_point(view, longitude, latitude, x, y, width=None, height=None):
+    """
+    view panned so that (longitude, latitude) sits at pixel (x, y) of the map, at the same zoom:
+    the view after a drag, from the point under the pointer when the drag ended.
+    width / height update the map size (e.g. after the page was resized).
+    """
+    width = view["width"] if width is None else width
+    height = view["height"] if height is None else height
+    world = 256 * 2 ** view["zoom"]
+    center_x = (longitude + 180) / 360 * world - (x - width / 2)
+    center_y = np.clip(_mercator_y(latitude) * world - (y - height / 2), 0, world)
+    center_longitude = (center_x / world * 360) % 360 - 180
+    return map_view(_mercator_latitude(center_y / world), center_longitude, view["zoom"], width, height)
+
+
+def viewport_bounds(latitude, longitude, zoom, width=MAP_WIDTH, height=MAP_HEIGHT):
+    """
+    (west, south, east, north) seen by a width x height pixel Web Mercator map centered on (latitude, longitude).
+    """
+    world = 256 * 2 ** zoom
+    x = (longitude + 180) / 360 * world
+    y = _mercator_y(latitude) * world
+
+    west = max((x - width / 2) / world * 360 - 180, -180)
+    east = min((x + width / 2) / world * 360 - 180, 180)
+    north = _mercator_latitude(max(y - height / 2, 0) / world)
+    south = _mercator_latitude(min(y + height / 2, world) / world)
+    return west, float(south), east, float(north)
+
+
+def sites_in_bounds(index, bounds):
+    """
+    IDs of the sites inside (west, south, east, north), looked up through the grid.
+    """
+    west, south, east, north = bounds
+    grid = index.grid
+    row_lo, row_hi = (np.floor((np.array([south, north]) + 90) / grid.cell_degrees)).astype(np.int64)
+    col_lo, col_hi = np.clip(
+        np.floor((np.array([west, east]) + 180) / grid.cell_degrees).astype(np.int64), 0, grid.n_cols - 1
+    )
+
+    rows = np.arange(row_lo, row_hi + 1) * grid.n_cols
+    starts = np.searchsorted(grid.cell_ids, rows + col_lo, side="left")
+    ends = np.searchsorted(grid.cell_ids, rows + col_hi, side="right")
+    candidates = np.concatenate([grid.cell_sites[start:end] for start, end in zip(starts, ends)] + [[]]).astype(np.int64)
+
+    latitude = index.sites["latitude"].to_numpy()[candidates]
+    longitude = index.sites["longitude"].to_numpy()[candidates]
+    inside = (latitude >= south) & (latitude <= north) & (longitude >= west) & (longitude <= east)
+    return np.sort(candidates[inside])
+
+
+def cluster_sites(data, zoom, radius_pixels=CLUSTER_RADIUS_PIXELS):
+    """
+    Merge the sites that fall in the same radius_pixels square at this zoom into one point at their
+    count-weighted centroid. A cluster keeps the place names of its most mentioned site,
+    with n_sites > 1 and site_id -1.
+    """
+    cells = 256 * 2 ** zoom / radius_pixels
+    x = np.floor((data["longitude"].to_numpy() + 180) / 360 * cells).astype(np.int64)
+    y = np.floor(_mercator_y(data["latitude"].to_numpy()) * cells).astype(np.int64)
+    _, cluster = np.unique(x * (int(cells) + 1) + y, return_inverse=True)
+
+    counts = data["count"].to_numpy()
+    totals = np.bincount(cluster, weights=counts)
+    n_sites = np.bincount(cluster)
+    top = np.lexsort((-counts, cluster))
+    top = top[np.concatenate([[True], cluster[top][1:] != cluster[top][:-1]])]
+
+    clusters = data.iloc[top].assign(
+        latitude=np.bincount(cluster, weights=data["latitude"].to_numpy() * counts) / totals,
+        longitude=np.bincount(cluster, weights=data["longitude"].to_numpy() * counts) / totals,
+        count=totals.astype(np.int64),
+        n_sites=n_sites,
+    )
+    merged = clusters["n_sites"] > 1
+    clusters.loc[merged, "site_id"] = -1
+    clusters.loc[merged, "name_id_modern"] = (
+        clusters.loc[merged, "name_id_modern"].astype(str) + " + " + (clusters.loc[merged, "n_sites"] - 1).astype(str) + " more sites"
+    )
+    return clusters
+
+
+def site_choices(index):
+    """
+    {"Modern (Ancient)": site_id} for picking a map center, sorted by label.
+    """
+    labels = index.sites["name_id_modern"].astype(str) + " (" + index.sites["name_id_ancient"] + ")"
+    choices = pd.Series(index.sites["site_id"].to_numpy(), index=labels)
+    choices = choices[~choices.index.duplicated()].sort_index()
+    return choices.to_dict()
+
+
+def viewport_layer_data(index, books, countries, view, overscan=1):
+    """
+    The map points of the selected books and countries inside view (see map_view): the sites in its
+    bounds, clustered below CLUSTER_MAX_ZOOM, with count, n_sites, radius (meters) and color_intensity columns.
+    overscan > 1 also loads a margin around the view (the bounds of a map overscan times as wide and high),
+    for maps that cannot report when they are panned.
+    Verse texts are left out; fetch them per site with site_mentions.
+    """
+    counts = site_counts(index, books, countries)
+    bounds = viewport_bounds(
+        view["latitude"], view["longitude"], view["zoom"], view["width"] * overscan, view["height"] * overscan,
+    )
+    in_view = sites_in_bounds(index, bounds)
+    in_view = in_view[counts[in_view] > 0]
+
+    data = index.sites.iloc[in_view].assign(count=counts[in_view], n_sites=1)
+    if len(data) and view["zoom"] < CLUSTER_MAX_ZOOM:
+        data = cluster_sites(data, view["zoom"])
+    if len(data):
+        data["radius"] = SITE_RADIUS_METERS * np.sqrt(data["n_sites"])
+        data["color_intensity"] = np.interp(data["count"], [data["count"].min(), data["count"].max()], [50, 255])
+    return data
+
+
+def site_mentions(locs, index, site_id, books=None):
+    """
+    The verses mentioning site_id (optionally only those in books), in canonical order.
+    """
+    rows = index.site_rows[index.site_offsets[site_id]:index.site_offsets[site_id + 1]]
+    mentions = locs.iloc[rows][MENTION_COLUMNS]
+    if books is not None:
+        mentions = mentions[mentions["book_name"].isin(books)]
+    return mentions
@@ -0,0 +1,116 @@
+import os
+import warnings
+
+import pandas as pd
+
+from kjv.store import read_kjv_clean
+
+
+# ----------------------
+# Paths
+# ----------------------
+
+KJV_STATS_BOOK_CSV = os.path.join("data", "kjv_stats_book.csv")
+KJV_STATS_CHAPTER_CSV = os.path.join("data", "kjv_stats_chapter.csv")
+SENTIMENT_BY_BOOK_CSV = os.path.join("data", "sentiment_by_book.csv")
+
+
+# ----------------------
+# Build Function
+# ----------------------
+
+def verse_sentiment(df):
+    """
+    Compound VADER score per verse, as in training/kjv.ipynb.
+    Returns None when nltk (or its vader_lexicon) is not installed:
+    pip install nltk && python -m nltk.downloader vader_lexicon
+    """
+    try:
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        sia = SentimentIntensityAnalyzer()
+    except (ImportError, LookupError):
+        return None
+    return df["verse_text"].map(lambda text: sia.polarity_scores(text)["compound"]).astype(float)
+
+
+def summarize(verses, words, keys):
+    summary = verses.groupby(keys, observed=True, sort=True).agg(
+        verse_count=("verse_number", "size"),
+        word_count=("word_count", "sum"),
+        mean_sentiment=("sentiment", "mean"),
+    )
+    unique_words = words.drop_duplicates().groupby(keys, observed=True, sort=True).size()
+    summary["unique_words"] = unique_words.reindex(summary.index, fill_value=0)
+    return summary
+
+
+def build_corpus_stats(df=None, book_path=KJV_STATS_BOOK_CSV, chapter_path=KJV_STATS_CHAPTER_CSV):
+    """
+    Write the per-book and per-chapter summary tables used by the count pages:
+      - verse_count, word_count, unique_words, mean_sentiment (both tables)
+      - chapter_count (book table)
+    Words are whitespace tokens, the same definition the lexical richness page uses.
+    """
+    if df is None:
+        df = read_kjv_clean()
+
+    sentiment = verse_sentiment(df)
+    if sentiment is None:
+        warnings.warn(
+            "VADER is not available (pip install nltk && python -m nltk.downloader vader_lexicon): "
+            f"mean_sentiment is left empty in {chapter_path}, and the book table falls back to {SENTIMENT_BY_BOOK_CSV}.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+    verses = pd.DataFrame({
+        "book_name": df["book_name"],
+        "chapter_number": df["chapter_number"],
+        "verse_number": df["verse_number"],
+        "word_count": df["verse_text"].str.split().str.len(),
+        "sentiment": sentiment if sentiment is not None else float("nan"),
+    })
+
+    tokens = df["verse_text"].str.split().explode().dropna()
+    words = pd.DataFrame({
+        "book_name": df["book_name"].loc[tokens.index].to_numpy(),
+        "chapter_number": df["chapter_number"].loc[tokens.index].to_numpy(),
+        "word": tokens.to_numpy(),
+    })
+
+    stats_chapter = summarize(verses, words, ["book_name", "chapter_number"]).reset_index()
+
+    stats_book = summarize(verses, words[["book_name", "word"]], ["book_name"])
+    stats_book.insert(1, "chapter_count", verses.groupby("book_name", observed=True)["chapter_number"].max())
+    stats_book = stats_book.reset_index()
+
+    if sentiment is None and os.path.exists(SENTIMENT_BY_BOOK_CSV):
+        sentiment_by_book = pd.read_csv(SENTIMENT_BY_BOOK_CSV).set_index("Book")["Average Sentiment"]
+        stats_book["mean_sentiment"] = stats_book["book_name"].astype(str).map(sentiment_by_book)
+
+    columns = ["verse_count", "word_count", "unique_words", "mean_sentiment"]
+    stats_book = stats_book[["book_name", "chapter_count"] + columns]
+    stats_chapter = stats_chapter[["book_name", "chapter_number"] + columns]
+
+    stats_book.to_csv(book_path, index=False)
+    stats_chapter.to_csv(chapter_path, index=False)
+    return stats_book, stats_chapter
+
+
+# ----------------------
+# Loading Function
+# ----------------------
+
+def read_stats_book(path=KJV_STATS_BOOK_CSV):
+    if not os.path.exists(path):
+        build_corpus_stats(book_path=path)
+    return pd.read_csv(path)
+
+
+def read_stats_chapter(path=KJV_STATS_CHAPTER_CSV):
+    if not os.path.exists(path):
+        build_corpus_stats(chapter_path=path)
+    return pd.read_csv(path)
+
+
+if __name__ == "__main__":
+    build_corpus_stats()
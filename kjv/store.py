@@ -0,0 +1,77 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from kjv.books import KJV_BOOKS
+from kjv.ranges import is_canonical, sort_canonical
+
+
+# ----------------------
+# Paths
+# ----------------------
+
+KJV_CLEAN_CSV = os.path.join("data", "kjv_clean.csv")
+KJV_CLEAN_FEATHER = os.path.join("data", "kjv_clean.feather")
+
+TEXT_COLUMNS = ["verse_text"]
+
+
+# ----------------------
+# Build Function
+# ----------------------
+
+def build_kjv_clean(csv_path=KJV_CLEAN_CSV, feather_path=KJV_CLEAN_FEATHER):
+    """
+    Convert the verse CSV into an uncompressed Feather (Arrow IPC) file:
+      - book_name becomes an ordered categorical in canonical KJV order
+      - other label columns (testament_name, ...) become categoricals
+      - integer columns are downcast to the smallest integer type
+      - verse_text stays a plain Arrow string column
+      - rows are sorted in canonical order (book, chapter, verse), so kjv.ranges can slice books and chapters
+    Uncompressed Feather can be memory-mapped by read_kjv_clean.
+    """
+    df = pd.read_csv(csv_path)
+
+    for col in df.columns:
+        if col in TEXT_COLUMNS:
+            df[col] = df[col].astype("string")
+        elif pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+        elif col == "book_name":
+            df[col] = pd.Categorical(df[col], categories=KJV_BOOKS, ordered=True)
+        elif not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype("category")
+    df = sort_canonical(df)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    feather.write_feather(table, feather_path, compression="uncompressed")
+    return feather_path
+
+
+# ----------------------
+# Loading Function
+# ----------------------
+
+def _types_mapper(arrow_type):
+    if arrow_type in (pa.string(), pa.large_string()):
+        return pd.StringDtype("pyarrow")
+    return None
+
+
+def read_kjv_clean(path=KJV_CLEAN_FEATHER):
+    if not os.path.exists(path):
+        build_kjv_clean(feather_path=path)
+
+    table = feather.read_table(path, memory_map=True)
+    df = table.to_pandas(types_mapper=_types_mapper, split_blocks=True)
+    if not is_canonical(df):
+        # Built before the store was sorted: rebuild it once
+        build_kjv_clean(feather_path=path)
+        return read_kjv_clean(path)
+    return df
+
+
+if __name__ == "__main__":
+    print(build_kjv_clean())
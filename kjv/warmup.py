@@ -0,0 +1,38 @@
+import importlib
+import os
+import threading
+
+
+# ----------------------
+# Settings
+# ----------------------
+
+# Set KJV_WARMUP=1 to import the page-scoped libraries in the background right after startup
+KJV_WARMUP = "KJV_WARMUP"
+
+WARMUP_MODULES = ("pydeck", "PIL.Image", "wordcloud")
+
+
+# ----------------------
+# Warm-up
+# ----------------------
+
+def _import_all(modules):
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+
+def warm_up(modules=WARMUP_MODULES):
+    """
+    Import modules in a daemon thread when KJV_WARMUP is set, so the first visit to a page that
+    needs one finds it in sys.modules (a page that gets there first just waits on the import lock).
+    Returns the started thread, or None when warm-up is off.
+    """
+    if os.environ.get(KJV_WARMUP, "").lower() not in ("1", "true", "yes"):
+        return None
+    thread = threading.Thread(target=_import_all, args=(tuple(modules),), name="kjv-warmup", daemon=True)
+    thread.start()
+    return thread
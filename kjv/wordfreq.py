@@ -0,0 +1,124 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from kjv.books import KJV_BOOKS
+from kjv.pos import POS_TAGS, read_pos_index
+
+
+# ----------------------
+# Paths
+# ----------------------
+
+KJV_WORDFREQ_FEATHER = os.path.join("data", "kjv_wordfreq.feather")
+
+ALL_POS = "ALL"
+
+
+# ----------------------
+# Build Function
+# ----------------------
+
+def normalize_counts(counts, keep_symbols=False):
+    """
+    Apply the same clean-up WordCloud(collocations=False).process_text does before counting:
+    strip trailing 's, drop numbers and STOPWORDS, merge plurals into their singular (a plural
+    counts towards its spelling without the "s") and case variants, labelled with the most
+    frequent spelling. Punctuation and symbols are kept for the PUNCT / SYM clouds.
+    Bigram collocations are not counted: they need the running text, and the counts here
+    come from the token table (for a POS cloud they paired up words that were never adjacent).
+    """
+    counts = counts.copy()
+    if not keep_symbols:
+        counts["word"] = counts["word"].str.replace(r"'s$", "", regex=True, case=False)
+        counts = counts[counts["word"].str.fullmatch(r"\w[\w']*") & ~counts["word"].str.isdigit()]
+
+    from wordcloud import STOPWORDS
+
+    stopwords = {word.lower() for word in STOPWORDS}
+    counts = counts.assign(key=counts["word"].str.lower())
+    counts = counts[~counts["key"].isin(stopwords)]
+
+    singular = counts["key"].str[:-1]
+    is_plural = counts["key"].str.endswith("s") & ~counts["key"].str.endswith("ss")
+    known = pd.MultiIndex.from_frame(counts[["book", "key"]])
+    has_singular = pd.MultiIndex.from_arrays([counts["book"], singular]).isin(known)
+    plural = is_plural & has_singular
+    counts.loc[plural, "key"] = singular[plural]
+    counts.loc[plural, "word"] = counts.loc[plural, "word"].str[:-1]
+
+    # On a tie the singular's own spellings win over those of its plurals, as in process_tokens
+    spellings = counts.assign(from_plural=plural).groupby(["book", "key", "word"], sort=False).agg(
+        count=("count", "sum"), from_plural=("from_plural", "min"),
+    ).reset_index()
+    spellings = spellings.sort_values(["count", "from_plural"], ascending=[False, True], kind="stable")
+    labels = spellings.drop_duplicates(["book", "key"]).set_index(["book", "key"])["word"]
+    totals = counts.groupby(["book", "key"])["count"].sum()
+    return pd.DataFrame({
+        "book": totals.index.get_level_values("book"),
+        "word": labels.reindex(totals.index).to_numpy(),
+        "count": totals.to_numpy(),
+    })
+
+
+def build_word_frequencies(index=None, out_path=KJV_WORDFREQ_FEATHER):
+    """
+    Count every (book, POS) combination of the POS index once, with STOPWORDS already removed,
+    and store the result as a long (book, pos, word, count) Feather table.
+    """
+    if index is None:
+        index = read_pos_index()
+
+    verse_book = np.repeat(np.arange(len(KJV_BOOKS)), np.diff(index.book_verse_offsets))
+    token_book = verse_book[index.verse_ids].astype(np.int64)
+    token_ids = np.asarray(index.token_ids, dtype=np.int64)
+    n_vocab = len(index.vocab)
+
+    frames = []
+    for pos_tag in [None] + POS_TAGS:
+        mask = np.ones(len(token_ids), dtype=bool) if pos_tag is None else np.asarray(index.pos_ids) == POS_TAGS.index(pos_tag)
+        keys, counts = np.unique(token_book[mask] * n_vocab + token_ids[mask], return_counts=True)
+        frame = pd.DataFrame({
+            "book": keys // n_vocab,
+            "word": index.vocab[keys % n_vocab],
+            "count": counts,
+        })
+        frame = normalize_counts(frame, keep_symbols=pos_tag in ("PUNCT", "SYM"))
+        frame["pos"] = pos_tag or ALL_POS
+        frames.append(frame)
+
+    df = pd.concat(frames, ignore_index=True)
+    df = pd.DataFrame({
+        "book_name": pd.Categorical.from_codes(df["book"], categories=KJV_BOOKS),
+        "pos": df["pos"].astype("category"),
+        "word": df["word"].astype("string"),
+        "count": df["count"].astype(np.int32),
+    })
+    feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), out_path)
+    return out_path
+
+
+# ----------------------
+# Loading Function
+# ----------------------
+
+def read_word_frequencies(path=KJV_WORDFREQ_FEATHER):
+    """
+    {(book_name, pos_tag): {word: count}}, with pos_tag None for all parts of speech.
+    """
+    if not os.path.exists(path):
+        build_word_frequencies(out_path=path)
+
+    df = feather.read_feather(path)
+    frequencies = {}
+    for (book_name, pos), group in df.groupby(["book_name", "pos"], observed=True, sort=False):
+        key = (book_name, None if pos == ALL_POS else pos)
+        frequencies[key] = dict(zip(group["word"], group["count"].tolist()))
+    return frequencies
+
+
+if __name__ == "__main__":
+    print(build_word_frequencies())
@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+
+from kjv.cr_matrix import build_cr_matrices, read_cr_matrices
+from kjv.store import build_kjv_clean, read_kjv_clean
+
+
+# A few verses of three books, deliberately out of canonical order
+VERSES = [
+    ("New Testament", 40, "Matthew", 1, 1, "The book of the generation of Jesus Christ, the son of David."),
+    ("Old Testament", 1, "Genesis", 2, 1, "Thus the heavens and the earth were finished."),
+    ("Old Testament", 1, "Genesis", 1, 2, "And the earth was without form, and void."),
+    ("Old Testament", 1, "Genesis", 1, 1, "In the beginning God created the heaven and the earth."),
+    ("Old Testament", 2, "Exodus", 1, 1, "Now these are the names of the children of Israel."),
+    ("Old Testament", 1, "Genesis", 2, 2, "And on the seventh day God ended his work."),
+    ("New Testament", 40, "Matthew", 1, 2, "Abraham begat Isaac; and Isaac begat Jacob."),
+]
+
+
+@pytest.fixture
+def verses_csv(tmp_path):
+    path = tmp_path / "kjv_clean.csv"
+    pd.DataFrame(VERSES, columns=[
+        "testament_name", "book_number", "book_name", "chapter_number", "verse_number", "verse_text",
+    ]).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def verses(verses_csv, tmp_path):
+    feather_path = str(tmp_path / "kjv_clean.feather")
+    build_kjv_clean(csv_path=verses_csv, feather_path=feather_path)
+    return read_kjv_clean(feather_path)
+
+
+# Single-verse cross-references (source book, chapter, verse, target book, chapter, verse)
+CR_LINKS = [
+    ("Genesis", 1, 1, "John", 1, 1),
+    ("Genesis", 1, 1, "John", 1, 2),
+    ("Genesis", 1, 2, "John", 1, 3),
+    ("Genesis", 2, 1, "Exodus", 20, 11),
+    ("Exodus", 20, 11, "Genesis", 2, 2),
+    ("Psalms", 23, 1, "John", 10, 11),
+    ("Psalms", 23, 1, "Psalms", 80, 1),
+    ("John", 1, 1, "Genesis", 1, 1),
+    ("John", 10, 11, "Psalms", 23, 1),
+]
+
+
+@pytest.fixture
+def cr_csv(tmp_path):
+    rows = []
+    for source_book, source_chapter, source_verse, target_book, target_chapter, target_verse in CR_LINKS:
+        rows.append({
+            "book_name_source_min": source_book, "chapter_number_source_min": source_chapter, "verse_number_source_min": source_verse,
+            "book_name_target_min": target_book, "chapter_number_target_min": target_chapter, "verse_number_target_min": target_verse,
+        })
+    # A link to a verse range, which the matrices leave out
+    rows.append({
+        "book_name_source_min": "Genesis", "chapter_number_source_min": 1, "verse_number_source_min": 1,
+        "book_name_target_min": "Proverbs", "chapter_number_target_min": 8, "verse_number_target_min": 22,
+        "book_name_target_max": "Proverbs", "chapter_number_target_max": 8, "verse_number_target_max": 30,
+    })
+    path = tmp_path / "kjv_cr.csv"
+    pd.DataFrame(rows, columns=[
+        f"{column}_{side}_{end}"
+        for side in ("source", "target")
+        for end in ("min", "max")
+        for column in ("book_name", "chapter_number", "verse_number")
+    ]).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def cr_matrices(cr_csv, tmp_path):
+    out_dir = str(tmp_path / "kjv_cr_matrix")
+    build_cr_matrices(path=cr_csv, out_dir=out_dir)
+    return read_cr_matrices(out_dir)
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from kjv import cloud
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    # Stand-in renderer: the PNG bytes spell out what was drawn
+    calls = []
+
+    def render(frequencies, mask, bg="White"):
+        calls.append((dict(frequencies), mask, bg))
+        return repr(sorted(frequencies.items())).encode("utf-8")
+
+    monkeypatch.setattr(cloud, "render_word_cloud", render)
+    return calls
+
+
+def test_pick_mask_is_stable():
+    assert cloud.pick_mask("Genesis", "NOUN") == cloud.pick_mask("Genesis", "NOUN")
+    assert cloud.pick_mask("Genesis", "NOUN") in cloud.WORDCLOUD_MASKS
+
+
+def test_memory_and_disk_hits(tmp_path, renders):
+    frequencies = {("Genesis", None): {"God": 3, "earth": 2}}
+    first = cloud.WordCloudCache(frequencies, cache_dir=str(tmp_path))
+    png = first.get("Genesis", mask=1)
+    assert first.get("Genesis", mask=1) == png
+    assert len(renders) == 1
+
+    second = cloud.WordCloudCache(frequencies, cache_dir=str(tmp_path))
+    assert second.get("Genesis", mask=1) == png
+    assert len(renders) == 1
+
+
+def test_rebuilt_frequencies_render_afresh(tmp_path, renders):
+    cloud.WordCloudCache({("Genesis", None): {"God": 3, "earth": 2}}, cache_dir=str(tmp_path)).get("Genesis", mask=1)
+
+    rebuilt = cloud.WordCloudCache({("Genesis", None): {"God": 3, "heaven": 2}}, cache_dir=str(tmp_path))
+    png = rebuilt.get("Genesis", mask=1)
+    assert b"heaven" in png
+    assert len(renders) == 2
+
+    # Same counts in another order are the same table
+    reordered = cloud.WordCloudCache({("Genesis", None): {"heaven": 2, "God": 3}}, cache_dir=str(tmp_path))
+    assert reordered.get("Genesis", mask=1) == png
+    assert len(renders) == 2
+
+
+def test_changed_mask_renders_afresh(tmp_path, renders, monkeypatch):
+    frequencies = {("Genesis", None): {"God": 3}}
+    cloud.WordCloudCache(frequencies, cache_dir=str(tmp_path)).get("Genesis", mask=1)
+
+    monkeypatch.setattr(cloud, "mask_digest", lambda number: "redrawn")
+    cloud.WordCloudCache(frequencies, cache_dir=str(tmp_path)).get("Genesis", mask=1)
+    assert len(renders) == 2
+
+
+def test_missing_words(tmp_path, renders):
+    cache = cloud.WordCloudCache({("Genesis", None): {"God": 3}}, cache_dir=str(tmp_path))
+    assert cache.get("Genesis", "INTJ", mask=1) is None
+    assert renders == []
+
+
+def test_memory_budget_evicts_oldest(renders):
+    frequencies = {(book, None): {book: 1} for book in ["Genesis", "Exodus", "Leviticus"]}
+    cache = cloud.WordCloudCache(frequencies, max_bytes=30)
+    for book in ["Genesis", "Exodus", "Leviticus"]:
+        cache.get(book, mask=1)
+    cache.get("Genesis", mask=1)
+    assert len(renders) == 4
+
+
+def _remove_bg_per_pixel(wordcloud_image):
+    # The per-pixel loop remove_bg replaced
+    img = wordcloud_image.convert("RGBA")
+    new_data = []
+    for item in (img.getpixel((x, y)) for y in range(img.height) for x in range(img.width)):
+        if item[0] == 255 and item[1] == 255 and item[2] == 255:
+            new_data.append((255, 255, 255, 0))
+        else:
+            new_data.append(item)
+    img.putdata(new_data)
+    return img
+
+
+@pytest.mark.parametrize("mode", ["RGBA", "RGB"])
+def test_remove_bg_matches_per_pixel_loop(mode):
+    pixels = np.random.default_rng(0).integers(0, 256, size=(12, 16, 4), dtype=np.uint8)
+    pixels[::3, :, :3] = 255
+    pixels[:, ::4, :2] = 255
+    image = Image.fromarray(pixels, "RGBA").convert(mode)
+
+    expected = np.asarray(_remove_bg_per_pixel(image))
+    actual = np.asarray(cloud.remove_bg(image))
+    assert (expected[:, :, 3] == 0).any() and (expected[:, :, 3] > 0).any()
+    np.testing.assert_array_equal(actual, expected)
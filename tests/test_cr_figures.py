@@ -0,0 +1,177 @@
+import numpy as np
+
+from kjv.books import KJV_BOOKS, OLD_TESTAMENT
+from kjv.cr_figures import (
+    CHORD_WIDTHS, PASTEL, chord_figure, chord_links, chord_paths, heatmap_counts, heatmap_figure,
+    network_edges, network_figure, normalize_heatmap_counts, sankey_figure, sankey_links, select_books,
+)
+
+
+COUNTS = np.array([[1, 3], [0, 0], [2, 2]])
+
+
+def test_normalize_heatmap_counts():
+    assert normalize_heatmap_counts(COUNTS) is COUNTS
+    np.testing.assert_allclose(normalize_heatmap_counts(COUNTS, "source"), [[25, 75], [0, 0], [50, 50]])
+    np.testing.assert_allclose(normalize_heatmap_counts(COUNTS, "target"), [[100 / 3, 60], [0, 0], [200 / 3, 40]])
+
+
+def test_heatmap_book_counts(cr_matrices):
+    sources, targets = select_books("Old Testament"), select_books("New Testament")
+    counts, source_labels, target_labels = heatmap_counts(cr_matrices, sources, targets)
+    assert counts.shape == (len(sources), len(targets))
+    assert counts[source_labels.index("Genesis"), target_labels.index("John")] == 3
+    assert counts.sum() == 4
+
+
+def test_heatmap_chapter_counts_sum_to_book_counts(cr_matrices):
+    sources, targets = select_books(), select_books()
+    books, _, _ = heatmap_counts(cr_matrices, sources, targets)
+    chapters, source_labels, target_labels = heatmap_counts(cr_matrices, sources, targets, level="chapter")
+
+    # Only the chapters that take part in a link, in canonical order
+    assert source_labels == target_labels == ["Genesis 1", "Genesis 2", "Exodus 20", "Psalms 23", "Psalms 80", "John 1", "John 10"]
+    assert chapters[source_labels.index("Genesis 1"), target_labels.index("John 1")] == 3
+
+    book_of = np.array([KJV_BOOKS.index(label.rsplit(" ", 1)[0]) for label in source_labels])
+    summed = np.zeros_like(books)
+    np.add.at(summed, (book_of[:, None], book_of[None, :]), chapters)
+    assert (summed == books).all()
+
+
+def test_heatmap_chapter_counts_of_selected_books(cr_matrices):
+    genesis, john = KJV_BOOKS.index("Genesis"), KJV_BOOKS.index("John")
+    counts, source_labels, target_labels = heatmap_counts(cr_matrices, [genesis], [john], level="chapter")
+    assert source_labels == ["Genesis 1", "Genesis 2"] and target_labels == ["John 1", "John 10"]
+    assert counts.tolist() == [[3, 0], [0, 0]]
+
+    heatmap = heatmap_figure(cr_matrices, [genesis], [john], level="chapter").data[0]
+    # Sources on the x axis
+    assert list(heatmap.x) == source_labels
+    assert np.asarray(heatmap.z).tolist() == [[3, 0], [0, 0]]
+
+
+def test_select_books():
+    assert select_books().tolist() == list(range(len(KJV_BOOKS)))
+    assert [KJV_BOOKS[b] for b in select_books("New Testament")][:2] == ["Matthew", "Mark"]
+    assert len(select_books("Old Testament")) + len(select_books("New Testament")) == len(KJV_BOOKS)
+
+
+def test_chord_links():
+    books = np.zeros((4, 4), dtype=np.int64)
+    books[0, 1], books[2, 3], books[3, 0], books[1, 1] = 120, 40, 60, 5
+    sources, targets, links = chord_links(books)
+    assert list(zip(sources, targets, links)) == [(0, 1, 120), (3, 0, 60), (2, 3, 40), (1, 1, 5)]
+
+    sources, targets, links = chord_links(books, min_links=50)
+    assert links.tolist() == [120, 60]
+    assert chord_links(books, top_k=2, min_links=10)[2].tolist() == [120, 60]
+    assert chord_links(books, min_links=0)[2].tolist() == [120, 60, 40, 5]
+
+
+def test_chord_paths():
+    start, end = np.array([1.0, -1.0]), np.array([0.0, 1.0])
+    path = chord_paths(start, end, points=5)
+    assert path.dtype == np.float32 and len(path) == 2 * (5 + 1)
+    rows = path.reshape(2, 6)
+    assert np.isnan(rows[:, -1]).all()
+    np.testing.assert_allclose(rows[:, 0], start)
+    np.testing.assert_allclose(rows[:, -2], end)
+    # Through the origin: the midpoint of a quadratic Bézier with control point 0
+    np.testing.assert_allclose(chord_paths(np.array([1.0]), np.array([-1.0]), points=3)[1], 0, atol=1e-7)
+
+
+def test_chord_figure(cr_matrices):
+    fig = chord_figure(cr_matrices, min_links=1, points=5)
+    chords, nodes = fig.data[:-1], fig.data[-1]
+    assert len(nodes.x) == len(KJV_BOOKS)
+    # One trace per (color, width) bucket, one NaN-terminated path of 6 values per chord
+    assert len(chords) <= len(PASTEL) * len(CHORD_WIDTHS)
+    n_chords = sum(int(np.isnan(np.asarray(trace.x, dtype=float)).sum()) for trace in chords)
+    assert n_chords == np.count_nonzero(cr_matrices.book_matrix)
+    assert sum(len(trace.x) for trace in chords) == n_chords * 6
+
+    # The default leaves out the thin chords: none of the test links reaches CHORD_MIN_LINKS
+    assert len(chord_figure(cr_matrices).data) == 1
+    assert len(chord_figure(cr_matrices, min_links=2, points=5).data) == 1 + 1
+
+
+def _random_books(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 5, (len(KJV_BOOKS), len(KJV_BOOKS))) * rng.integers(0, 2, (len(KJV_BOOKS), len(KJV_BOOKS)))
+
+
+def test_sankey_links_sum_to_the_matrix():
+    books = _random_books()
+    n_old = len(OLD_TESTAMENT)
+    sources, targets, links = sankey_links(books)
+    assert links.sum() == books[:n_old, n_old:].sum()
+    assert (sources < n_old).all() and (targets >= n_old).all()
+    assert (books[sources, targets] == links).all()
+
+    sources, targets, links = sankey_links(books, source="New Testament")
+    assert links.sum() == books[n_old:, :n_old].sum()
+
+    source_books, target_books = ["Genesis", "Isaiah", "Psalms"], ["Matthew", "Hebrews"]
+    codes = [KJV_BOOKS.index(b) for b in source_books], [KJV_BOOKS.index(b) for b in target_books]
+    sources, targets, links = sankey_links(books, source_books=source_books, target_books=target_books)
+    assert links.sum() == books[np.ix_(*codes)].sum()
+    assert set(sources) <= set(codes[0]) and set(targets) <= set(codes[1])
+
+
+def test_sankey_min_links():
+    books = _random_books()
+    n_old = len(OLD_TESTAMENT)
+    links = sankey_links(books, min_links=3)[2]
+    block = books[:n_old, n_old:]
+    assert sorted(links.tolist()) == sorted(block[block >= 3].tolist())
+    # Below 1 only drops the empty cells
+    assert len(sankey_links(books, min_links=0)[2]) == np.count_nonzero(block)
+
+
+def test_sankey_figure(cr_matrices):
+    sankey = sankey_figure(cr_matrices).data[0]
+    # Genesis and Psalms into John
+    assert list(sankey.node.label) == ["Genesis", "Psalms", "John"]
+    assert list(sankey.link.source) == [0, 1] and list(sankey.link.target) == [2, 2]
+    assert list(sankey.link.value) == [3, 1]
+
+    sankey = sankey_figure(cr_matrices, source="New Testament").data[0]
+    assert list(sankey.node.label) == ["John", "Genesis", "Psalms"]
+    assert sum(sankey.link.value) == 2
+
+    assert list(sankey_figure(cr_matrices, min_links=2).data[0].node.label) == ["Genesis", "John"]
+    assert len(sankey_figure(cr_matrices, min_links=10).data[0].node.label) == 0
+
+
+def test_network_edges():
+    books = _random_books(1)
+    a, b, links = network_edges(books)
+    pairs = np.triu(books + books.T, k=1)
+    assert (a < b).all()
+    assert len(links) == np.count_nonzero(pairs)
+    assert links.sum() == pairs.sum() == books.sum() - np.trace(books)
+
+    a, b, links = network_edges(books, min_links=5)
+    assert (links >= 5).all() and len(links) == (pairs >= 5).sum()
+    assert (pairs[a, b] == links).all()
+
+
+def _edge_count(trace):
+    return int(np.isnan(np.asarray(trace.x, dtype=float)).sum())
+
+
+def test_network_figure(cr_matrices):
+    fig = network_figure(cr_matrices)
+    edges = [trace for trace in fig.data if trace.mode == "lines"]
+    nodes = [trace for trace in fig.data if trace.mode == "markers+text"]
+    assert sum(len(trace.x) for trace in nodes) == len(KJV_BOOKS)
+    assert [len(trace.x) for trace in nodes] == [len(OLD_TESTAMENT), len(KJV_BOOKS) - len(OLD_TESTAMENT)]
+
+    # Genesis-John (3 + 1), Genesis-Exodus (1 + 1), Psalms-John (1 + 1); Psalms -> Psalms is a loop
+    assert sum(_edge_count(trace) for trace in edges) == 3
+    assert sum(_edge_count(trace) for trace in network_figure(cr_matrices, min_links=3).data if trace.mode == "lines") == 1
+    assert all(trace.mode != "lines" for trace in network_figure(cr_matrices, min_links=5).data)
+
+    genesis = KJV_BOOKS.index("Genesis")
+    assert nodes[0].hovertext[genesis] == "Genesis (Incoming References: 2 | Outgoing References: 4)"
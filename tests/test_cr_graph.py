@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+from kjv.cr_graph import build_cr_graph, edge_table, expand, expansion_paths, neighbors, read_cr_graph, rollup
+from kjv.ranges import book_ranges
+
+
+# Verse IDs of the conftest store: Genesis 1:1, 1:2, 2:1, 2:2 are 0-3, Exodus 1:1 is 4, Matthew 1:1, 1:2 are 5-6
+LINKS = [
+    ("Gen.1.1", "Matt.1.1-Matt.1.2", 10),
+    ("Gen.1.1", "Matt.1.1", 25),
+    ("Gen.2.1", "Gen.1.1", -3),
+    ("Exod.1.1", "Gen.1.1", 4),
+    ("Gen.1.2", "Rev.1.1", 7),
+    ("Matt.1.2", "Exod.1.1", 2),
+]
+
+
+@pytest.fixture
+def graph(verses, tmp_path):
+    path = tmp_path / "cross_references.txt"
+    pd.DataFrame(LINKS, columns=["From Verse", "To Verse", "Votes"]).to_csv(path, sep="\t", index=False)
+    out_dir = str(tmp_path / "kjv_cr_graph")
+    build_cr_graph(verses, path=str(path), out_dir=out_dir)
+    return read_cr_graph(out_dir)
+
+
+def _pairs(edges):
+    return edges[["verse_id", "neighbor_id", "votes"]].values.tolist()
+
+
+def test_csr_adjacency(graph):
+    assert graph.out_offsets.tolist() == [0, 2, 2, 3, 3, 4, 4, 5]
+    assert graph.out_targets.tolist() == [5, 6, 0, 0, 4]
+    assert graph.in_offsets[-1] == len(graph.in_sources) == 5
+
+
+def test_ranges_expand_and_duplicates_keep_the_highest_vote(graph):
+    # Gen.1.1 -> Matt.1.1-2 is two edges; the 25-vote link wins over the 10-vote one for Matt.1.1
+    assert _pairs(neighbors(graph, [0])) == [[0, 5, 25], [0, 6, 10]]
+
+
+def test_directions(graph):
+    assert _pairs(neighbors(graph, [0], direction="in")) == [[0, 2, -3], [0, 4, 4]]
+    both = neighbors(graph, [0], direction="both")
+    assert both["direction"].tolist() == ["out", "out", "in", "in"]
+    with pytest.raises(ValueError):
+        neighbors(graph, [0], direction="sideways")
+
+
+def test_no_vote_filter_by_default(graph):
+    # Links can have negative votes
+    assert -3 in neighbors(graph, [0], direction="in")["votes"].tolist()
+    assert _pairs(neighbors(graph, [0], direction="in", min_votes=0)) == [[0, 4, 4]]
+
+
+def test_passages_match_single_verses(graph):
+    for verse_ids in [range(0, 7), [0, 4, 6], []]:
+        expected = [pair for v in verse_ids for pair in _pairs(neighbors(graph, [v], direction="both"))]
+        assert sorted(_pairs(neighbors(graph, verse_ids, direction="both"))) == sorted(expected)
+
+
+def test_expand(graph, verses):
+    related = expand(graph, [0], hops=3, direction="out")
+    assert related[["verse_id", "hop", "score", "parent_id", "path_votes"]].values.tolist() == [
+        [5, 1, 25, 0, 25], [6, 1, 10, 0, 10], [4, 2, 2, 6, 12],
+    ]
+    assert expansion_paths(related, verses)[-1] == "Genesis 1:1 → Matthew 1:2 → Exodus 1:1"
+
+    # Only the best verse of each hop goes on, and Matthew 1:1 references nothing
+    assert expand(graph, [0], hops=3, top_k=1, direction="out")["verse_id"].tolist() == [5]
+    assert expand(graph, [3], hops=2).empty
+
+
+def test_rollup_and_edge_table(graph, verses):
+    edges = neighbors(graph, [0], direction="both")
+    books = rollup(edges, book_ranges(verses), level="book")
+    assert books.values.tolist() == [["Matthew", 2, 35], ["Exodus", 1, 4], ["Genesis", 1, -3]]
+
+    chapters = rollup(edges, book_ranges(verses), level="chapter")
+    assert chapters[["book_name", "chapter_number", "references"]].values.tolist()[0] == ["Matthew", 1, 2]
+
+    table = edge_table(edges, verses, limit=2)
+    assert table["reference"].tolist() == ["Matthew 1:1", "Matthew 1:2"]
+    assert table["votes"].tolist() == [25, 10]
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from kjv.books import KJV_BOOKS
+from kjv import cr_matrix
+from kjv.cr_matrix import book_dict, book_totals, cross_testament_pairs, force_layout, read_cr_links
+
+
+GENESIS, EXODUS, PSALMS, JOHN = (KJV_BOOKS.index(b) for b in ["Genesis", "Exodus", "Psalms", "John"])
+
+
+def test_read_cr_links_drops_ranges(cr_csv):
+    links = read_cr_links(cr_csv)
+    assert len(links) == 9
+    assert "Proverbs" not in set(links["book_name_target"])
+
+
+def test_book_matrix(cr_matrices):
+    books = np.asarray(cr_matrices.book_matrix)
+    assert books[GENESIS, JOHN] == 3
+    assert books[GENESIS, EXODUS] == books[EXODUS, GENESIS] == 1
+    assert books[PSALMS, PSALMS] == 1
+    assert books[JOHN, GENESIS] == books[JOHN, PSALMS] == books[PSALMS, JOHN] == 1
+    assert books.sum() == 9
+    assert book_dict(books) == {
+        "Genesis": {"Exodus": 1, "John": 3},
+        "Exodus": {"Genesis": 1},
+        "Psalms": {"Psalms": 1, "John": 1},
+        "John": {"Genesis": 1, "Psalms": 1},
+    }
+
+
+def test_testament_matrix(cr_matrices):
+    # [Old, New] x [Old, New]
+    assert np.asarray(cr_matrices.testament_matrix).tolist() == [[3, 4], [2, 0]]
+    assert cr_matrix.testament_matrix(np.asarray(cr_matrices.book_matrix)).tolist() == [[3, 4], [2, 0]]
+
+
+def test_cross_testament_pairs_and_totals(cr_matrices):
+    books = np.asarray(cr_matrices.book_matrix)
+    assert cross_testament_pairs(books) == {("Genesis", "John"): 3, ("Psalms", "John"): 1}
+    assert cross_testament_pairs(books, "New Testament") == {("John", "Genesis"): 1, ("John", "Psalms"): 1}
+    outgoing, incoming = book_totals(books)
+    assert (outgoing[GENESIS], incoming[GENESIS]) == (4, 2)
+    assert (outgoing[JOHN], incoming[JOHN]) == (2, 4)
+
+
+def test_chapter_links(cr_matrices):
+    labels = list(zip(cr_matrices.chapter_book.tolist(), cr_matrices.chapter_number.tolist()))
+    assert labels == [(GENESIS, 1), (GENESIS, 2), (EXODUS, 20), (PSALMS, 23), (PSALMS, 80), (JOHN, 1), (JOHN, 10)]
+
+    pairs = {
+        (labels[s], labels[t]): c
+        for s, t, c in zip(cr_matrices.chapter_sources, cr_matrices.chapter_targets, cr_matrices.chapter_counts)
+    }
+    assert pairs[(GENESIS, 1), (JOHN, 1)] == 3
+    assert pairs[(GENESIS, 2), (EXODUS, 20)] == 1
+    assert pairs[(JOHN, 10), (PSALMS, 23)] == 1
+
+
+def test_chapter_counts_sum_to_the_book_matrix(cr_matrices):
+    books = np.zeros((len(KJV_BOOKS), len(KJV_BOOKS)), dtype=np.int64)
+    chapter_book = np.asarray(cr_matrices.chapter_book, dtype=np.int64)
+    np.add.at(
+        books,
+        (chapter_book[cr_matrices.chapter_sources], chapter_book[cr_matrices.chapter_targets]),
+        cr_matrices.chapter_counts,
+    )
+    assert (books == cr_matrices.book_matrix).all()
+    assert cr_matrices.chapter_counts.sum() == cr_matrices.book_matrix.sum()
+
+
+def test_force_layout():
+    # Two pairs of strongly linked nodes, no links between the pairs
+    weights = np.array([
+        [0, 50, 0, 0],
+        [50, 0, 0, 0],
+        [0, 0, 0, 50],
+        [0, 0, 50, 0],
+    ])
+    positions = force_layout(weights, iterations=200)
+    assert positions.shape == (4, 2)
+    assert np.abs(positions).max() == pytest.approx(1)
+    np.testing.assert_allclose(positions.mean(axis=0), 0, atol=1e-12)
+
+    distance = np.linalg.norm(positions[:, None] - positions[None, :], axis=-1)
+    assert distance[0, 1] < distance[0, 2] and distance[2, 3] < distance[1, 3]
+    np.testing.assert_array_equal(force_layout(weights, iterations=200), positions)
+
+
+def test_book_layout(cr_matrices):
+    layout = np.asarray(cr_matrices.book_layout)
+    assert layout.shape == (len(KJV_BOOKS), 2)
+    assert np.isfinite(layout).all()
@@ -0,0 +1,45 @@
+import gzip
+import os
+
+import plotly.graph_objects as go
+
+from kjv.figures import data_version, encode_figure, figure_body, loads, version_etag
+
+
+def test_encode_figure():
+    body = encode_figure(b'{"data": []}')
+    assert gzip.decompress(body.gzip) == body.identity
+    assert body == encode_figure(b'{"data": []}')
+    assert encode_figure(b'{"data": []}', etag="v1").etag == "v1"
+
+
+def test_figure_body():
+    body = figure_body(go.Figure(go.Bar(x=[1, 2], y=[3, 4])), etag="v1")
+    assert loads(body.identity)["data"][0]["y"] == [3, 4]
+    assert body.etag == "v1"
+
+
+def test_data_version_follows_the_files(tmp_path):
+    csv, matrices = tmp_path / "stats.csv", tmp_path / "matrices"
+    csv.write_text("a\n1\n")
+    matrices.mkdir()
+    (matrices / "counts.npy").write_bytes(b"0")
+
+    version = data_version(str(csv), str(matrices))
+    assert data_version(str(csv), str(matrices)) == version
+
+    (matrices / "counts.npy").write_bytes(b"01")
+    assert data_version(str(csv), str(matrices)) != version
+
+    version = data_version(str(csv), str(matrices))
+    os.utime(csv, ns=(0, 0))
+    assert data_version(str(csv), str(matrices)) != version
+
+    assert data_version(str(tmp_path / "missing.csv")) != data_version(str(csv))
+
+
+def test_version_etag():
+    assert version_etag("cr_heatmap?a", "v1") == version_etag("cr_heatmap?a", "v1")
+    assert version_etag("cr_heatmap?a", "v1") != version_etag("cr_heatmap?b", "v1")
+    assert version_etag("cr_heatmap?a", "v1") != version_etag("cr_heatmap?a", "v2")
+
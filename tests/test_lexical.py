@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from kjv.lexical import (
+    build_token_index, lexical_richness, moving_average_ttr, read_token_index, sliding_ttr, type_token_ratio,
+    window_type_counts,
+)
+
+
+TOKENS = np.array([0, 1, 0, 2, 1, 1])
+
+
+def test_type_token_ratio():
+    np.testing.assert_allclose(type_token_ratio(TOKENS, np.array([0, 4, 6])), [3 / 4, 1 / 2])
+    np.testing.assert_allclose(type_token_ratio(TOKENS, np.array([0, 0, 6])), [0, 3 / 6])
+
+
+def test_window_type_counts():
+    counts, valid, _ = window_type_counts(TOKENS, np.array([0, 6]), 3)
+    assert counts[valid].tolist() == [2, 3, 3, 2]
+    assert valid.tolist() == [True, True, True, True, False, False]
+
+
+def test_mattr_on_a_known_sequence():
+    # Windows of 3: (0 1 0) (1 0 2) (0 2 1) (2 1 1) have 2, 3, 3, 2 types
+    np.testing.assert_allclose(moving_average_ttr(TOKENS, np.array([0, 6]), window=3), [10 / 12])
+
+
+def test_mattr_windows_stay_inside_segments():
+    # The second segment is shorter than the window and falls back to plain TTR
+    np.testing.assert_allclose(moving_average_ttr(TOKENS, np.array([0, 4, 6]), window=3), [5 / 6, 1 / 2])
+
+
+def test_mattr_matches_a_naive_loop():
+    rng = np.random.default_rng(0)
+    tokens = rng.integers(0, 20, 300)
+    offsets = np.array([0, 120, 121, 300])
+    window = 25
+
+    expected = []
+    for start, end in zip(offsets[:-1], offsets[1:]):
+        segment = tokens[start:end]
+        if len(segment) < window:
+            expected.append(len(set(segment)) / len(segment))
+        else:
+            expected.append(np.mean([len(set(segment[i:i + window])) / window for i in range(len(segment) - window + 1)]))
+    np.testing.assert_allclose(moving_average_ttr(tokens, offsets, window), expected)
+
+
+def test_sliding_ttr():
+    np.testing.assert_allclose(sliding_ttr(TOKENS, 1, 6, window=3), [1, 1, 2 / 3])
+    np.testing.assert_allclose(sliding_ttr(TOKENS, 0, 6, window=3, step=2), [2 / 3, 1])
+
+
+@pytest.fixture
+def token_index(verses, tmp_path):
+    path = str(tmp_path / "kjv_tokens")
+    build_token_index(verses, out_dir=path)
+    return read_token_index(path)
+
+
+def test_token_index_offsets(token_index):
+    assert token_index.chapter_number.tolist() == [1, 2, 1, 1]
+    # Genesis 1 has 10 + 8 whitespace tokens
+    assert token_index.chapter_offsets[:2].tolist() == [0, 18]
+    assert token_index.chapter_offsets[-1] == len(token_index.token_ids)
+
+
+def test_lexical_richness_levels(token_index):
+    books = lexical_richness(token_index, level="Book")
+    assert books["book_name"].tolist() == ["Genesis", "Exodus", "Matthew"]
+    assert books.set_index("book_name").loc["Exodus", "lexical_richness"] == pytest.approx(8 / 10)
+
+    chapters = lexical_richness(token_index, level="Chapter", metric="MATTR", window=5)
+    assert chapters[["book_name", "chapter_number"]].values.tolist() == [
+        ["Genesis", 1], ["Genesis", 2], ["Exodus", 1], ["Matthew", 1],
+    ]
+    assert chapters["lexical_richness"].between(0, 1).all()
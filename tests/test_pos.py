@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from kjv.pos import POS_TAGS, book_tokens, build_pos_index, read_pos_index
+
+
+class StubNlp:
+    """
+    Whitespace tokenizer standing in for spaCy: capitalized words are PROPN, ".,;" are PUNCT,
+    "and" is an unknown tag (stored as X), anything else is a NOUN. A trailing space token is skipped.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def _pos(self, word):
+        if word in ".,;":
+            return "PUNCT"
+        if word == "and":
+            return "CONJ"
+        return "PROPN" if word[0].isupper() else "NOUN"
+
+    def pipe(self, texts, batch_size, n_process):
+        self.calls.append((batch_size, n_process))
+        for text in texts:
+            tokens = [SimpleNamespace(text=word, pos_=self._pos(word), is_space=False) for word in text.split()]
+            yield tokens + [SimpleNamespace(text=" ", pos_="SPACE", is_space=True)]
+
+
+@pytest.fixture
+def pos_index(verses, tmp_path):
+    # Punctuation spaced out so the stub tokenizes it
+    verses = verses.assign(verse_text=verses["verse_text"].str.replace(r"([.,;])", r" \1", regex=True))
+    path = str(tmp_path / "kjv_pos")
+    build_pos_index(verses, nlp=StubNlp(), out_dir=path)
+    return read_pos_index(path)
+
+
+def test_pos_index_arrays(pos_index):
+    assert len(pos_index.verse_ids) == len(pos_index.token_ids) == len(pos_index.pos_ids)
+    # Verses in canonical order, tokens in reading order
+    assert (np.diff(pos_index.verse_ids) >= 0).all()
+    assert list(pos_index.vocab[pos_index.token_ids[:4]]) == ["In", "the", "beginning", "God"]
+    assert pos_index.book_verse_offsets[-1] == 7
+    assert " " not in set(pos_index.vocab)
+    assert POS_TAGS[pos_index.pos_ids[0]] == "PROPN"
+
+
+def test_book_tokens(pos_index):
+    exodus = book_tokens(pos_index, "Exodus")
+    assert list(exodus) == "Now these are the names of the children of Israel .".split()
+    assert list(book_tokens(pos_index, "Exodus", "PROPN")) == ["Now", "Israel"]
+    assert list(book_tokens(pos_index, "Genesis", "PUNCT")) == [".", ",", ".", ".", "."]
+    # Unknown tags are stored as X
+    assert set(book_tokens(pos_index, "Genesis", "X")) == {"and"}
+    assert len(book_tokens(pos_index, "Leviticus")) == 0
+
+
+def test_build_passes_the_pipe_settings(verses, tmp_path):
+    nlp = StubNlp()
+    build_pos_index(verses, nlp=nlp, n_process=2, batch_size=16, out_dir=str(tmp_path / "kjv_pos"))
+    assert nlp.calls == [(16, 2)]
+
+
+def test_missing_index_is_not_built_on_read(tmp_path):
+    with pytest.raises(FileNotFoundError, match="python -m kjv.pos"):
+        read_pos_index(str(tmp_path / "kjv_pos"))
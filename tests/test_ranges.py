@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kjv.books import KJV_BOOKS
+from kjv.ranges import (
+    book_range, book_ranges, book_slice, books_runs, books_slice, chapter_of, chapter_range, chapter_slice,
+    is_canonical, sort_canonical,
+)
+
+
+@pytest.fixture
+def ranges(verses):
+    return book_ranges(verses)
+
+
+def test_sort_canonical():
+    df = pd.DataFrame({
+        "book_name": ["Exodus", "Genesis", "Genesis", "Genesis"],
+        "chapter_number": [1, 10, 2, 2],
+        "verse_number": [1, 1, 3, 1],
+    })
+    assert not is_canonical(df)
+    df = sort_canonical(df)
+    assert is_canonical(df)
+    assert df[["chapter_number", "verse_number"]].values.tolist() == [[2, 1], [2, 3], [10, 1], [1, 1]]
+    assert df.index.tolist() == [0, 1, 2, 3]
+
+
+def test_offset_table(ranges):
+    genesis, exodus, matthew = (KJV_BOOKS.index(b) for b in ["Genesis", "Exodus", "Matthew"])
+    assert ranges.book_offsets[[genesis, exodus, matthew, matthew + 1]].tolist() == [0, 4, 5, 7]
+    assert ranges.book_offsets[-1] == 7
+    assert ranges.chapter_offsets.tolist() == [0, 2, 4, 5, 7]
+    assert ranges.chapter_book.tolist() == [genesis, genesis, exodus, matthew]
+    assert ranges.chapter_number.tolist() == [1, 2, 1, 1]
+
+
+def test_book_and_chapter_ranges(ranges):
+    assert book_range(ranges, "Genesis") == (0, 4)
+    assert book_range(ranges, "Leviticus") == (5, 5)
+    assert chapter_range(ranges, "Genesis", 2) == (2, 4)
+    assert chapter_range(ranges, "Matthew", 1) == (5, 7)
+    # Missing chapters are empty ranges
+    assert chapter_range(ranges, "Genesis", 3) == (0, 0)
+
+
+def test_chapter_of(ranges):
+    assert chapter_of(ranges, np.array([0, 1, 2, 3, 4, 5, 6])).tolist() == [0, 0, 1, 1, 2, 3, 3]
+
+
+def test_books_runs_merge_adjacent_books(ranges):
+    starts, ends = books_runs(ranges, ["Exodus", "Genesis"])
+    assert (starts.tolist(), ends.tolist()) == ([0], [5])
+
+    starts, ends = books_runs(ranges, ["Genesis", "Leviticus", "Matthew", "Unknown"])
+    assert (starts.tolist(), ends.tolist()) == ([0, 5], [4, 7])
+
+
+@pytest.mark.parametrize("books", [["Genesis"], ["Genesis", "Exodus"], ["Genesis", "Matthew"], ["Leviticus"], []])
+def test_slices_match_boolean_masks(verses, ranges, books):
+    expected = verses[verses["book_name"].isin(books)]
+    pd.testing.assert_frame_equal(books_slice(verses, ranges, books), expected)
+
+    for book in books:
+        pd.testing.assert_frame_equal(book_slice(verses, ranges, book), verses[verses["book_name"] == book])
+
+
+def test_chapter_slice_matches_mask(verses, ranges):
+    mask = (verses["book_name"] == "Genesis") & (verses["chapter_number"] == 2)
+    pd.testing.assert_frame_equal(chapter_slice(verses, ranges, "Genesis", 2), verses[mask])
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from kjv.books import KJV_BOOKS
+from kjv.refs import book_codes_of, expand_intervals, group_runs, parse_ref_lists, parse_refs, ref_texts, split_refs, verse_keys
+
+
+# Verse IDs of the conftest store: Genesis 1:1, 1:2, 2:1, 2:2 are 0-3, Exodus 1:1 is 4, Matthew 1:1, 1:2 are 5-6
+@pytest.fixture
+def keys(verses):
+    return verse_keys(verses)
+
+
+def test_book_codes_of():
+    codes = book_codes_of(["Genesis", "Gen", "Exod", "Ex", "2 Kgs", "2KGS", "Song of Solomon", "Sng", "Tobit"])
+    assert codes.tolist() == [KJV_BOOKS.index(b) for b in [
+        "Genesis", "Genesis", "Exodus", "Exodus", "2 Kings", "2 Kings", "Song of Solomon", "Song of Solomon",
+    ]] + [-1]
+
+
+def test_verse_keys_are_sorted(keys):
+    assert (np.diff(keys) > 0).all()
+
+
+@pytest.mark.parametrize("ref, expected", [
+    ("Gen.1.1", (0, 0)),
+    ("Gen 1:2", (1, 1)),
+    ("gen.2.1", (2, 2)),
+    ("Gen.1.2-Gen.2.2", (1, 3)),
+    # Abbreviated ends take the book and chapter from the start
+    ("Gen 1:1-2", (0, 1)),
+    ("Gen 1:2-2:1", (1, 2)),
+    ("Matt.1.1-2", (5, 6)),
+    ("Gen.1.1-Matt.1.2", (0, 6)),
+])
+def test_parse_refs(keys, ref, expected):
+    start_ids, end_ids = parse_refs([ref], keys)
+    assert (start_ids[0], end_ids[0]) == expected
+
+
+@pytest.mark.parametrize("ref", ["Gen.3.1", "Rev.1.1", "Exod.1.1-Gen.1.1", "Gen.1.1-Gen.1.9", "nonsense", None])
+def test_unresolved_refs(keys, ref):
+    start_ids, end_ids = parse_refs([ref], keys)
+    assert (start_ids[0], end_ids[0]) == (-1, -1)
+
+
+def test_split_refs():
+    parts = split_refs(["Eph.6.22-Eph.6.24", "2 Kgs 5:12", "Ps.23.1-6", "nonsense"])
+    assert parts["book_name_min"].tolist()[:3] == ["Ephesians", "2 Kings", "Psalms"]
+    assert parts.iloc[3].isna().all()
+    assert parts["verse_number_min"].tolist()[:3] == [22, 12, 1]
+    assert parts["book_name_max"].isna().tolist() == [False, True, False, True]
+    assert parts["book_name_max"].iloc[2] == "Psalms"
+    assert parts["chapter_number_max"].tolist()[2] == 23
+    assert parts["verse_number_max"].isna().tolist() == [False, True, False, True]
+
+
+def test_expand_intervals():
+    owner, verse_ids = expand_intervals([0, -1, 5], [2, -1, 6])
+    assert owner.tolist() == [0, 0, 0, 2, 2]
+    assert verse_ids.tolist() == [0, 1, 2, 5, 6]
+
+
+def test_parse_ref_lists_and_runs(keys):
+    lists = parse_ref_lists(["gen.1.1,gen.2.1-2,gen.1.1", "matt.1.2,exod.1.1,nonsense"], keys)
+    assert lists[["row", "verse_id"]].values.tolist() == [[0, 0], [0, 2], [0, 3], [1, 4], [1, 6]]
+    assert group_runs(lists["row"], lists["verse_id"]).tolist() == [0, 1, 1, 2, 3]
+
+
+def test_ref_texts(verses):
+    texts = ref_texts(["Matt 1:1-2", "Gen.3.1"], verses, sep=" | ")
+    assert texts.tolist() == [
+        "The book of the generation of Jesus Christ, the son of David. | Abraham begat Isaac; and Isaac begat Jacob.",
+        "",
+    ]
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kjv.books import KJV_BOOKS
+from kjv.search import BM25_B, BM25_K1, build_search_index, parse_query, read_search_index, search, tokenize
+
+
+def _index(df, tmp_path):
+    path = str(tmp_path / "kjv_search")
+    build_search_index(df, out_dir=path)
+    return read_search_index(path)
+
+
+@pytest.fixture
+def index(verses, tmp_path):
+    return _index(verses, tmp_path)
+
+
+@pytest.fixture
+def psalms(tmp_path):
+    texts = [
+        "light light and darkness",
+        "light and darkness and the deep and the waters",
+        "light and darkness",
+        "the waters",
+    ]
+    df = pd.DataFrame({
+        "book_name": pd.Categorical(["Psalms"] * len(texts), categories=KJV_BOOKS, ordered=True),
+        "chapter_number": [1] * len(texts),
+        "verse_number": np.arange(1, len(texts) + 1),
+        "verse_text": texts,
+    })
+    return _index(df, tmp_path)
+
+
+def test_tokenize_and_parse_query():
+    assert tokenize("Abraham begat Isaac; and Isaac's sons") == ["abraham", "begat", "isaac", "and", "isaac's", "sons"]
+    assert parse_query('"the heaven and" earth God') == ([["the", "heaven", "and"]], ["earth", "god"])
+
+
+def test_bm25_ordering(psalms):
+    hits, total = search(psalms, "light")
+    assert total == 3
+    # More occurrences first, then the shorter of two verses with one occurrence
+    assert hits["verse_number"].tolist() == [1, 3, 2]
+    assert hits["score"].is_monotonic_decreasing
+
+
+def test_bm25_score(psalms):
+    hits, _ = search(psalms, "waters")
+    lengths = np.array([4, 9, 3, 2])
+    idf = np.log(1 + (4 - 2 + 0.5) / (2 + 0.5))
+    expected = idf * (BM25_K1 + 1) / (1 + BM25_K1 * (1 - BM25_B + BM25_B * lengths[[3, 1]] / lengths.mean()))
+    assert hits["verse_number"].tolist() == [4, 2]
+    np.testing.assert_allclose(hits["score"], expected)
+
+
+def test_rarer_terms_weigh_more(psalms):
+    # "deep" is in one verse, "light" in three
+    hits, _ = search(psalms, "deep light")
+    assert hits["verse_number"].iloc[0] == 2
+
+
+def test_phrases_are_required(index, verses):
+    hits, total = search(index, '"the heaven and the earth"')
+    assert total == 1
+    row = verses.iloc[hits["row"].iloc[0]]
+    assert (row["book_name"], row["chapter_number"], row["verse_number"]) == ("Genesis", 1, 1)
+
+    assert search(index, '"earth the heaven"')[1] == 0
+
+
+def test_filters_and_limit(index):
+    assert search(index, "the")[1] == 6
+    assert set(search(index, "the", testament="New Testament")[0]["book_name"]) == {"Matthew"}
+    assert set(search(index, "the", books=["Exodus", "Matthew"], testament="Old Testament")[0]["book_name"]) == {"Exodus"}
+
+    hits, total = search(index, "the", limit=2)
+    assert (len(hits), total) == (2, 6)
+    assert hits["score"].tolist() == sorted(search(index, "the")[0]["score"], reverse=True)[:2]
+
+
+def test_unknown_terms(index):
+    hits, total = search(index, "zerubbabel")
+    assert total == 0 and hits.empty
+
+
+def test_plain_string_frame_is_indexed_in_canonical_order(tmp_path):
+    df = pd.DataFrame({
+        "book_name": ["John", "Exodus", "Genesis", "Genesis"],
+        "chapter_number": [1, 1, 10, 2],
+        "verse_number": [1, 1, 1, 1],
+        "verse_text": ["word", "word", "word", "word"],
+    })
+    index = _index(df, tmp_path)
+    assert [KJV_BOOKS[b] for b in index.verse_book] == ["Genesis", "Genesis", "Exodus", "John"]
+    assert index.verse_chapter.tolist() == [2, 10, 1, 1]
+    assert index.verse_rows.tolist() == [3, 2, 1, 0]
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kjv.shared import SharedFrameError, share
+
+
+@pytest.fixture(autouse=True)
+def copy_on_write():
+    # The apps turn Copy-on-Write on at startup (the default from pandas 3)
+    if int(pd.__version__.split(".")[0]) < 3:
+        with pd.option_context("mode.copy_on_write", True):
+            yield
+    else:
+        yield
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({"chapter": [2, 1, 3], "score": [0.5, np.nan, -0.25]}, index=[10, 11, 12])
+
+
+def _set_item(df, key, value):
+    df[key] = value
+
+
+def _del_item(df, key):
+    del df[key]
+
+
+def _set_columns(df):
+    df.columns = ["a", "b"]
+
+
+def _set_index(df):
+    df.index = [0, 1, 2]
+
+
+def _set_loc(df):
+    df.loc[10, "chapter"] = 99
+
+
+def _set_iloc(df):
+    df.iloc[0, 0] = 99
+
+
+def _set_at(df):
+    df.at[10, "chapter"] = 99
+
+
+def _set_iat(df):
+    df.iat[0, 0] = 99
+
+
+def _add_inplace(df):
+    df += 1
+
+
+MUTATIONS = {
+    "setitem": lambda df: _set_item(df, "chapter", 0),
+    "new column": lambda df: _set_item(df, "verse", 1),
+    "delitem": lambda df: _del_item(df, "chapter"),
+    "columns": _set_columns,
+    "index": _set_index,
+    "loc": _set_loc,
+    "iloc": _set_iloc,
+    "at": _set_at,
+    "iat": _set_iat,
+    "insert": lambda df: df.insert(0, "verse", 1),
+    "pop": lambda df: df.pop("chapter"),
+    "update": lambda df: df.update(pd.DataFrame({"chapter": [7, 7, 7]}, index=[10, 11, 12])),
+    "iadd": _add_inplace,
+    "rename": lambda df: df.rename(columns={"chapter": "c"}, inplace=True),
+    "rename_axis": lambda df: df.rename_axis("verse_id", inplace=True),
+    "sort_values": lambda df: df.sort_values("chapter", inplace=True),
+    "sort_index": lambda df: df.sort_index(ascending=False, inplace=True),
+    "fillna": lambda df: df.fillna(0, inplace=True),
+    "ffill": lambda df: df.ffill(inplace=True),
+    "replace": lambda df: df.replace(2, 20, inplace=True),
+    "drop": lambda df: df.drop(columns="score", inplace=True),
+    "dropna": lambda df: df.dropna(inplace=True),
+    "drop_duplicates": lambda df: df.drop_duplicates(inplace=True),
+    "reset_index": lambda df: df.reset_index(inplace=True),
+    "set_index": lambda df: df.set_index("chapter", inplace=True),
+    "where": lambda df: df.where(df > 1, inplace=True),
+    "clip": lambda df: df.clip(0, 1, inplace=True),
+    "query": lambda df: df.query("chapter > 1", inplace=True),
+    "eval": lambda df: df.eval("verse = chapter * 2", inplace=True),
+}
+
+
+@pytest.mark.parametrize("mutate", MUTATIONS.values(), ids=MUTATIONS.keys())
+def test_mutations_raise_and_leave_the_frame_unchanged(frame, mutate):
+    df = share(frame)
+    before = frame.copy(deep=True)
+
+    with pytest.raises(SharedFrameError):
+        mutate(df)
+
+    pd.testing.assert_frame_equal(pd.DataFrame(df), before)
+
+
+def test_axis_names_stay_unchanged(frame):
+    df = share(frame)
+    df.index.name = "verse_id"
+    df.columns.name = "field"
+    assert df.index.name is None
+    assert df.columns.name is None
+
+
+def test_chained_assignment_leaves_the_frame_unchanged(frame):
+    df = share(frame)
+    series = df["chapter"]
+    series.iloc[0] = 99
+    assert df["chapter"].tolist() == [2, 1, 3]
+
+
+def test_derived_frames_are_plain_and_writable(frame):
+    df = share(frame)
+    for derived in (df[df["chapter"] > 1], df.rename(columns={"chapter": "c"}), df.sort_values("chapter"), df.fillna(0)):
+        assert type(derived) is pd.DataFrame
+    derived = df.sort_values("chapter")
+    derived["chapter"] = 0
+    assert df["chapter"].tolist() == [2, 1, 3]
+    assert df.sort_values("chapter")["chapter"].tolist() == [1, 2, 3]
+
+
+def test_reads_still_work(frame):
+    df = share(frame)
+    assert df.loc[11, "chapter"] == 1
+    assert df.iat[2, 0] == 3
+    assert df.columns.tolist() == ["chapter", "score"]
+    assert df.index.tolist() == [10, 11, 12]
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kjv.books import KJV_BOOKS
+from kjv.sites import (
+    CLUSTER_MAX_ZOOM, build_site_index, initial_view, map_view, site_choices, site_counts, site_mentions, sites_in_bounds,
+    view_at_point, viewport_bounds, viewport_layer_data,
+)
+
+
+# One row per (verse, place) mention; Bethel and Luz share a coordinate
+MENTIONS = [
+    ("Genesis", 12, 8, "Bethel", 31.93, 35.22, "Beitin", "Israel"),
+    ("Genesis", 28, 19, "Luz", 31.93, 35.22, "Beitin", "Israel"),
+    ("Genesis", 28, 19, "Bethel", 31.93, 35.22, "Beitin", "Israel"),
+    ("Genesis", 11, 31, "Ur", 30.96, 46.10, "Tell el-Muqayyar", "Iraq"),
+    ("Matthew", 2, 1, "Bethlehem", 31.70, 35.20, "Bethlehem", "Palestine"),
+    ("Genesis", 35, 19, "Bethlehem", 31.70, 35.20, "Bethlehem", "Palestine"),
+    ("Acts", 7, 2, "Mesopotamia", 30.96, 46.10, "Tell el-Muqayyar", "Iraq"),
+]
+
+
+@pytest.fixture
+def locs():
+    rows = pd.DataFrame(MENTIONS, columns=[
+        "book_name", "chapter_number", "verse_number", "name_id_ancient", "latitude", "longitude", "name_id_modern", "country",
+    ])
+    return rows.assign(
+        verse_text=[f"{b} {c}:{v}" for b, c, v in zip(rows["book_name"], rows["chapter_number"], rows["verse_number"])],
+        administrative_area_level_2="",
+        administrative_area_level_1="",
+    )
+
+
+@pytest.fixture
+def index(locs):
+    return build_site_index(locs)
+
+
+def _site(index, modern):
+    return int(index.sites.loc[index.sites["name_id_modern"] == modern, "site_id"].iloc[0])
+
+
+def test_one_site_per_coordinate(index):
+    assert len(index.sites) == 3
+    assert index.sites["site_id"].tolist() == [0, 1, 2]
+    names = dict(zip(index.sites["name_id_modern"], index.sites["name_id_ancient"]))
+    assert names == {"Beitin": "Bethel, Luz", "Tell el-Muqayyar": "Ur, Mesopotamia", "Bethlehem": "Bethlehem"}
+
+
+def test_site_rows(index, locs):
+    for site in index.sites["site_id"]:
+        rows = index.site_rows[index.site_offsets[site]:index.site_offsets[site + 1]]
+        assert (index.row_site[rows] == site).all()
+    assert index.site_offsets[-1] == len(locs)
+
+
+def test_site_book_counts(index):
+    beitin, bethlehem = _site(index, "Beitin"), _site(index, "Bethlehem")
+    assert index.site_book_counts[beitin, KJV_BOOKS.index("Genesis")] == 3
+    assert index.site_book_counts[bethlehem].sum() == 2
+    assert index.site_book_counts.sum() == len(MENTIONS)
+    assert [index.countries[c] for c in index.site_country] == index.sites["country"].tolist()
+
+
+def test_site_counts(index):
+    counts = site_counts(index, ["Genesis", "Acts"], ["Israel", "Iraq"])
+    assert counts[_site(index, "Beitin")] == 3
+    assert counts[_site(index, "Tell el-Muqayyar")] == 2
+    # Bethlehem's country is not selected
+    assert counts[_site(index, "Bethlehem")] == 0
+    assert not site_counts(index, [], ["Israel"]).any()
+
+
+def test_site_mentions(index, locs):
+    mentions = site_mentions(locs, index, _site(index, "Beitin"))
+    assert mentions[["chapter_number", "verse_number", "name_id_ancient"]].values.tolist() == [
+        [12, 8, "Bethel"], [28, 19, "Luz"], [28, 19, "Bethel"],
+    ]
+    assert site_mentions(locs, index, _site(index, "Bethlehem"), books=["Matthew"])["book_name"].tolist() == ["Matthew"]
+
+
+def test_site_choices(index):
+    choices = site_choices(index)
+    assert list(choices) == sorted(choices)
+    assert choices["Beitin (Bethel, Luz)"] == _site(index, "Beitin")
+    assert np.isin(list(choices.values()), index.sites["site_id"]).all()
+
+
+ALL_BOOKS = ["Genesis", "Matthew", "Acts"]
+ALL_COUNTRIES = ["Israel", "Iraq", "Palestine"]
+
+
+def test_initial_view(index):
+    view = initial_view(index, ["Genesis"], ALL_COUNTRIES, zoom=6)
+    # Mention-weighted: 3 x Beitin, 1 x Ur, 1 x Bethlehem
+    assert view["latitude"] == pytest.approx((3 * 31.93 + 30.96 + 31.70) / 5)
+    assert view["zoom"] == 6
+
+    view = initial_view(index, ALL_BOOKS, ALL_COUNTRIES, center=_site(index, "Tell el-Muqayyar"))
+    assert (view["latitude"], view["longitude"]) == (30.96, 46.10)
+    assert initial_view(index, [], ALL_COUNTRIES) is None
+
+
+def test_view_at_point():
+    view = map_view(31.7, 35.2, 7, width=800, height=600)
+    # The point under the pointer at the center is the center
+    moved = view_at_point(view, 35.2, 31.7, 400, 300)
+    assert moved["longitude"] == pytest.approx(35.2) and moved["latitude"] == pytest.approx(31.7)
+
+    # The map's west edge dragged to the middle: that edge is the new center
+    west, _, _, _ = viewport_bounds(31.7, 35.2, 7, 800, 600)
+    moved = view_at_point(view, west, 31.7, 400, 300)
+    assert moved["longitude"] == pytest.approx(west)
+    assert moved["zoom"] == 7
+
+    resized = view_at_point(view, 35.2, 31.7, 600, 300, width=1200, height=600)
+    assert resized["longitude"] == pytest.approx(35.2) and resized["width"] == 1200
+
+
+def test_sites_in_bounds_matches_a_scan():
+    rng = np.random.default_rng(0)
+    locs = pd.DataFrame({
+        "latitude": rng.uniform(25, 40, 500).round(3),
+        "longitude": rng.uniform(30, 50, 500).round(3),
+        "book_name": "Genesis",
+        "name_id_ancient": "x",
+    })
+    for column in ["name_id_modern", "administrative_area_level_2", "administrative_area_level_1", "country"]:
+        locs[column] = ""
+    index = build_site_index(locs)
+
+    bounds = (33.3, 29.1, 41.7, 35.05)
+    latitude, longitude = index.sites["latitude"].to_numpy(), index.sites["longitude"].to_numpy()
+    expected = np.flatnonzero((latitude >= 29.1) & (latitude <= 35.05) & (longitude >= 33.3) & (longitude <= 41.7))
+    assert sites_in_bounds(index, bounds).tolist() == expected.tolist()
+
+
+def test_layer_data_follows_the_view(index):
+    beitin, ur = _site(index, "Beitin"), _site(index, "Tell el-Muqayyar")
+    near_ur = map_view(30.96, 46.10, CLUSTER_MAX_ZOOM + 4)
+    assert viewport_layer_data(index, ALL_BOOKS, ALL_COUNTRIES, near_ur)["site_id"].tolist() == [ur]
+
+    # Panned from Ur to Bethel, the points follow
+    near_beitin = view_at_point(near_ur, 35.22, 31.93, 600, 500)
+    data = viewport_layer_data(index, ALL_BOOKS, ALL_COUNTRIES, near_beitin)
+    assert data["site_id"].tolist() == [beitin]
+    assert data["count"].tolist() == [3]
+
+    # A margin around the view brings in Bethlehem, 25 km south
+    data = viewport_layer_data(index, ALL_BOOKS, ALL_COUNTRIES, near_beitin, overscan=3)
+    assert sorted(data["name_id_modern"]) == ["Beitin", "Bethlehem"]
+
+
+def test_layer_data_clusters_when_zoomed_out(index):
+    data = viewport_layer_data(index, ALL_BOOKS, ALL_COUNTRIES, map_view(31.8, 38, 5))
+    assert data["count"].sum() == len(MENTIONS)
+    cluster = data[data["n_sites"] > 1]
+    # Beitin and Bethlehem merge, named after the most mentioned of the two
+    assert cluster["site_id"].tolist() == [-1]
+    assert cluster["name_id_modern"].tolist() == ["Beitin + 1 more sites"]
+    assert cluster["count"].tolist() == [5]
+    assert data["color_intensity"].between(50, 255).all()
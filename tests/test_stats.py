@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from kjv import stats
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    # No data/sentiment_by_book.csv to fall back on
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path / "book.csv"), str(tmp_path / "chapter.csv")
+
+
+@pytest.mark.filterwarnings("ignore:VADER")
+def test_counts(verses, paths):
+    stats_book, stats_chapter = stats.build_corpus_stats(verses, *paths)
+
+    book = stats_book.set_index("book_name")
+    assert book.loc["Genesis", "verse_count"] == 4
+    assert book.loc["Genesis", "chapter_count"] == 2
+    assert book.loc["Matthew", "word_count"] == 12 + 7
+
+    chapter = stats_chapter.set_index(["book_name", "chapter_number"])
+    assert chapter.loc[("Genesis", 2), "verse_count"] == 2
+    assert chapter.loc[("Exodus", 1), "unique_words"] == 8
+
+    pd.testing.assert_frame_equal(pd.read_csv(paths[0]), stats_book.astype({"book_name": str}), check_dtype=False)
+
+
+def test_missing_vader_warns(verses, paths, monkeypatch):
+    monkeypatch.setattr(stats, "verse_sentiment", lambda df: None)
+    with pytest.warns(RuntimeWarning, match="VADER"):
+        stats_book, stats_chapter = stats.build_corpus_stats(verses, *paths)
+    assert stats_chapter["mean_sentiment"].isna().all()
+
+
+def test_sentiment_is_averaged(verses, paths, monkeypatch):
+    monkeypatch.setattr(stats, "verse_sentiment", lambda df: pd.Series(range(len(df)), index=df.index, dtype=float))
+    stats_book, stats_chapter = stats.build_corpus_stats(verses, *paths)
+    assert stats_book.set_index("book_name").loc["Genesis", "mean_sentiment"] == 1.5
+    assert stats_chapter.set_index(["book_name", "chapter_number"]).loc[("Matthew", 1), "mean_sentiment"] == 5.5
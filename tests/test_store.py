@@ -0,0 +1,23 @@
+import pandas as pd
+
+from kjv.books import KJV_BOOKS
+
+
+def test_rows_are_in_canonical_order(verses):
+    assert verses["book_name"].tolist() == ["Genesis"] * 4 + ["Exodus"] + ["Matthew"] * 2
+    assert verses["chapter_number"].tolist() == [1, 1, 2, 2, 1, 1, 1]
+    assert verses["verse_number"].tolist() == [1, 2, 1, 2, 1, 1, 2]
+
+
+def test_column_types(verses):
+    assert isinstance(verses["book_name"].dtype, pd.CategoricalDtype)
+    assert verses["book_name"].cat.ordered
+    assert verses["book_name"].cat.categories.tolist() == KJV_BOOKS
+    assert isinstance(verses["testament_name"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_string_dtype(verses["verse_text"])
+    assert verses["chapter_number"].dtype.itemsize == 1
+
+
+def test_verse_text_round_trips(verses):
+    first = verses.iloc[0]
+    assert first["verse_text"] == "In the beginning God created the heaven and the earth."
@@ -0,0 +1,36 @@
+import pytest
+
+from kjv import warmup
+
+
+@pytest.fixture
+def imports(monkeypatch):
+    # Stand-in importer: records the modules instead of importing them
+    calls = []
+
+    def import_module(name):
+        calls.append(name)
+        if name == "missing":
+            raise ImportError(name)
+
+    monkeypatch.setattr(warmup.importlib, "import_module", import_module)
+    return calls
+
+
+@pytest.mark.parametrize("value", ["1", "true", "YES"])
+def test_warm_up_imports_when_enabled(monkeypatch, imports, value):
+    monkeypatch.setenv(warmup.KJV_WARMUP, value)
+    thread = warmup.warm_up(("missing", "pydeck"))
+    thread.join(timeout=5)
+    assert thread.daemon and not thread.is_alive()
+    assert imports == ["missing", "pydeck"]
+
+
+@pytest.mark.parametrize("value", [None, "", "0", "no"])
+def test_warm_up_does_nothing_when_disabled(monkeypatch, imports, value):
+    if value is None:
+        monkeypatch.delenv(warmup.KJV_WARMUP, raising=False)
+    else:
+        monkeypatch.setenv(warmup.KJV_WARMUP, value)
+    assert warmup.warm_up() is None
+    assert imports == []
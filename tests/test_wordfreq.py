@@ -0,0 +1,49 @@
+from collections import Counter
+
+import pandas as pd
+import pytest
+from wordcloud import WordCloud
+
+from kjv.wordfreq import normalize_counts
+
+
+TEXT = (
+    "Dogs dogs dogs dog water water Waters Waters waters LORD LORD Lord LORD's glasses glass "
+    "O O the 12 And Abraham's Abraham class classes unto"
+)
+
+
+def _counts(words, book=0):
+    return pd.DataFrame([(book, word, count) for word, count in Counter(words).items()], columns=["book", "word", "count"])
+
+
+def _as_dict(frame):
+    return dict(zip(frame["word"], frame["count"]))
+
+
+def test_matches_process_text():
+    expected = WordCloud(collocations=False).process_text(TEXT)
+    result = _as_dict(normalize_counts(_counts(TEXT.split())))
+    assert result == expected
+    # Plurals are labelled with their singular's spelling
+    assert result["dog"] == 4 and result["water"] == 5 and result["LORD"] == 4
+
+
+@pytest.mark.parametrize("text", [
+    "Sheep sheeps Sheeps sheep Rams ram",
+    "Israel Israel's israel ISRAEL Israels 7 a",
+])
+def test_matches_process_text_samples(text):
+    assert _as_dict(normalize_counts(_counts(text.split()))) == WordCloud(collocations=False).process_text(text)
+
+
+def test_books_are_normalized_separately():
+    frame = pd.concat([_counts(["dogs", "dog"], book=0), _counts(["dogs", "Dogs", "Dogs"], book=1)])
+    result = normalize_counts(frame)
+    assert result.values.tolist() == [[0, "dog", 2], [1, "Dogs", 3]]
+
+
+def test_symbols():
+    frame = _counts([",", ",", ";", "word"])
+    assert _as_dict(normalize_counts(frame)) == {"word": 1}
+    assert _as_dict(normalize_counts(frame, keep_symbols=True)) == {",": 2, ";": 1, "word": 1}